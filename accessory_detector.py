@@ -0,0 +1,57 @@
+import os
+
+ACCESSORY_DEFAULTS = {
+    "weights": "models/yolov5n_best.pt",  # PyTorch weights, exported models are found next to them
+    "backend": "pytorch",        # pytorch, onnx, openvino or openvino_int8 (see export_accessory_model.py)
+    "size": 640,                 # YOLO inference size for the full frame, smaller is faster but misses small items
+    "fixed_shape": True,         # reuse a preallocated input tensor while the frame shape stays the same
+    "model_cache": True,         # keep a fused TorchScript copy of the PyTorch model in models/cache, skips torch.hub
+    "roi_enabled": False,        # run YOLO on a crop around recent faces instead of the full frame
+    "roi_size": 320,             # inference size for the crop, usually below "size"
+    "roi_padding": 0.5,          # face-box widths added on each side
+    "roi_top_padding": 0.8,      # face-box heights added above, caps sit over the forehead
+    "roi_bottom_padding": 0.8,   # face-box heights added below, scarves and masks reach past the chin
+    "roi_max_age": 1.0,          # seconds a face box stays usable, after that the full frame is searched
+}
+
+# Where yolov5/export.py writes each backend's model, relative to the PyTorch weights
+BACKENDS = {
+    "pytorch": "{stem}.pt",
+    "onnx": "{stem}.onnx",
+    "openvino": "{stem}_openvino_model",
+    "openvino_int8": "{stem}_int8_openvino_model",
+}
+
+
+def backend_weights(weights, backend):
+    """Model file or folder to load for `backend`, given the PyTorch weights it was exported from"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown accessory model backend '{backend}', expected one of: {', '.join(BACKENDS)}")
+    return BACKENDS[backend].format(stem=os.path.splitext(weights)[0])
+
+
+def face_roi(frame_shape, boxes, padding=0.5, top_padding=0.8, bottom_padding=0.8):
+    """
+    Return (top, right, bottom, left) of the padded region around every face box, clipped to the frame.
+
+    Boxes are (top, right, bottom, left) in frame pixels, as face_recognition returns them. All faces
+    share one region, so a frame with several people still costs a single inference.
+    Returns None when there are no boxes or the region would be empty.
+    """
+    if not boxes:
+        return None
+    height, width = frame_shape[:2]
+    top = min(b[0] for b in boxes)
+    right = max(b[1] for b in boxes)
+    bottom = max(b[2] for b in boxes)
+    left = min(b[3] for b in boxes)
+    box_w = right - left
+    box_h = bottom - top
+
+    top = max(int(top - box_h * top_padding), 0)
+    bottom = min(int(bottom + box_h * bottom_padding), height)
+    left = max(int(left - box_w * padding), 0)
+    right = min(int(right + box_w * padding), width)
+    if bottom <= top or right <= left:
+        return None
+    return top, right, bottom, left
@@ -0,0 +1,135 @@
+"""
+Accessory model latency and accuracy per inference size.
+
+Usage: python benchmarks/bench_accessory_size.py [--weights W] [--val DIR] [--sizes 640 512 416 320 256]
+
+For every size the bundled model is timed on a 640x480 frame through the
+general AutoShape path and through the fixed_shape path (preallocated input,
+shapes negotiated once). When a YOLO-format validation set is available
+(DIR/images + DIR/labels, by default the "val" entry of models/data.yaml),
+mAP@0.5 and mAP@0.5:0.95 are computed on it at the same size; otherwise those
+columns show n/a.
+"""
+import argparse
+import os
+import pathlib
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+import torch
+import yaml
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "yolov5"))
+from utils.general import xywhn2xyxy  # noqa: E402
+from utils.metrics import ap_per_class, box_iou  # noqa: E402
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+IOU_THRESHOLDS = torch.linspace(0.5, 0.95, 10)
+
+
+def load_model(weights):
+    temp = pathlib.PosixPath
+    if os.name == "nt":
+        pathlib.PosixPath = pathlib.WindowsPath
+    model = torch.hub.load(os.path.join(ROOT, "yolov5"), "custom", path=weights, source="local", verbose=False)
+    pathlib.PosixPath = temp
+    return model
+
+
+def default_val_dir():
+    data_yaml = os.path.join(ROOT, "models", "data.yaml")
+    with open(data_yaml) as f:
+        val = yaml.safe_load(f).get("val", "")
+    return os.path.normpath(os.path.join(os.path.dirname(data_yaml), val, ".."))
+
+
+def time_size(model, frame, size, fixed_shape, frames):
+    model.fixed_shape = fixed_shape
+    for _ in range(5):
+        model(frame, size=size)  # warm up
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        model(frame, size=size)
+        times.append((time.perf_counter() - start) * 1000)
+    model.fixed_shape = False
+    return statistics.median(times)
+
+
+def correct_matrix(pred, labels):
+    """True positives per IoU threshold for one image, the same matching val.py uses"""
+    correct = np.zeros((len(pred), len(IOU_THRESHOLDS)), dtype=bool)
+    if not len(pred) or not len(labels):
+        return correct
+    iou = box_iou(labels[:, 1:], pred[:, :4])
+    correct_class = labels[:, 0:1] == pred[:, 5]
+    for i, threshold in enumerate(IOU_THRESHOLDS):
+        x = torch.where((iou >= threshold) & correct_class)
+        if x[0].shape[0]:
+            matches = torch.cat((torch.stack(x, 1), iou[x[0], x[1]][:, None]), 1).cpu().numpy()
+            if x[0].shape[0] > 1:
+                matches = matches[matches[:, 2].argsort()[::-1]]
+                matches = matches[np.unique(matches[:, 1], return_index=True)[1]]
+                matches = matches[np.unique(matches[:, 0], return_index=True)[1]]
+            correct[matches[:, 1].astype(int), i] = True
+    return correct
+
+
+def evaluate(model, val_dir, size):
+    image_dir = os.path.join(val_dir, "images")
+    label_dir = os.path.join(val_dir, "labels")
+    model.conf = 0.001  # low threshold so the precision/recall curve is complete
+    stats = []
+    for file in sorted(os.listdir(image_dir)):
+        if not file.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        h, w = cv2.imread(os.path.join(image_dir, file)).shape[:2]
+        label_file = os.path.join(label_dir, os.path.splitext(file)[0] + ".txt")
+        labels = np.loadtxt(label_file, ndmin=2) if os.path.exists(label_file) else np.zeros((0, 5))
+        labels = torch.tensor(labels, dtype=torch.float32).reshape(-1, 5)
+        labels[:, 1:] = xywhn2xyxy(labels[:, 1:], w, h)
+
+        pred = model(os.path.join(image_dir, file), size=size).xyxy[0].cpu()
+        stats.append((correct_matrix(pred, labels), pred[:, 4].numpy(), pred[:, 5].numpy(), labels[:, 0].numpy()))
+    model.conf = 0.25
+
+    if not stats:
+        return None
+    tp, conf, pred_cls, target_cls = (np.concatenate(x, 0) for x in zip(*stats))
+    if not len(target_cls):
+        return None
+    ap = ap_per_class(tp, conf, pred_cls, target_cls)[5]
+    return float(ap[:, 0].mean()), float(ap.mean())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--weights", default=os.path.join(ROOT, "models", "yolov5n_best.pt"))
+    parser.add_argument("--val", default=None, help="folder with images/ and labels/ (default: from models/data.yaml)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[640, 512, 416, 320, 256])
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    torch.set_grad_enabled(False)
+    model = load_model(args.weights)
+    frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    val_dir = args.val or default_val_dir()
+    has_val = os.path.isdir(os.path.join(val_dir, "images"))
+    if not has_val:
+        print(f"No validation set under {val_dir}, reporting latency only")
+
+    print(f"{'size':>6}{'general ms':>12}{'fixed ms':>10}{'speedup':>9}{'mAP@.5':>9}{'mAP@.5:.95':>12}")
+    for size in args.sizes:
+        general = time_size(model, frame, size, False, args.frames)
+        fixed = time_size(model, frame, size, True, args.frames)
+        scores = evaluate(model, val_dir, size) if has_val else None
+        map50, map5095 = (f"{scores[0]:.3f}", f"{scores[1]:.3f}") if scores else ("n/a", "n/a")
+        print(f"{size:>6}{general:>12.2f}{fixed:>10.2f}{general / fixed:>9.2f}{map50:>9}{map5095:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Recall and per-query latency of the IVF index and the centroid prefilter against exhaustive face_distance.
+
+Usage: python benchmarks/bench_ann.py [gallery_size] [num_queries]
+
+Uses a synthetic watchlist shaped like ours (5 augmented encodings per person).
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from face_gallery import CentroidIndex, FaceGallery, IVFIndex
+
+try:
+    from face_recognition import face_distance
+except ImportError:
+    # Same computation face_recognition.face_distance performs
+    def face_distance(face_encodings, face_to_compare):
+        return np.linalg.norm(face_encodings - face_to_compare, axis=1)
+
+
+def make_gallery(size, per_person=5, seed=0):
+    rng = np.random.default_rng(seed)
+    people = size // per_person
+    centres = rng.normal(scale=0.1, size=(people, 128))
+    encodings = np.repeat(centres, per_person, axis=0) + rng.normal(scale=0.02, size=(people * per_person, 128))
+    names = [f"person{i // per_person}" for i in range(len(encodings))]
+    return centres, encodings, names
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    num_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    centres, encodings, names = make_gallery(size)
+    rng = np.random.default_rng(1)
+    queries = centres[rng.choice(len(centres), num_queries)] + rng.normal(scale=0.02, size=(num_queries, 128))
+
+    gallery = FaceGallery(encodings, names, capacity=len(encodings))
+    start = time.perf_counter()
+    index = IVFIndex.build(gallery)
+    print(f"Gallery: {len(gallery)} encodings, IVF build {time.perf_counter() - start:.2f}s, {index.nlist} cells")
+
+    start = time.perf_counter()
+    truth = [names[int(np.argmin(face_distance(encodings, q)))] for q in queries]
+    exhaustive_ms = (time.perf_counter() - start) * 1000 / num_queries
+
+    start = time.perf_counter()
+    gallery.match(queries)
+    batched_ms = (time.perf_counter() - start) * 1000 / num_queries
+
+    prefilter = CentroidIndex.build(gallery)
+    start = time.perf_counter()
+    found, _ = prefilter.match(queries)
+    prefilter_ms = (time.perf_counter() - start) * 1000 / num_queries
+    prefilter_recall = np.mean([f[0] == t for f, t in zip(found, truth)])
+
+    print(f"{'method':<28}{'recall@1':>10}{'ms/query':>12}{'compared/query':>16}")
+    print(f"{'face_distance (exhaustive)':<28}{1.0:>10.3f}{exhaustive_ms:>12.3f}{len(gallery):>16}")
+    print(f"{'FaceGallery (batched exact)':<28}{1.0:>10.3f}{batched_ms:>12.3f}{len(gallery):>16}")
+    print(f"{'Centroid prefilter (exact)':<28}{prefilter_recall:>10.3f}{prefilter_ms:>12.3f}"
+          f"{prefilter.comparisons // num_queries:>16}")
+    for nprobe in (1, 4, 8, 16, 32):
+        start = time.perf_counter()
+        found, _ = index.match(queries, nprobe=nprobe)
+        ivf_ms = (time.perf_counter() - start) * 1000 / num_queries
+        recall = np.mean([f[0] == t for f, t in zip(found, truth)])
+        print(f"{f'IVF nprobe={nprobe}':<28}{recall:>10.3f}{ivf_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Cost of building yolov5 Detections with lazy vs eagerly derived box formats.
+
+Usage: python benchmarks/bench_detections.py [weights] [frames]
+
+"eager" touches xywh, xyxyn and xywhn after every call, which is what
+Detections.__init__ used to do unconditionally; "lazy" only reads the NMS
+output (xyxy) like detect_accessories() does. Two measurements are printed:
+Detections construction on its own, and AutoShape.forward end-to-end on a
+640x480 frame with the screening model.
+"""
+import os
+import pathlib
+import statistics
+import sys
+import time
+
+import numpy as np
+import torch
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "yolov5"))
+from models.common import Detections  # noqa: E402
+from utils.general import Profile  # noqa: E402
+
+
+def touch_all(results):
+    return results.xywh, results.xyxyn, results.xywhn
+
+
+def time_calls(func, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.mean(times), statistics.median(times)
+
+
+def bench_construction(repeats=20000, boxes=5):
+    im = np.zeros((480, 640, 3), dtype=np.uint8)
+    pred = torch.rand(boxes, 6) * torch.tensor([640, 480, 640, 480, 1, 4])
+    shape = (1, 3, 480, 640)
+    times = (Profile(), Profile(), Profile())
+
+    def lazy():
+        return Detections([im], [pred], ["im.jpg"], times, {0: "mask"}, shape).xyxy[0]
+
+    def eager():
+        return touch_all(Detections([im], [pred], ["im.jpg"], times, {0: "mask"}, shape))
+
+    return {"lazy": time_calls(lazy, repeats), "eager": time_calls(eager, repeats)}
+
+
+def bench_forward(weights, frames):
+    temp = pathlib.PosixPath
+    if os.name == "nt":
+        pathlib.PosixPath = pathlib.WindowsPath
+    model = torch.hub.load(os.path.join(ROOT, "yolov5"), "custom", path=weights, source="local", verbose=False)
+    pathlib.PosixPath = temp
+
+    frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    for _ in range(5):
+        model(frame)  # warm up
+
+    return {
+        "lazy": time_calls(lambda: model(frame).xyxy[0], frames),
+        "eager": time_calls(lambda: touch_all(model(frame)), frames),
+    }
+
+
+def report(title, results):
+    print(title)
+    print(f"{'mode':>8}{'mean ms':>10}{'median ms':>11}")
+    for mode, (mean, median) in results.items():
+        print(f"{mode:>8}{mean:>10.3f}{median:>11.3f}")
+    saved = results["eager"][0] - results["lazy"][0]
+    print(f"saved per call: {saved:.3f} ms\n")
+
+
+def main():
+    weights = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, "models", "yolov5n_best.pt")
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    torch.set_grad_enabled(False)
+    report("Detections construction (5 boxes)", bench_construction())
+    report(f"AutoShape.forward, {frames} frames", bench_forward(weights, frames))
+
+
+if __name__ == "__main__":
+    main()
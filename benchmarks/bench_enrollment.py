@@ -0,0 +1,47 @@
+"""
+Serial vs process-pool enrollment time for save_encodings.py.
+
+Usage: python benchmarks/bench_enrollment.py [data_dir] [workers ...]
+
+Every run encodes the whole folder into a throwaway store, so nothing under
+encodings/ is touched.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import save_encodings
+
+
+def time_run(data_dir, workers):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        encodings, _ = save_encodings.update_encodings(data_dir, os.path.join(tmp_dir, "face_encodings.bin"), workers)
+        return time.perf_counter() - start, len(encodings)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def main():
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else save_encodings.data_path
+    worker_counts = [int(w) for w in sys.argv[2:]] or sorted({1, 2, 4, os.cpu_count() or 1})
+    images = len(save_encodings.scan_images(data_dir))
+    print(f"{images} images under {data_dir}")
+
+    results = []
+    for workers in worker_counts:
+        seconds, encoded = time_run(data_dir, workers)
+        results.append((workers, seconds, encoded))
+
+    serial = next((s for w, s, _ in results if w == 1), results[0][1])
+    print(f"{'workers':>8}{'seconds':>10}{'img/s':>10}{'speedup':>10}{'faces':>8}")
+    for workers, seconds, encoded in results:
+        print(f"{workers:>8}{seconds:>10.2f}{images / seconds:>10.1f}{serial / seconds:>10.2f}{encoded:>8}")
+
+
+if __name__ == "__main__":
+    main()
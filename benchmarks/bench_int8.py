@@ -0,0 +1,101 @@
+"""
+Accuracy and latency of the INT8 OpenVINO accessory model against FP32.
+
+Usage: python benchmarks/bench_int8.py [--frames DIR] [--val DIR] [--reference pytorch|openvino]
+
+Run `python export_accessory_model.py --backend openvino_int8` first. Both
+models are scored on the held-out part of the calibration frames (the images
+export_accessory_model.is_held_out() kept out of calibration):
+  - latency: median ms per frame at the configured size
+  - agreement: share of FP32 detections the INT8 model reproduces (same class,
+    IoU >= 0.5) and share of INT8 detections FP32 agrees with
+With a labelled YOLO-format set (--val DIR with images/ and labels/), mAP@0.5
+and mAP@0.5:0.95 of both models are reported as well.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+import torch
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+from accessory_detector import ACCESSORY_DEFAULTS, backend_weights  # noqa: E402
+from bench_accessory_size import evaluate, load_model  # noqa: E402
+from export_accessory_model import CALIBRATION_DIR, FRAME_SIZE, is_held_out, list_images  # noqa: E402
+from settings import load_section  # noqa: E402
+from utils.metrics import box_iou  # noqa: E402  (yolov5/, put on sys.path by bench_accessory_size)
+
+
+def agreement(reference, candidate):
+    """(matched reference detections, matched candidate detections) at IoU >= 0.5 with the same class"""
+    if not len(reference) or not len(candidate):
+        return 0, 0
+    iou = box_iou(reference[:, :4], candidate[:, :4])
+    same = (iou >= 0.5) & (reference[:, 5:6] == candidate[:, 5])
+    return int(same.any(1).sum()), int(same.any(0).sum())
+
+
+def score(models, frames, size):
+    latency = {name: [] for name in models}
+    detections = {name: 0 for name in models}
+    matched = {name: 0 for name in models}
+    for path in frames:
+        frame = cv2.resize(cv2.imread(path), FRAME_SIZE, interpolation=cv2.INTER_AREA)
+        preds = {}
+        for name, model in models.items():
+            start = time.perf_counter()
+            preds[name] = model(frame, size=size).xyxy[0].cpu()
+            latency[name].append((time.perf_counter() - start) * 1000)
+            detections[name] += len(preds[name])
+        fp32_matched, int8_matched = agreement(preds["fp32"], preds["int8"])
+        matched["fp32"] += fp32_matched
+        matched["int8"] += int8_matched
+    return latency, detections, matched
+
+
+def main():
+    config = load_section("accessory_detection", ACCESSORY_DEFAULTS)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--weights", default=config["weights"])
+    parser.add_argument("--reference", choices=("pytorch", "openvino"), default="openvino",
+                        help="FP32 model to compare against (openvino falls back to pytorch if not exported)")
+    parser.add_argument("--frames", default=CALIBRATION_DIR)
+    parser.add_argument("--val", default=None, help="labelled folder with images/ and labels/ for mAP")
+    parser.add_argument("--size", type=int, default=config["size"])
+    args = parser.parse_args()
+
+    torch.set_grad_enabled(False)
+    reference = backend_weights(args.weights, args.reference)
+    if not os.path.exists(reference):
+        reference = args.weights
+    models = {"fp32": load_model(reference), "int8": load_model(backend_weights(args.weights, "openvino_int8"))}
+    for model in models.values():
+        model.fixed_shape = config["fixed_shape"]
+
+    frames = [p for p in list_images(args.frames) if is_held_out(p)]
+    print(f"FP32: {reference}\n{len(frames)} held-out frames from {args.frames}, size {args.size}\n")
+    if frames:
+        for model in models.values():
+            model(np.zeros((*FRAME_SIZE[::-1], 3), dtype=np.uint8), size=args.size)  # warm up
+        latency, detections, matched = score(models, frames, args.size)
+        print(f"{'model':>6}{'median ms':>11}{'p95 ms':>9}{'detections':>12}{'agree':>8}")
+        for name in models:
+            times = sorted(latency[name])
+            agree = matched[name] / detections[name] if detections[name] else 1.0
+            print(f"{name:>6}{statistics.median(times):>11.2f}{times[int(len(times) * 0.95)]:>9.2f}"
+                  f"{detections[name]:>12}{agree:>8.1%}")
+        print(f"speedup: {statistics.median(latency['fp32']) / statistics.median(latency['int8']):.2f}x\n")
+
+    if args.val:
+        for name, model in models.items():
+            map50, map5095 = evaluate(model, args.val, args.size) or (float("nan"), float("nan"))
+            print(f"{name}: mAP@0.5 {map50:.3f}  mAP@0.5:0.95 {map5095:.3f}")
+
+
+if __name__ == "__main__":
+    main()
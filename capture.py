@@ -0,0 +1,156 @@
+import threading
+import time
+
+
+class FrameRingBuffer:
+    """
+    Fixed-size ring of the most recent camera frames.
+
+    Single producer (the capture thread) and single consumer (the detection side).
+    The writer never waits: once the ring is full the oldest slot is overwritten.
+    The reader always takes the newest frame, and every frame it skipped over is
+    counted as dropped. No lock is needed because each counter has exactly one
+    writer and a slot is published by bumping the write sequence after it is filled.
+    """
+
+    def __init__(self, size=4):
+        if size < 2:
+            raise ValueError("Ring buffer needs at least 2 slots")
+        self.size = size
+        self._slots = [None] * size
+        self._write_seq = 0  # number of frames published so far
+        self._read_seq = 0   # sequence number of the next frame the reader has not seen
+
+        # Counters (captured is owned by the writer, dropped/processed by the reader)
+        self.captured = 0
+        self.dropped = 0
+        self.processed = 0
+
+    def put(self, frame, timestamp=None):
+        """Publish a frame, overwriting the oldest slot if the ring is full."""
+        seq = self._write_seq
+        self._slots[seq % self.size] = (seq, timestamp if timestamp is not None else time.time(), frame)
+        self._write_seq = seq + 1
+        self.captured += 1
+
+    def latest(self):
+        """Return (seq, timestamp, frame) for the newest unseen frame, or None if nothing new arrived."""
+        write_seq = self._write_seq
+        if write_seq == self._read_seq:
+            return None
+        entry = self._slots[(write_seq - 1) % self.size]
+        # The writer may have lapped us while we were reading, so trust the sequence stored in the slot
+        seq = entry[0]
+        if seq < self._read_seq:
+            return None
+        self.dropped += seq - self._read_seq
+        self._read_seq = seq + 1
+        return entry
+
+    def mark_processed(self):
+        self.processed += 1
+
+    def pending(self):
+        """Number of published frames the reader has not consumed yet."""
+        return self._write_seq - self._read_seq
+
+    def stats(self):
+        return {
+            "captured": self.captured,
+            "dropped": self.dropped,
+            "processed": self.processed,
+        }
+
+
+class CaptureThread(threading.Thread):
+    """
+    Continuously grabs frames from a cv2.VideoCapture-like object into a FrameRingBuffer.
+
+    Running the grab loop on its own thread keeps the driver buffer drained, so a slow
+    detection step only ever sees the newest frame instead of a backlog of stale ones.
+
+    A failed read is retried after `retry_delay`. After `max_read_failures` failures in a row
+    `error` is set for the status panel and, when a `reopen` callable is given, the capture is
+    released and replaced by `reopen()`. Every further run of failures does the same after a
+    pause that doubles from `reopen_delay` up to `max_reopen_delay`, so an unplugged camera is
+    not hammered. The thread keeps going until stop(); the first good frame clears `error`.
+    """
+
+    def __init__(self, capture, buffer_size=4, max_read_failures=30, reopen=None,
+                 retry_delay=0.01, reopen_delay=0.5, max_reopen_delay=5.0):
+        super().__init__(daemon=True, name="CaptureThread")
+        self.capture = capture
+        self.buffer = FrameRingBuffer(buffer_size)
+        self.max_read_failures = max_read_failures
+        self.reopen = reopen
+        self.retry_delay = retry_delay
+        self.reopen_delay = reopen_delay
+        self.max_reopen_delay = max_reopen_delay
+        self.read_failures = 0  # failed reads in the current run
+        self.failed_runs = 0    # runs of max_read_failures since the last good frame
+        self.reopens = 0
+        self.error = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                ret, frame = self.capture.read()
+            except Exception:  # some backends raise instead of returning False when unplugged
+                ret, frame = False, None
+            if ret:
+                if self.error is not None:
+                    print("✅ Camera reads recovered.")
+                self.read_failures = 0
+                self.failed_runs = 0
+                self.error = None
+                self.buffer.put(frame, time.time())
+                continue
+
+            self.read_failures += 1
+            if self.read_failures < self.max_read_failures:
+                self._stop_event.wait(self.retry_delay)
+                continue
+
+            if self.error is None:
+                print("❌ Camera read failed repeatedly - retrying.")
+            self.error = "Camera read failed"
+            self.read_failures = 0
+            self.failed_runs += 1
+            if self.reopen is not None:
+                self._reopen()
+            self._stop_event.wait(min(self.reopen_delay * 2 ** min(self.failed_runs - 1, 16), self.max_reopen_delay))
+
+    def _reopen(self):
+        """Release the capture and open it again, keeping the old one if that fails"""
+        try:
+            self.capture.release()
+        except Exception:
+            pass
+        try:
+            capture = self.reopen()
+        except Exception as e:
+            print(f"❌ Could not reopen the camera: {e}")
+            return
+        self.reopens += 1
+        if capture is not None:
+            self.capture = capture
+            print("[Capture] Camera reopened.")
+
+    def latest(self):
+        return self.buffer.latest()
+
+    def mark_processed(self):
+        self.buffer.mark_processed()
+
+    def stats(self):
+        return self.buffer.stats()
+
+    @property
+    def failed(self):
+        return self.error is not None
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
@@ -0,0 +1,77 @@
+import time
+
+import cv2
+import numpy as np
+
+SCHEDULE_DEFAULTS = {
+    "interval": 5,             # run the detector at least every N frames, 1 = every frame
+    "max_age": 1.0,            # seconds a result is carried forward before it must be refreshed
+    "motion_threshold": 8.0,   # mean grey-level change since the last run that triggers an early run, 0 = off
+}
+
+THUMB_SIZE = (32, 24)
+
+
+class DetectionScheduler:
+    """
+    Decides which frames an expensive detector runs on and carries its result forward in between.
+
+    The detector runs when there is no result yet, every `interval` frames, once the result is
+    older than `max_age` seconds, or straight away when the scene has changed: the motion score
+    is the mean absolute grey-level difference between a tiny thumbnail of the current frame and
+    of the frame the detector last ran on, so slow drift adds up instead of slipping under the
+    threshold one frame at a time.
+    """
+
+    def __init__(self, interval=5, max_age=1.0, motion_threshold=8.0):
+        self.interval = max(1, int(interval))
+        self.max_age = max_age
+        self.motion_threshold = motion_threshold
+        self.result = None
+        self.result_time = None
+        self.frames_since_run = 0
+        self._ref_thumb = None
+        self.runs = 0
+        self.skipped = 0
+        self.motion_runs = 0
+
+    @staticmethod
+    def thumbnail(frame):
+        small = cv2.resize(frame, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def motion_score(self, thumb):
+        if self._ref_thumb is None or self._ref_thumb.shape != thumb.shape:
+            return float("inf")
+        return float(np.mean(cv2.absdiff(thumb, self._ref_thumb)))
+
+    def run(self, frame, detect, now=None):
+        """Return detect(frame) when a run is due, otherwise the last result."""
+        now = time.time() if now is None else now
+        thumb = self.thumbnail(frame) if self.motion_threshold > 0 else None
+
+        due = (
+            self.result_time is None
+            or self.frames_since_run + 1 >= self.interval
+            or now - self.result_time >= self.max_age
+        )
+        if not due and thumb is not None and self.motion_score(thumb) > self.motion_threshold:
+            due = True
+            self.motion_runs += 1
+
+        if not due:
+            self.frames_since_run += 1
+            self.skipped += 1
+            return self.result
+
+        self.result = detect(frame)
+        self.result_time = now
+        self.frames_since_run = 0
+        self._ref_thumb = thumb
+        self.runs += 1
+        return self.result
+
+    def stats(self):
+        return {"runs": self.runs, "skipped": self.skipped, "motion_runs": self.motion_runs}
@@ -0,0 +1,239 @@
+import json
+import os
+import re
+import struct
+import time
+
+import numpy as np
+
+# On-disk layout (little-endian), every section starts on a 64-byte boundary:
+#   header      magic, format version, dim, row count, generation, identity count, section offsets
+#   embeddings  float32 [count, dim]
+#   sq_norms    float32 [count]            precomputed ||row||^2 for the matcher
+#   ids         int32   [count]            row -> index into the identity table
+#   identities  UTF-8 JSON list of names
+#
+# The store path itself holds a pointer: POINTER_MAGIC followed by the UTF-8 file name of the
+# current generation, `<stem>.g<generation><ext>` in the same folder. A generation file is never
+# modified once written, so a reader that has it memory-mapped is never in the way of a rewrite
+# (Windows refuses to replace or delete a mapped file). Stores written in place by older versions,
+# with the data at the store path, are still read.
+MAGIC = b"SSSFACE\0"
+POINTER_MAGIC = b"SSSFPTR\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIIQQIQQQQQ")
+ALIGN = 64
+
+
+def _align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _layout(count, dim):
+    embeddings_offset = _align(HEADER.size)
+    sq_norms_offset = _align(embeddings_offset + count * dim * 4)
+    ids_offset = _align(sq_norms_offset + count * 4)
+    identities_offset = _align(ids_offset + count * 4)
+    return embeddings_offset, sq_norms_offset, ids_offset, identities_offset
+
+
+class NameTable:
+    """Read-only per-row name sequence backed by an identity table and an int32 id column."""
+
+    def __init__(self, identities, ids):
+        self.identities = identities
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self.identities[i] for i in self.ids[row]]
+        return self.identities[self.ids[row]]
+
+    def __iter__(self):
+        for i in self.ids:
+            yield self.identities[i]
+
+
+def generation_path(path, generation):
+    """Data file of `generation` for the store at `path`"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.g{generation}{ext}"
+
+
+def resolve(path):
+    """Data file behind the store path: the generation its pointer names, or `path` for an in-place store."""
+    with open(path, "rb") as f:
+        if f.read(len(POINTER_MAGIC)) != POINTER_MAGIC:
+            return path
+        name = f.read().decode("utf-8")
+    return os.path.join(os.path.dirname(path), name)
+
+
+def _replace(src, dst, attempts=20, delay=0.05):
+    """os.replace that retries while another process briefly holds `dst` open (a sharing violation on Windows)"""
+    for attempt in range(attempts):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(delay)
+
+
+def remove_stale_generations(path, keep=()):
+    """
+    Delete generation files of the store at `path` other than the current one and `keep`.
+
+    A file another process still has mapped cannot be deleted on Windows; it is skipped and
+    goes on a later call, once that process has moved to a newer generation. Returns the
+    removed paths.
+    """
+    try:
+        current = resolve(path)
+    except OSError:
+        return []
+    keep = {os.path.abspath(p) for p in (current, *keep)}
+    folder = os.path.dirname(path) or "."
+    root, ext = os.path.splitext(os.path.basename(path))
+    pattern = re.compile(re.escape(root) + r"\.g\d+" + re.escape(ext) + "$")
+    removed = []
+    for name in os.listdir(folder):
+        candidate = os.path.join(folder, name)
+        if pattern.match(name) and os.path.abspath(candidate) not in keep:
+            try:
+                os.remove(candidate)
+                removed.append(candidate)
+            except OSError:
+                pass  # still mapped by a reader
+    return removed
+
+
+def read_header(path):
+    """Return the header fields as a dict, raising ValueError for files that are not a store."""
+    path = resolve(path)
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path} is too short to be an embedding store")
+    (magic, version, dim, count, generation, n_identities,
+     embeddings_offset, sq_norms_offset, ids_offset, identities_offset, identities_length) = HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not an embedding store")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported embedding store version {version}")
+    return {
+        "dim": dim,
+        "count": count,
+        "generation": generation,
+        "n_identities": n_identities,
+        "embeddings_offset": embeddings_offset,
+        "sq_norms_offset": sq_norms_offset,
+        "ids_offset": ids_offset,
+        "identities_offset": identities_offset,
+        "identities_length": identities_length,
+    }
+
+
+def write_store(path, encodings, names, generation=None):
+    """
+    Write encodings and names as a new generation file and point the store at `path` to it.
+
+    The generation file is fully written and flushed under a temporary name, then the small
+    pointer at `path` is swapped atomically. A process that has the old generation mapped
+    keeps reading a complete file and a watcher never sees a half-written one. The previous
+    generation is kept for readers that have not remapped yet; older ones are removed.
+    `generation` defaults to the previous store's generation + 1.
+    """
+    encodings = np.asarray(encodings, dtype=np.float32)
+    count = len(names)
+    dim = encodings.shape[1] if encodings.ndim == 2 else 128
+    encodings = encodings.reshape(count, dim)
+    try:
+        previous = resolve(path)
+    except OSError:
+        previous = None
+    if generation is None:
+        try:
+            generation = read_header(path)["generation"] + 1
+        except (OSError, ValueError):
+            generation = 1
+
+    identities = list(dict.fromkeys(names))  # first-seen order
+    lookup = {name: i for i, name in enumerate(identities)}
+    ids = np.fromiter((lookup[name] for name in names), dtype=np.int32, count=count)
+    identities_blob = json.dumps(identities, ensure_ascii=False).encode("utf-8")
+
+    embeddings_offset, sq_norms_offset, ids_offset, identities_offset = _layout(count, dim)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, dim, count, generation, len(identities),
+        embeddings_offset, sq_norms_offset, ids_offset, identities_offset, len(identities_blob),
+    )
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    data_path = generation_path(path, generation)
+    tmp_path = f"{data_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for offset, block in (
+            (embeddings_offset, encodings),
+            (sq_norms_offset, np.einsum("ij,ij->i", encodings, encodings).astype(np.float32)),
+            (ids_offset, ids),
+            (identities_offset, identities_blob),
+        ):
+            f.seek(offset)
+            f.write(block if isinstance(block, bytes) else block.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    _replace(tmp_path, data_path)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(POINTER_MAGIC + os.path.basename(data_path).encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    _replace(tmp_path, path)
+    # An in-place store from an older version was just replaced by the pointer, nothing else to keep
+    keep = [previous] if previous is not None and previous != path else []
+    remove_stale_generations(path, keep=keep)
+    return generation
+
+
+class EmbeddingStore:
+    """
+    Zero-copy view of a store file.
+
+    Embeddings, norms and ids are np.memmap views, so opening is O(identities) whatever the
+    gallery size, and pages are shared through the OS page cache by every screening process
+    on the host that maps the same file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        path = self.data_path = resolve(path)  # the generation file, mapped below
+        header = read_header(path)
+        self.dim = header["dim"]
+        self.count = header["count"]
+        self.generation = header["generation"]
+        if self.count:
+            self.embeddings = np.memmap(path, dtype=np.float32, mode="r",
+                                        offset=header["embeddings_offset"], shape=(self.count, self.dim))
+            self.sq_norms = np.memmap(path, dtype=np.float32, mode="r",
+                                      offset=header["sq_norms_offset"], shape=(self.count,))
+            self.ids = np.memmap(path, dtype=np.int32, mode="r", offset=header["ids_offset"], shape=(self.count,))
+        else:
+            self.embeddings = np.empty((0, self.dim), dtype=np.float32)
+            self.sq_norms = np.empty(0, dtype=np.float32)
+            self.ids = np.empty(0, dtype=np.int32)
+        with open(path, "rb") as f:
+            f.seek(header["identities_offset"])
+            self.identities = json.loads(f.read(header["identities_length"]).decode("utf-8"))
+        if len(self.identities) != header["n_identities"]:
+            raise ValueError(f"{path} has a corrupt identity table")
+        self.names = NameTable(self.identities, self.ids)
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,154 @@
+import argparse
+import glob
+import hashlib
+import os
+import shutil
+import sys
+
+from accessory_detector import ACCESSORY_DEFAULTS, backend_weights
+from settings import load_section
+
+YOLOV5_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "yolov5")
+
+# yolov5/export.py format names for the backends main.py can load
+EXPORT_FORMATS = {
+    "onnx": "onnx",
+    "openvino": "openvino",
+}
+BACKEND_CHOICES = (*EXPORT_FORMATS, "openvino_int8")
+
+CALIBRATION_DIR = "calibration_frames"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+FRAME_SIZE = (640, 480)  # what the screening camera delivers, calibration frames are brought to this shape
+
+
+def _yolov5_path():
+    if YOLOV5_DIR not in sys.path:
+        sys.path.insert(0, YOLOV5_DIR)
+
+
+def export_model(weights, backend, imgsz=640):
+    """
+    Export the PyTorch accessory model for `backend` with yolov5/export.py and return the artifact path.
+
+    Height and width are exported as dynamic axes, so one model serves full frames from any camera
+    resolution as well as the variable-size face crops of the ROI mode.
+    """
+    if backend not in EXPORT_FORMATS:
+        raise ValueError(f"Cannot export for backend '{backend}', expected one of: {', '.join(EXPORT_FORMATS)}")
+    _yolov5_path()
+    import export  # yolov5/export.py
+
+    export.run(weights=weights, imgsz=(imgsz, imgsz), include=(EXPORT_FORMATS[backend],), device="cpu", dynamic=True)
+    path = backend_weights(weights, backend)
+    if not os.path.exists(path):
+        raise RuntimeError(f"Export finished but {path} was not written")
+    return path
+
+
+def list_images(folder):
+    return sorted(p for p in glob.glob(os.path.join(folder, "**", "*"), recursive=True)
+                  if p.lower().endswith(IMAGE_EXTENSIONS))
+
+
+def is_held_out(path, fraction=0.2):
+    """Stable split by file name, so calibration never sees the images the report is scored on"""
+    digest = hashlib.sha1(os.path.basename(path).encode("utf-8")).digest()
+    return digest[0] < 256 * fraction
+
+
+def capture_frames(count, folder=CALIBRATION_DIR, every=5, camera=0):
+    """Save `count` frames from the lane camera, one every `every` frames, as calibration samples"""
+    import cv2
+
+    os.makedirs(folder, exist_ok=True)
+    cap = cv2.VideoCapture(camera)
+    if not cap.isOpened():
+        raise RuntimeError("Could not access the webcam.")
+    saved = read = 0
+    try:
+        while saved < count:
+            ret, frame = cap.read()
+            if not ret:
+                raise RuntimeError("Camera read failed")
+            read += 1
+            if read % every == 0:
+                cv2.imwrite(os.path.join(folder, f"frame_{saved:05d}.jpg"), frame)
+                saved += 1
+    finally:
+        cap.release()
+    print(f"✅ {saved} calibration frames saved to {folder}")
+
+
+def calibration_input(path, size):
+    """A sample frame prepared exactly like AutoShape prepares a camera frame: (1, 3, H, W) float32 in 0-1"""
+    import cv2
+    import numpy as np
+
+    _yolov5_path()
+    from utils.augmentations import letterbox
+    from utils.general import make_divisible
+
+    frame = cv2.imread(path)  # BGR, as SecuritySystem passes frames
+    if frame.shape[1::-1] != FRAME_SIZE:
+        frame = cv2.resize(frame, FRAME_SIZE, interpolation=cv2.INTER_AREA)
+    g = size / max(frame.shape[:2])
+    shape1 = [make_divisible(int(y * g), 32) for y in frame.shape[:2]]
+    x = letterbox(frame, shape1, auto=False)[0]
+    return np.ascontiguousarray(x.transpose((2, 0, 1))[None], dtype=np.float32) / 255
+
+
+def quantize_openvino(weights, frames_dir, size=640, subset_size=300):
+    """
+    INT8 post-training quantization of the OpenVINO model, calibrated on sample frames with NNCF.
+
+    The FP32 OpenVINO model is exported first if needed. Held-out frames (see is_held_out) are kept
+    out of calibration for the accuracy report. Returns the *_int8_openvino_model folder.
+    """
+    import nncf
+    import openvino.runtime as ov
+
+    frames = [p for p in list_images(frames_dir) if not is_held_out(p)]
+    if not frames:
+        raise ValueError(f"No calibration images under {frames_dir}, capture some with --capture")
+
+    fp32_dir = backend_weights(weights, "openvino")
+    if not os.path.exists(fp32_dir):
+        export_model(weights, "openvino", size)
+    xml = next(f for f in os.listdir(fp32_dir) if f.endswith(".xml"))
+    ov_model = ov.Core().read_model(os.path.join(fp32_dir, xml))
+
+    dataset = nncf.Dataset(frames, lambda path: calibration_input(path, size))
+    quantized = nncf.quantize(ov_model, dataset, preset=nncf.QuantizationPreset.MIXED,
+                              subset_size=min(subset_size, len(frames)))
+
+    out_dir = backend_weights(weights, "openvino_int8")
+    os.makedirs(out_dir, exist_ok=True)
+    ov.serialize(quantized, os.path.join(out_dir, xml))
+    metadata = xml.replace(".xml", ".yaml")  # stride and class names for DetectMultiBackend
+    shutil.copy(os.path.join(fp32_dir, metadata), os.path.join(out_dir, metadata))
+    print(f"[Quantize] Calibrated on {min(subset_size, len(frames))} of {len(frames)} frames from {frames_dir}")
+    return out_dir
+
+
+def parse_args():
+    config = load_section("accessory_detection", ACCESSORY_DEFAULTS)
+    parser = argparse.ArgumentParser(description="Export the accessory detector for a CPU inference runtime")
+    parser.add_argument("--backend", choices=BACKEND_CHOICES, default="onnx")
+    parser.add_argument("--weights", default=config["weights"], help="PyTorch weights to export")
+    parser.add_argument("--imgsz", type=int, default=config["size"], help="trace/calibration size, inference stays dynamic")
+    parser.add_argument("--frames", default=CALIBRATION_DIR, help="sample frames for INT8 calibration")
+    parser.add_argument("--capture", type=int, default=0, help="first save this many camera frames into --frames")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.capture:
+        capture_frames(args.capture, args.frames)
+    if args.backend == "openvino_int8":
+        path = quantize_openvino(args.weights, args.frames, args.imgsz)
+    else:
+        path = export_model(args.weights, args.backend, args.imgsz)
+    print(f"✅ {args.backend} model saved to {path}")
+    print(f'Set "backend": "{args.backend}" under "accessory_detection" in config/system_config.json to use it')
@@ -0,0 +1,403 @@
+import pickle
+
+import numpy as np
+
+# Defaults for the "face_matching" section of config/system_config.json
+MATCHING_DEFAULTS = {
+    "ann_enabled": True,               # use the IVF index when one has been built
+    "ann_min_gallery_size": 100000,    # save_encodings.py only builds the index above this size
+    "ann_nlist": 0,                    # number of k-means cells, 0 = sqrt(gallery size)
+    "ann_nprobe": 8,                   # cells searched per query: higher = better recall, slower
+    "ann_exact_margin": 0.05,          # re-check exhaustively when the best distance is this close to the threshold
+    "centroid_prefilter": True,        # rank identities by centroid distance before comparing member encodings
+    "prefilter_candidates": 3,         # identities whose members are compared per round
+    "reload_interval": 5.0,            # seconds between checks for a new encodings store, 0 = never reload
+}
+
+
+def _built_for(data, gallery):
+    """Whether an index file saved by IVFIndex/CentroidIndex.save() belongs to this gallery"""
+    if int(data["gallery_size"]) != len(gallery):
+        return False
+    generation = int(data["generation"]) if "generation" in data.files else -1
+    return generation == -1 or gallery.generation is None or generation == gallery.generation
+
+
+class FaceGallery:
+    """
+    Watchlist of face encodings held as one contiguous float32 (N x dim) matrix.
+
+    Squared norms of the gallery rows are computed once when rows are added, so matching
+    every face in a frame is a single matrix product:
+        ||q - g||^2 = ||q||^2 + ||g||^2 - 2 q.g
+    Distances are Euclidean, the same metric as face_recognition.face_distance.
+    """
+
+    def __init__(self, encodings=None, names=None, dim=None, capacity=1024):
+        if dim is None:
+            dim = np.shape(encodings)[-1] if encodings is not None and len(encodings) else 128
+        self.dim = dim
+        self.count = 0
+        self.generation = None  # store generation the gallery was loaded from, if any
+        self._matrix = np.empty((max(capacity, 1), dim), dtype=np.float32)
+        self._sq_norms = np.empty(max(capacity, 1), dtype=np.float32)
+        self.names = []
+        if encodings is not None and len(encodings):
+            self.add(encodings, names)
+
+    @classmethod
+    def from_pickle(cls, path):
+        """Load the (encodings, names) pickle written by save_encodings.py"""
+        with open(path, "rb") as f:
+            encodings, names = pickle.load(f)
+        return cls(encodings, names, capacity=len(encodings))
+
+    @classmethod
+    def from_store(cls, store):
+        """
+        Wrap an EmbeddingStore without copying: the matrix, norms and names stay memory-mapped.
+        The gallery is read-only until add() is called, which copies it into private memory.
+        """
+        gallery = cls(dim=store.dim, capacity=1)
+        gallery._matrix = store.embeddings
+        gallery._sq_norms = store.sq_norms
+        gallery.names = store.names
+        gallery.count = len(store)
+        gallery.generation = store.generation
+        return gallery
+
+    def __len__(self):
+        return self.count
+
+    def identity_table(self):
+        """Return (identity names, per-row identity index)"""
+        ids = getattr(self.names, "ids", None)
+        if ids is not None:
+            return list(self.names.identities), np.asarray(ids)
+        identities, row_identity = np.unique(np.asarray(self.names, dtype=object).astype(str), return_inverse=True)
+        return identities.tolist(), row_identity
+
+    @property
+    def embeddings(self):
+        return self._matrix[:self.count]
+
+    @property
+    def sq_norms(self):
+        return self._sq_norms[:self.count]
+
+    def _reserve(self, needed):
+        capacity = self._matrix.shape[0]
+        if needed <= capacity and self._matrix.flags.writeable:
+            return
+        capacity = max(capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        matrix = np.empty((capacity, self.dim), dtype=np.float32)
+        sq_norms = np.empty(capacity, dtype=np.float32)
+        matrix[:self.count] = self._matrix[:self.count]
+        sq_norms[:self.count] = self._sq_norms[:self.count]
+        self._matrix, self._sq_norms = matrix, sq_norms
+
+    def add(self, encodings, names):
+        """Append encodings (M x dim) with their names to the gallery."""
+        encodings = np.asarray(encodings, dtype=np.float32).reshape(-1, self.dim)
+        if len(encodings) != len(names):
+            raise ValueError("Number of encodings and names must match")
+        start, end = self.count, self.count + len(encodings)
+        self._reserve(end)
+        self._matrix[start:end] = encodings
+        self._sq_norms[start:end] = np.einsum("ij,ij->i", encodings, encodings)
+        if not isinstance(self.names, list):
+            self.names = list(self.names)
+        self.names.extend(names)
+        self.count = end
+        self.generation = None
+
+    def distances(self, queries):
+        """Euclidean distances between every query (M x dim) and every gallery row, shape (M, N)."""
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        q_sq = np.einsum("ij,ij->i", queries, queries)
+        d2 = queries @ self.embeddings.T
+        d2 *= -2
+        d2 += q_sq[:, None]
+        d2 += self.sq_norms[None, :]
+        np.maximum(d2, 0, out=d2)  # rounding can push exact matches slightly negative
+        return np.sqrt(d2, out=d2)
+
+    def match(self, queries, k=1, threshold=None):
+        """
+        Match all queries at once.
+
+        Returns (names, distances): names is a list with one list of k names per query,
+        distances is an (M, k) array sorted ascending. Missing neighbours (k > N) come back
+        as None names with infinite distance. `threshold` is accepted for API parity with
+        IVFIndex.match; brute force is always exact so it is not needed here.
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        m = len(queries)
+        top_names = [[None] * k for _ in range(m)]
+        top_dist = np.full((m, k), np.inf, dtype=np.float32)
+        if m == 0 or self.count == 0:
+            return top_names, top_dist
+
+        dist = self.distances(queries)
+        kk = min(k, self.count)
+        if kk < self.count:
+            idx = np.argpartition(dist, kk - 1, axis=1)[:, :kk]
+        else:
+            idx = np.broadcast_to(np.arange(self.count), (m, self.count))
+        part = np.take_along_axis(dist, idx, axis=1)
+        order = np.argsort(part, axis=1)
+        idx = np.take_along_axis(idx, order, axis=1)
+        top_dist[:, :kk] = np.take_along_axis(part, order, axis=1)
+        for i in range(m):
+            top_names[i][:kk] = [self.names[j] for j in idx[i]]
+        return top_names, top_dist
+
+
+class IVFIndex:
+    """
+    Approximate nearest-neighbour index (inverted file) over a FaceGallery, pure NumPy.
+
+    Gallery rows are clustered with k-means into `nlist` cells. A query is only compared
+    against the rows of its `nprobe` closest cells, so raising `nprobe` trades speed for
+    recall (nprobe == nlist is exhaustive). Approximate search can only miss neighbours,
+    never invent closer ones, so queries whose best approximate distance lands within
+    `exact_margin` of the match threshold are re-checked with the exact brute-force path.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, gallery, centroids, list_offsets, list_rows, nprobe=8, exact_margin=0.05):
+        self.gallery = gallery
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.centroid_sq_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+        self.list_offsets = np.asarray(list_offsets, dtype=np.int64)
+        self.list_rows = np.asarray(list_rows, dtype=np.int64)
+        self.nprobe = nprobe
+        self.exact_margin = exact_margin
+        self.exact_fallbacks = 0  # queries re-checked exhaustively, for monitoring
+
+    @property
+    def nlist(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, gallery, nlist=None, iterations=10, sample_size=None, seed=0, **kwargs):
+        """Cluster the gallery rows with k-means and build the inverted lists."""
+        n = len(gallery)
+        if n == 0:
+            raise ValueError("Cannot build an index over an empty gallery")
+        if not nlist:
+            nlist = int(np.sqrt(n))
+        nlist = max(1, min(nlist, n))
+        rng = np.random.default_rng(seed)
+        data = gallery.embeddings
+
+        # Train on a sample, k-means converges long before it needs every row
+        sample_size = sample_size or min(n, 256 * nlist)
+        sample = data[rng.choice(n, size=sample_size, replace=False)] if sample_size < n else data
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = cls._nearest_centroid(sample, centroids)
+            counts = np.bincount(assign, minlength=nlist)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            # Re-seed empty cells with random sample points
+            empty = np.flatnonzero(~filled)
+            if len(empty):
+                centroids[empty] = sample[rng.choice(len(sample), size=len(empty))]
+
+        assign = cls._nearest_centroid(data, centroids)
+        list_rows = np.argsort(assign, kind="stable")
+        list_offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=nlist), out=list_offsets[1:])
+        return cls(gallery, centroids, list_offsets, list_rows, **kwargs)
+
+    @staticmethod
+    def _nearest_centroid(data, centroids, chunk=16384):
+        c_sq = np.einsum("ij,ij->i", centroids, centroids)
+        assign = np.empty(len(data), dtype=np.int64)
+        for start in range(0, len(data), chunk):
+            block = data[start:start + chunk]
+            # ||x||^2 is constant per row, so it does not change the argmin
+            d2 = c_sq[None, :] - 2 * (block @ centroids.T)
+            assign[start:start + chunk] = np.argmin(d2, axis=1)
+        return assign
+
+    def save(self, path):
+        np.savez(
+            path,
+            version=self.FORMAT_VERSION,
+            gallery_size=len(self.gallery),
+            generation=-1 if self.gallery.generation is None else self.gallery.generation,
+            centroids=self.centroids,
+            list_offsets=self.list_offsets,
+            list_rows=self.list_rows,
+        )
+
+    @classmethod
+    def load(cls, path, gallery, **kwargs):
+        """Load an index saved by save(); raises ValueError if it was built for a different gallery."""
+        with np.load(path) as data:
+            if int(data["version"]) != cls.FORMAT_VERSION:
+                raise ValueError(f"Unsupported index version {int(data['version'])}")
+            if not _built_for(data, gallery):
+                raise ValueError("Index was built for a different gallery, rebuild it with save_encodings.py")
+            return cls(gallery, data["centroids"], data["list_offsets"], data["list_rows"], **kwargs)
+
+    def _probe(self, query, k, nprobe):
+        q_sq = float(query @ query)
+        d2c = self.centroid_sq_norms - 2 * (self.centroids @ query)
+        if nprobe < self.nlist:
+            cells = np.argpartition(d2c, nprobe - 1)[:nprobe]
+        else:
+            cells = np.arange(self.nlist)
+        rows = np.concatenate([self.list_rows[self.list_offsets[c]:self.list_offsets[c + 1]] for c in cells])
+        if len(rows) == 0:
+            return rows, np.empty(0, dtype=np.float32)
+        d2 = self.gallery.sq_norms[rows] - 2 * (self.gallery.embeddings[rows] @ query) + q_sq
+        dist = np.sqrt(np.maximum(d2, 0))
+        kk = min(k, len(rows))
+        top = np.argpartition(dist, kk - 1)[:kk] if kk < len(rows) else np.arange(len(rows))
+        top = top[np.argsort(dist[top])]
+        return rows[top], dist[top]
+
+    def match(self, queries, k=1, threshold=None, nprobe=None):
+        """Same contract as FaceGallery.match, with approximate search plus the exactness fallback."""
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.gallery.dim)
+        m = len(queries)
+        top_names = [[None] * k for _ in range(m)]
+        top_dist = np.full((m, k), np.inf, dtype=np.float32)
+        if m == 0 or len(self.gallery) == 0:
+            return top_names, top_dist
+        nprobe = max(1, min(nprobe or self.nprobe, self.nlist))
+
+        recheck = []
+        for i, query in enumerate(queries):
+            rows, dist = self._probe(query, k, nprobe)
+            top_dist[i, :len(rows)] = dist
+            top_names[i][:len(rows)] = [self.gallery.names[j] for j in rows]
+            if threshold is not None and (len(rows) == 0 or abs(dist[0] - threshold) <= self.exact_margin):
+                recheck.append(i)
+
+        if recheck:
+            self.exact_fallbacks += len(recheck)
+            exact_names, exact_dist = self.gallery.match(queries[recheck], k=k)
+            for j, i in enumerate(recheck):
+                top_names[i] = exact_names[j]
+                top_dist[i] = exact_dist[j]
+        return top_names, top_dist
+
+
+class CentroidIndex:
+    """
+    Per-identity centroid prefilter over a FaceGallery.
+
+    Enrollment stores several near-duplicate encodings per person (augmented copies), so the
+    gallery is summarised as one centroid and radius per identity. Identities are visited in
+    order of the triangle-inequality lower bound max(0, d(q, centroid) - radius), comparing
+    only the member encodings of the next few candidates, and the search stops as soon as
+    the next bound cannot beat the current k-th best distance. Results are therefore exactly
+    those of brute-force matching, while most identities are never expanded.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, gallery, identities, centroids, radii, member_offsets, member_rows, candidates=3):
+        self.gallery = gallery
+        self.identities = list(identities)
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.centroid_sq_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+        self.radii = np.asarray(radii, dtype=np.float32)
+        self.member_offsets = np.asarray(member_offsets, dtype=np.int64)
+        self.member_rows = np.asarray(member_rows, dtype=np.int64)
+        self.candidates = max(1, candidates)
+        self.comparisons = 0  # member encodings compared so far, for monitoring
+
+    @classmethod
+    def build(cls, gallery, **kwargs):
+        """Group gallery rows by name and compute each identity's centroid and radius."""
+        identities, row_identity = gallery.identity_table()
+        member_rows = np.argsort(row_identity, kind="stable")
+        member_offsets = np.zeros(len(identities) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_identity, minlength=len(identities)), out=member_offsets[1:])
+
+        data = gallery.embeddings
+        centroids = np.zeros((len(identities), gallery.dim), dtype=np.float32)
+        np.add.at(centroids, row_identity, data)
+        centroids /= np.diff(member_offsets)[:, None]
+        spread = np.linalg.norm(data - centroids[row_identity], axis=1)
+        radii = np.zeros(len(identities), dtype=np.float32)
+        np.maximum.at(radii, row_identity, spread)
+        radii += 1e-4  # slack for float32 rounding so the lower bound never overshoots
+        return cls(gallery, identities, centroids, radii, member_offsets, member_rows, **kwargs)
+
+    def save(self, path):
+        np.savez(
+            path,
+            version=self.FORMAT_VERSION,
+            gallery_size=len(self.gallery),
+            generation=-1 if self.gallery.generation is None else self.gallery.generation,
+            identities=np.asarray(self.identities, dtype=str),
+            centroids=self.centroids,
+            radii=self.radii,
+            member_offsets=self.member_offsets,
+            member_rows=self.member_rows,
+        )
+
+    @classmethod
+    def load(cls, path, gallery, **kwargs):
+        """Load centroids saved by save(); raises ValueError if they were built for a different gallery."""
+        with np.load(path) as data:
+            if int(data["version"]) != cls.FORMAT_VERSION:
+                raise ValueError(f"Unsupported centroid file version {int(data['version'])}")
+            if not _built_for(data, gallery):
+                raise ValueError("Centroids were built for a different gallery, rerun save_encodings.py")
+            return cls(
+                gallery, data["identities"].tolist(), data["centroids"], data["radii"],
+                data["member_offsets"], data["member_rows"], **kwargs
+            )
+
+    def _search(self, query, k):
+        q_sq = float(query @ query)
+        dc = np.sqrt(np.maximum(self.centroid_sq_norms - 2 * (self.centroids @ query) + q_sq, 0))
+        bounds = np.maximum(dc - self.radii, 0)
+        order = np.argsort(bounds)
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_dist = np.empty(0, dtype=np.float32)
+        start, batch_size = 0, self.candidates
+        while start < len(order):
+            # Every remaining identity is at least bounds[order[start]] away
+            if len(best_dist) == k and bounds[order[start]] >= best_dist[-1]:
+                break
+            batch = order[start:start + batch_size]
+            # Faces far from everyone (no match) need many identities, so widen each round
+            start += batch_size
+            batch_size *= 2
+            rows = np.concatenate([self.member_rows[self.member_offsets[i]:self.member_offsets[i + 1]] for i in batch])
+            self.comparisons += len(rows)
+            d2 = self.gallery.sq_norms[rows] - 2 * (self.gallery.embeddings[rows] @ query) + q_sq
+            dist = np.sqrt(np.maximum(d2, 0)).astype(np.float32)
+            rows = np.concatenate([best_rows, rows])
+            dist = np.concatenate([best_dist, dist])
+            top = np.argsort(dist, kind="stable")[:k]
+            best_rows, best_dist = rows[top], dist[top]
+        return best_rows, best_dist
+
+    def match(self, queries, k=1, threshold=None):
+        """Same contract as FaceGallery.match; `threshold` is unused because the search is exact."""
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.gallery.dim)
+        m = len(queries)
+        top_names = [[None] * k for _ in range(m)]
+        top_dist = np.full((m, k), np.inf, dtype=np.float32)
+        if m == 0 or len(self.gallery) == 0:
+            return top_names, top_dist
+        for i, query in enumerate(queries):
+            rows, dist = self._search(query, k)
+            top_dist[i, :len(rows)] = dist
+            top_names[i][:len(rows)] = [self.gallery.names[j] for j in rows]
+        return top_names, top_dist
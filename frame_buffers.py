@@ -0,0 +1,68 @@
+import threading
+
+import numpy as np
+
+
+class FramePool:
+    """
+    Recycles frame-sized arrays so the pipeline does not allocate a fresh ~1 MB image per frame.
+
+    A stage takes a buffer with acquire() and writes into it (cv2 `dst=` arguments). Whoever
+    drops the last reference to the frame hands it back with release(); a buffer that is never
+    released is simply garbage collected, so a dropped job only costs one allocation later on.
+    At most `max_free` idle buffers per shape are kept. Safe to use from several threads.
+    """
+
+    def __init__(self, max_free=8):
+        self.max_free = max_free
+        self._free = {}  # (shape, dtype) -> list of idle arrays
+        self._lock = threading.Lock()
+        self.allocated = 0
+        self.reused = 0
+
+    def acquire(self, shape, dtype=np.uint8):
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self.reused += 1
+                return free.pop()
+            self.allocated += 1
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, array):
+        """Return a buffer nobody uses any more. None and array views are ignored."""
+        if array is None or array.base is not None or not array.flags.c_contiguous:
+            return
+        key = (array.shape, array.dtype.str)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_free and not any(a is array for a in free):
+                free.append(array)
+
+    def stats(self):
+        with self._lock:
+            idle = sum(len(free) for free in self._free.values())
+        return {"allocated": self.allocated, "reused": self.reused, "idle": idle}
+
+
+class ScratchBuffers:
+    """
+    Named arrays that one thread reuses from call to call, reallocated only when the shape changes.
+
+    Use `slots` > 1 for a result that must outlive the next call (e.g. the previous grey frame a
+    tracker keeps for optical flow): successive calls then rotate through that many arrays.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self._turns = {}
+
+    def get(self, name, shape, dtype=np.uint8, slots=1):
+        turn = self._turns.get(name, 0)
+        self._turns[name] = (turn + 1) % slots
+        key = (name, turn)
+        buf = self._buffers.get(key)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = self._buffers[key] = np.empty(shape, dtype=dtype)
+        return buf
@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+
+
+class FrameStats:
+    """
+    Brightness, contrast, colour and texture of one frame, measured in a single pass.
+
+    One cv2.meanStdDev over the colour image gives the per-channel variances, one over its
+    grayscale the mean and variance, and one over an int16 Laplacian the edge variance. The frame
+    is measured at full resolution: the flat-frame thresholds were tuned there, and downsampling
+    would average away most of the sensor noise that keeps a dark, noisy frame from looking flat.
+    """
+
+    def __init__(self, gray_mean, gray_var, color_var, edge_var):
+        self.gray_mean = gray_mean  # mean brightness, 0-255
+        self.gray_var = gray_var    # grayscale variance
+        self.color_var = color_var  # variance averaged over the B, G and R channels
+        self.edge_var = edge_var    # variance of the Laplacian, i.e. how much texture there is
+
+    @classmethod
+    def compute(cls, frame):
+        _, channel_std = cv2.meanStdDev(frame)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray_mean, gray_std = cv2.meanStdDev(gray)
+        _, edge_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))  # uint8 input cannot overflow int16
+        return cls(
+            float(gray_mean[0, 0]),
+            float(gray_std[0, 0]) ** 2,
+            float(np.mean(channel_std ** 2)),
+            float(edge_std[0, 0]) ** 2,
+        )
+
+    def is_flat(self, gray_thresh=15, color_var_thresh=30, edge_thresh=25):
+        """Black/white/grey, or a low-texture plain colour frame with at most a slight gradient"""
+        # 1. Too dark/bright with low variance
+        if (self.gray_mean < 10 or self.gray_mean > 245) and self.gray_var < gray_thresh:
+            return True
+        # 2. Very flat grayscale
+        if self.gray_var < gray_thresh:
+            return True
+        # 3. Plain color frame (even with slight gradient)
+        return self.color_var < color_var_thresh and self.edge_var < edge_thresh
+
+    def __repr__(self):
+        return (f"FrameStats(gray_mean={self.gray_mean:.1f}, gray_var={self.gray_var:.1f}, "
+                f"color_var={self.color_var:.1f}, edge_var={self.edge_var:.1f})")
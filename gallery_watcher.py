@@ -0,0 +1,77 @@
+import os
+import threading
+
+from embedding_store import read_header
+
+
+class GalleryWatcher(threading.Thread):
+    """
+    Polls the encodings store (and the sidecar files built from it) and reloads the matcher
+    in the background when a new version appears.
+
+    `load()` builds and validates a replacement off the screening threads, and `on_reload()`
+    receives it; the caller swaps its reference in one assignment, so a frame in flight keeps
+    using whichever matcher it grabbed. A change is only acted on once it has been stable for
+    one poll, which skips sidecars caught half-written. A failed load keeps the current matcher
+    and is retried when the files change again.
+    """
+
+    def __init__(self, store_path, load, on_reload, extra_paths=(), interval=5.0):
+        super().__init__(daemon=True, name="GalleryWatcher")
+        self.store_path = store_path
+        self.paths = [store_path, *extra_paths]
+        self.load = load
+        self.on_reload = on_reload
+        self.interval = interval
+        self.reloads = 0
+        self.failures = 0
+        self.last_error = None
+        self._loaded = self.signature()
+        self._pending = None
+        self._stop_event = threading.Event()
+
+    def signature(self):
+        """Identity of the files on disk: (mtime, size, inode) per path plus the store generation"""
+        parts = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                parts.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                parts.append(None)
+        try:
+            parts.append(read_header(self.store_path)["generation"])
+        except (OSError, ValueError):
+            parts.append(None)
+        return tuple(parts)
+
+    def poll(self):
+        """Check once, reloading if a change has settled. Returns True when a new matcher was installed."""
+        current = self.signature()
+        if current == self._loaded:
+            self._pending = None
+            return False
+        if current != self._pending:
+            self._pending = current  # wait one more poll for writers to finish
+            return False
+        self._pending = None
+        self._loaded = current
+        try:
+            replacement = self.load()
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            print(f"[Matcher] Keeping current watchlist, reload failed: {e}")
+            return False
+        self.on_reload(replacement)
+        self.reloads += 1
+        return True
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.poll()
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
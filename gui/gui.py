@@ -1,12 +1,43 @@
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
-from PIL import Image, ImageTk
 import cv2
+import numpy as np
+import threading
 import time
 import os
 
 LOG_DIR = "csv_logs"
 
+# --- Frames to Tk without PIL ---
+class FrameEncoder:
+    """
+    Turns BGR frames into binary PPM (PGM for grey frames), which Tk's photo image reads natively.
+
+    The header and pixels live in one preallocated buffer that the colour conversion writes into,
+    so a frame costs one cvtColor plus the single copy into the bytes object handed to Tk.
+    """
+
+    def __init__(self):
+        self._shape = None
+        self._buffer = None
+        self._pixels = None
+
+    def encode(self, frame):
+        if frame.shape != self._shape:
+            height, width = frame.shape[:2]
+            magic = "P6" if frame.ndim == 3 else "P5"
+            header = f"{magic} {width} {height} 255\n".encode("ascii")
+            self._buffer = bytearray(len(header) + frame.size)
+            self._buffer[:len(header)] = header
+            self._pixels = np.frombuffer(self._buffer, dtype=np.uint8, offset=len(header)).reshape(frame.shape)
+            self._shape = frame.shape
+        if frame.ndim == 3:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._pixels)
+        else:
+            self._pixels[...] = frame
+        return bytes(self._buffer)  # tkinter only passes bytes through as binary data
+
+
 # --- Simple Tooltip helper for ttk/tk widgets ---
 class ToolTip:
     def __init__(self, widget, text, delay=400):
@@ -155,6 +186,9 @@ class guiwindow:
         self.setup_threshold_controls()
 
         self.get_frame = get_frame_callback
+        self.frame_encoder = FrameEncoder()
+        self.photo = None  # one Tk photo image, reloaded in place for every new frame
+        self.shown_frame = None  # frame currently on screen, so a repeated one is not redrawn
         self.status_callback = status_callback
         self.start_camera_callback = start_camera_callback
         
@@ -198,19 +232,13 @@ class guiwindow:
     def save_threshold_to_config(self, threshold_value):
         """Save threshold value to config file for next startup"""
         try:
-            import json
-            config_dir = "config"
-            if not os.path.exists(config_dir):
-                os.makedirs(config_dir)
-                
-            config_path = os.path.join(config_dir, "system_config.json")
+            from settings import update_config
             current_time = time.ctime()
-            config_data = {
+            # Merge so other sections of the config file survive
+            update_config({
                         'recognition_threshold': threshold_value,
                         'last_updated': current_time
-                }            
-            with open(config_path, 'w') as f:
-                json.dump(config_data, f, indent=2)
+                })
             print(f"[Config] Threshold saved to config: {threshold_value} at {current_time}")
         except Exception as e:
             print(f"[Config] Error saving threshold config: {e}")
@@ -473,7 +501,7 @@ class guiwindow:
         get_is_paused, set_is_paused,
         get_pause_start_time, set_pause_start_time,
         get_paused_names_time, set_paused_names_time,
-        get_detection_time
+        get_detection_time, detection_lock=None
     ):
         self._get_is_paused = get_is_paused
         self._set_is_paused = set_is_paused
@@ -482,6 +510,8 @@ class guiwindow:
         self._get_paused_names_time = get_paused_names_time
         self._set_paused_names_time = set_paused_names_time
         self._get_detection_time = get_detection_time
+        # Held while the timers are read or shifted, the face stage changes them on another thread
+        self._detection_lock = detection_lock if detection_lock is not None else threading.Lock()
 
     def toggle_pause(self):
         if not self.camera_started:
@@ -492,7 +522,8 @@ class guiwindow:
             self._set_is_paused(True)
             self._set_pause_start_time(time.time())
             detection_time = self._get_detection_time()
-            paused_names_time = {name: time.time() - t for name, t in detection_time.items()}
+            with self._detection_lock:
+                paused_names_time = {name: time.time() - t for name, t in detection_time.items()}
             self._set_paused_names_time(paused_names_time)
             self.pause_button.config(text="▶️ Resume")
             self.style.map("TButton", background=[('active', '#005f5f'), ('!disabled', '#00af5f')])
@@ -502,8 +533,9 @@ class guiwindow:
             pause_duration = time.time() - self._get_pause_start_time()
             detection_time = self._get_detection_time()
             paused_names_time = self._get_paused_names_time()
-            for name in detection_time:
-                detection_time[name] = time.time() - paused_names_time.get(name, 0)
+            with self._detection_lock:
+                for name in detection_time:
+                    detection_time[name] = time.time() - paused_names_time.get(name, 0)
             self._set_pause_start_time(None)
             self._set_paused_names_time({})
             self.pause_button.config(text="⏸️ Pause")
@@ -530,12 +562,15 @@ class guiwindow:
 
     def update_frame(self):
         frame = self.get_frame()
-        if frame is not None:
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(frame)
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.video_label.imgtk = imgtk
-            self.video_label.config(image=imgtk)
+        # None means nothing new arrived; the paused frame and status screens come back as the same array
+        if frame is not None and frame is not self.shown_frame:
+            data = self.frame_encoder.encode(frame)
+            if self.photo is None:
+                self.photo = tk.PhotoImage(master=self.root, data=data, format="ppm")
+                self.video_label.config(image=self.photo)
+            else:
+                self.photo.configure(data=data, format="ppm")
+            self.shown_frame = frame
 
         if self.status_callback:
             status_text, status_color = self.status_callback()
@@ -0,0 +1,59 @@
+import os
+import platform
+import statistics
+import time
+
+THREAD_DEFAULTS = {
+    "torch_threads": 0,          # intra-op threads for the accessory model, 0 = tuned value or torch's default
+    "torch_interop_threads": 1,  # only one pipeline stage calls the model, extra inter-op threads just compete
+    "opencv_threads": 0,         # cv2.setNumThreads for resizing/colour conversion, 0 leaves OpenCV's default
+    "auto_tune": True,           # time a few intra-op thread counts once per host and keep the fastest
+    "reserved_cores": 1,         # cores the tuner leaves to face_recognition (dlib) and the capture thread
+    "tune_runs": 5,              # timed inferences per candidate thread count
+    "warmup_runs": 3,            # inferences at startup so the first person in line does not pay for them
+    "tuned": {},                 # written by the tuner: {"host": ..., "torch_threads": n}
+}
+
+
+def thread_candidates(cpu_count=None, reserved=1):
+    """Thread counts worth trying: powers of two up to the usable cores, plus the usable cores themselves"""
+    usable = max(1, (cpu_count or os.cpu_count() or 1) - reserved)
+    candidates = []
+    n = 1
+    while n < usable:
+        candidates.append(n)
+        n *= 2
+    candidates.append(usable)
+    return candidates
+
+
+def host_key(*parts):
+    """Identifies the machine and model setup a tuning result was measured on"""
+    return "|".join(str(p) for p in (platform.node(), platform.machine(), os.cpu_count(), *parts))
+
+
+def warm_up(run, runs=3, clock=time.perf_counter):
+    """Call run() `runs` times and return how long each call took in ms"""
+    times = []
+    for _ in range(runs):
+        start = clock()
+        run()
+        times.append((clock() - start) * 1000)
+    return times
+
+
+def tune_threads(run, set_threads, candidates, runs=5, clock=time.perf_counter):
+    """
+    Time run() under every thread count in `candidates` and leave the fastest one set.
+
+    Each candidate gets one untimed call first, so pool start-up is not charged to it.
+    Returns (best, {threads: median ms}).
+    """
+    timings = {}
+    for threads in candidates:
+        set_threads(threads)
+        run()
+        timings[threads] = statistics.median(warm_up(run, runs, clock))
+    best = min(timings, key=timings.get)
+    set_threads(best)
+    return best, timings
@@ -0,0 +1,76 @@
+import cv2
+import numpy as np
+
+LOW_LIGHT_DEFAULTS = {
+    "mode": "lut",             # "lut" reuses a tone curve over several frames, "equalize" equalizes LAB lightness per frame
+    "lut_interval": 10,        # frames a tone curve is reused before it is rebuilt from a fresh histogram
+    "brightness_drift": 8.0,   # mean-brightness change since the curve was built that rebuilds it early
+}
+
+HISTOGRAM_SIZE = (160, 120)  # the luminance histogram is taken from a thumbnail, its shape is all that matters
+
+
+def equalization_lut(gray):
+    """The 256-entry curve cv2.equalizeHist would apply to `gray`, as a uint8 lookup table"""
+    hist = np.bincount(gray.ravel(), minlength=256)
+    total = gray.size
+    first = int(np.flatnonzero(hist)[0])
+    if hist[first] == total:  # a single grey level, nothing to stretch
+        return np.full(256, first, dtype=np.uint8)
+    cdf = np.cumsum(hist) - hist[first]
+    lut = np.rint(cdf * (255.0 / (total - hist[first])))
+    lut[:first + 1] = 0
+    return np.clip(lut, 0, 255).astype(np.uint8)
+
+
+class LowLightEnhancer:
+    """
+    Brightens dark frames with a histogram-equalization tone curve applied through one cv2.LUT.
+
+    The curve is built from the luminance histogram of a thumbnail and reused for `interval`
+    frames, or until the mean brightness has moved by more than `brightness_drift` since it was
+    built, so a steady night scene pays for the histogram once every few frames and otherwise
+    for a single table lookup per pixel. The same curve is applied to B, G and R.
+    """
+
+    def __init__(self, interval=10, brightness_drift=8.0):
+        self.interval = max(1, int(interval))
+        self.brightness_drift = brightness_drift
+        self.lut = None
+        self.built_brightness = None
+        self.frames_since_build = 0
+        self.builds = 0
+
+    def needs_update(self, brightness=None):
+        if self.lut is None or self.frames_since_build >= self.interval:
+            return True
+        return (
+            brightness is not None
+            and self.brightness_drift > 0
+            and abs(brightness - self.built_brightness) > self.brightness_drift
+        )
+
+    def update(self, frame, brightness=None):
+        thumb = cv2.resize(frame, HISTOGRAM_SIZE, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY) if thumb.ndim == 3 else thumb
+        self.lut = equalization_lut(gray)
+        self.built_brightness = float(np.mean(gray)) if brightness is None else brightness
+        self.frames_since_build = 0
+        self.builds += 1
+
+    def enhance(self, frame, brightness=None, out=None):
+        """
+        Return the enhanced frame, written into `out` when given (it may be `frame` itself).
+
+        `brightness` is the frame's mean grey level when the caller already has it (FrameStats),
+        it lets a sudden change in lighting rebuild the curve before the interval is up.
+        """
+        if self.needs_update(brightness):
+            self.update(frame, brightness)
+        self.frames_since_build += 1
+        return cv2.LUT(frame, self.lut, dst=out)
+
+    def reset(self):
+        self.lut = None
+        self.built_brightness = None
+        self.frames_since_build = 0
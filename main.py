@@ -13,60 +13,129 @@ def _import_or_exit(module, pip_name=None):
 os = _import_or_exit('os')
 sys = _import_or_exit('sys')
 time = _import_or_exit('time')
-pickle = _import_or_exit('pickle')
 threading = _import_or_exit('threading')
 datetime = _import_or_exit('datetime')
 json = _import_or_exit('json')
 
+try:
+    from startup import BackgroundLoader, LazyModule, STARTUP_DEFAULTS, StartupReport, require
+except ImportError:
+    print("\n[ERROR] Required module 'startup' is missing or has import errors.\n")
+    exit(1)
+startup_report = StartupReport()
+
 # Imports that may fail and need user-friendly error
 try:
-    import cv2
+    with startup_report.timed("import", "cv2"):
+        import cv2
 except ImportError:
     print("\n[ERROR] Required package 'cv2' is not installed.\nPlease install it with: pip install opencv-python\n")
     exit(1)
 try:
-    import numpy as np
+    with startup_report.timed("import", "numpy"):
+        import numpy as np
 except ImportError:
     print("\n[ERROR] Required package 'numpy' is not installed.\nPlease install it with: pip install numpy\n")
     exit(1)
 try:
-    import face_recognition
+    with startup_report.timed("import", "gui.gui"):
+        from gui.gui import guiwindow
 except ImportError:
-    print("\n[ERROR] Required package 'face_recognition' is not installed.\nPlease install it with: pip install face_recognition\n")
+    print("\n[ERROR] Required module 'gui.gui' is missing or has import errors.\n")
     exit(1)
 try:
-    from playsound import playsound
+    import pathlib
 except ImportError:
-    print("\n[ERROR] Required package 'playsound' is not installed.\nPlease install it with: pip install playsound\n")
+    print("\n[ERROR] Required package 'pathlib' is not installed.\nPlease install it with: pip install pathlib\n")
     exit(1)
+
+# Heavy packages are only checked for here and imported on first use, or ahead of time by the startup loader
+require('face_recognition')
+require('playsound')
+require('torch')
+face_recognition = LazyModule('face_recognition', startup_report)
+playsound = LazyModule('playsound', startup_report)
+torch = LazyModule('torch', startup_report)
+message = LazyModule('message', startup_report)  # twilio, phonenumbers and the mail clients
+voice = LazyModule('voice', startup_report)  # gTTS
 try:
-    from message import send_call, send_email, send_sms
+    from settings import load_section, update_config
 except ImportError:
-    print("\n[ERROR] Required module 'message' is missing or has import errors.\n")
+    print("\n[ERROR] Required module 'settings' is missing or has import errors.\n")
     exit(1)
 try:
-    from gui.gui import guiwindow
+    from capture import CaptureThread
 except ImportError:
-    print("\n[ERROR] Required module 'gui.gui' is missing or has import errors.\n")
+    print("\n[ERROR] Required module 'capture' is missing or has import errors.\n")
     exit(1)
 try:
-    import torch
+    from pipeline import FrameJob, Pipeline
 except ImportError:
-    print("\n[ERROR] Required package 'torch' is not installed.\nPlease install it with: pip install torch\n")
+    print("\n[ERROR] Required module 'pipeline' is missing or has import errors.\n")
     exit(1)
 try:
-    import pathlib
+    from accessory_detector import ACCESSORY_DEFAULTS, backend_weights, face_roi
 except ImportError:
-    print("\n[ERROR] Required package 'pathlib' is not installed.\nPlease install it with: pip install pathlib\n")
+    print("\n[ERROR] Required module 'accessory_detector' is missing or has import errors.\n")
+    exit(1)
+try:
+    from detection_scheduler import DetectionScheduler, SCHEDULE_DEFAULTS
+except ImportError:
+    print("\n[ERROR] Required module 'detection_scheduler' is missing or has import errors.\n")
+    exit(1)
+try:
+    from frame_stats import FrameStats
+except ImportError:
+    print("\n[ERROR] Required module 'frame_stats' is missing or has import errors.\n")
+    exit(1)
+try:
+    from low_light import LowLightEnhancer, LOW_LIGHT_DEFAULTS
+except ImportError:
+    print("\n[ERROR] Required module 'low_light' is missing or has import errors.\n")
+    exit(1)
+try:
+    from frame_buffers import FramePool, ScratchBuffers
+except ImportError:
+    print("\n[ERROR] Required module 'frame_buffers' is missing or has import errors.\n")
     exit(1)
 try:
-    from voice import speak_event
+    from tamper_detector import TamperDetector, TAMPER_DEFAULTS
 except ImportError:
-    print("\n[ERROR] Required module 'voice' is missing or has import errors.\n")
+    print("\n[ERROR] Required module 'tamper_detector' is missing or has import errors.\n")
+    exit(1)
+try:
+    from tracker import FaceTracker, TRACKING_DEFAULTS
+except ImportError:
+    print("\n[ERROR] Required module 'tracker' is missing or has import errors.\n")
+    exit(1)
+try:
+    import model_cache
+except ImportError:
+    print("\n[ERROR] Required module 'model_cache' is missing or has import errors.\n")
+    exit(1)
+try:
+    from inference_threads import THREAD_DEFAULTS, host_key, thread_candidates, tune_threads, warm_up
+except ImportError:
+    print("\n[ERROR] Required module 'inference_threads' is missing or has import errors.\n")
+    exit(1)
+try:
+    from gallery_watcher import GalleryWatcher
+except ImportError:
+    print("\n[ERROR] Required module 'gallery_watcher' is missing or has import errors.\n")
+    exit(1)
+try:
+    from embedding_store import EmbeddingStore, remove_stale_generations
+except ImportError:
+    print("\n[ERROR] Required module 'embedding_store' is missing or has import errors.\n")
+    exit(1)
+try:
+    from face_gallery import CentroidIndex, FaceGallery, IVFIndex, MATCHING_DEFAULTS
+except ImportError:
+    print("\n[ERROR] Required module 'face_gallery' is missing or has import errors.\n")
     exit(1)
 
 class SecuritySystem:
-    def __init__(self):
+    def __init__(self, deferred_loading=False):
         self.last_alerted = {} 
         self.alert_cooldown = 10  # Cooldown period in seconds  
 
@@ -74,20 +143,43 @@ class SecuritySystem:
         self.is_paused = False
         self.pause_start_time = None
         self.paused_names_time = {}
-        self.last_frame = None  # To freeze video while paused
+        self.last_frame = None  # Frame the GUI shows now, kept out of the pool so it stays frozen while paused
 
         # for night mode
         self.night_mode_active = False  # Tracks if night mode is currently active
+        self.low_light_config = load_section("low_light", LOW_LIGHT_DEFAULTS)
+        self.low_light_enhancer = LowLightEnhancer(
+            interval=self.low_light_config["lut_interval"],
+            brightness_drift=self.low_light_config["brightness_drift"],
+        )
 
         # for start camera
         self.face_cap = None
+        self.capture_thread = None  # Grabs frames into a ring buffer off the GUI thread
         self.camera_started = False
         self.camera_error = None
 
+        # Detection pipeline (capture -> tamper -> accessories -> faces -> render on worker threads)
+        self.pipeline = None
+        self.output_lock = threading.Lock()
+        self.output_frame = None  # Newest rendered frame waiting for the GUI
+        # Reused buffers: the mirrored camera frames travel through the pipeline in frame_pool and go
+        # back to it once the GUI has moved on; the face stage downscales into its own scratch arrays
+        self.frame_pool = FramePool()
+        self.face_buffers = ScratchBuffers()
+        self.status_screens = {}  # text -> blank frame showing it, drawn once
+        self.pipeline_stats_interval = 30  # Seconds between per-stage latency reports
+        self.pipeline_stats_last_log = time.time()
+
         # for tamper detection
         self.tamper_detected = False
         self.tamper_last_check = 0
         self.tamper_alert_sent = False
+        self.tamper_reason = None
+        tamper_config = load_section("tamper_detection", TAMPER_DEFAULTS)
+        self.tamper_detector = None  # None falls back to the 3-second snapshot check
+        if tamper_config.pop("mode") == "rolling":
+            self.tamper_detector = TamperDetector(**tamper_config)
 
         # Voice/state management for start conditions
         self.start_alert_playing = False
@@ -111,12 +203,14 @@ class SecuritySystem:
             if not os.path.exists(directory):
                 os.makedirs(directory)
         
-        self.encodings_path = "encodings/face_encodings.pkl"
-        if os.path.exists(self.encodings_path):
-            with open(self.encodings_path, "rb") as f:
-                self.face_encode, self.face_name = pickle.load(f)
-        else:
-            raise FileNotFoundError("❌ Face encodings not found. Please run `save_encodings.py` first.")
+        self.encodings_path = "encodings/face_encodings.bin"
+        self.legacy_encodings_path = "encodings/face_encodings.pkl"
+        self.index_path = "encodings/face_index.npz"
+        self.centroids_path = "encodings/face_centroids.npz"
+        self.matching_config = load_section("face_matching", MATCHING_DEFAULTS)
+        self.gallery = None
+        self.matcher = None
+        self.gallery_watcher = None
 
         print("🔧 Security Screening System - Full Face Recognition Mode")
         print("📋 Status Messages Feature: ✅ Active")
@@ -124,19 +218,202 @@ class SecuritySystem:
         print("🎯 Identity Matching: ✅ Real confidence scores from face encodings")
         print(f"⚙️ Recognition Threshold: {self.user_conf_threshold:.2f}")
         
-        self.detection_time = {}
+        self.detection_time = {}  # countdown start per face track
+        # The face stage adds and removes timers on its worker thread while pause/resume on the GUI
+        # thread walks them, so both hold this lock whenever they change or iterate the dict
+        self.detection_lock = threading.Lock()
         self.last_alarmed = {}
+        self.face_tracker = FaceTracker(**load_section("face_tracking", TRACKING_DEFAULTS))
         self.current_status = "System ready - Please position yourself in front of the camera"
         self.status_color = '#00ff00'  # Green for ready state
         
-        # Load YOLOv5 model
+        self.accessory_config = load_section("accessory_detection", ACCESSORY_DEFAULTS)
+        self.thread_config = load_section("inference_threads", THREAD_DEFAULTS)
+        self.accessory_scheduler = DetectionScheduler(**load_section("accessory_schedule", SCHEDULE_DEFAULTS))
+        self.face_boxes = ([], 0.0)  # latest face boxes in frame pixels and when they were seen, for the accessory ROI
+        self.ACCESSORY_CLASSES = ["mask", "sunglasses", "cap", "scarf-kerchief"]
+        self.yolo_model = None
+
+        # Gallery, models and messaging load in order, on a background thread with deferred_loading so the
+        # window shows straight away (the camera starts once they are ready), otherwise right here
+        self.startup_config = load_section("startup", STARTUP_DEFAULTS)
+        self.start_requested = False  # Start was pressed while still loading
+        self.startup_lock = threading.Lock()
+        self.loader = BackgroundLoader(
+            [
+                ("face gallery", self.load_gallery),
+                ("face recognition", face_recognition),
+                ("torch", torch),
+                ("accessory model", self.load_accessory_model),
+                ("messaging", message),
+                ("voice", voice),
+            ],
+            startup_report,
+            on_done=self.on_startup_loaded,
+        )
+        if deferred_loading:
+            self.current_status = "⏳ Loading..."
+            self.status_color = '#ffaa00'
+            self.loader.start()
+        else:
+            self.loader.run_steps()
+            self.on_startup_loaded(self.loader)
+
+    def load_gallery(self):
+        self.gallery, self.matcher = self.load_matcher()
+
+        # Pick up watchlist updates from save_encodings.py without restarting the screening loop
+        if self.matching_config["reload_interval"] > 0:
+            self.gallery_watcher = GalleryWatcher(
+                self.encodings_path,
+                load=self.load_new_matcher,
+                on_reload=self.install_matcher,
+                extra_paths=(self.index_path, self.centroids_path),
+                interval=self.matching_config["reload_interval"],
+            )
+            self.gallery_watcher.start()
+
+    def load_accessory_model(self):
+        """Load YOLOv5 (the PyTorch weights, or an ONNX/OpenVINO export of them), tune its threads and warm it up"""
+        self.apply_thread_budget()  # inter-op threads can only be set before torch starts any parallel work
         temp = pathlib.PosixPath
         if os.name == 'nt':
             pathlib.PosixPath = pathlib.WindowsPath
-        self.yolo_model = torch.hub.load('yolov5', 'custom', path='models/yolov5n_best.pt', source='local')
-        self.ACCESSORY_CLASSES = ["mask", "sunglasses", "cap", "scarf-kerchief"]
+        self.accessory_weights = self.accessory_model_path()
+        cache = self.accessory_cache_path()
+        model = self.load_cached_accessory_model(cache)
+        build_cache = model is None and cache is not None
+        if model is None:
+            model = torch.hub.load('yolov5', 'custom', path=self.accessory_weights, source='local')
         pathlib.PosixPath = temp
-        
+
+        # Per-class lookup tables indexed by the model's class id, so detections filter in one vectorized step
+        names = model.names
+        names = [names[i] for i in sorted(names)] if isinstance(names, dict) else list(names)
+        self.accessory_labels = [str(name).lower() for name in names]
+        self.accessory_wanted = np.array([label in self.ACCESSORY_CLASSES for label in self.accessory_labels])
+        self.accessory_is_mask = np.array([label == "mask" for label in self.accessory_labels])
+        model.fixed_shape = self.accessory_config["fixed_shape"]  # only the accessory stage calls the model
+        self.yolo_model = model
+        self.tune_accessory_threads()
+        self.warm_up_accessory_model()
+        if build_cache:
+            # Traced off the loading path, the next start then skips torch.hub altogether. Started only
+            # after tuning and warm-up so the trace does not compete with the timed runs for the cores.
+            self.run_in_background(self.cache_accessory_model, model, cache)
+
+    def accessory_cache_path(self):
+        """Where the fused TorchScript copy of the PyTorch accessory model lives, None if caching does not apply"""
+        if not self.accessory_config["model_cache"] or not self.accessory_weights.endswith(".pt"):
+            return None
+        try:
+            return model_cache.cache_path(self.accessory_weights, torch.__version__)
+        except OSError as e:
+            print(f"[Accessory] Model cache disabled: {e}")
+            return None
+
+    def load_cached_accessory_model(self, cache):
+        if cache is None or not os.path.exists(cache):
+            return None
+        try:
+            model = model_cache.load_cached(cache)
+            print(f"[Accessory] Using cached TorchScript model {cache}")
+            return model
+        except Exception as e:
+            print(f"[Accessory] Ignoring model cache, loading the weights: {e}")
+            return None
+
+    def cache_accessory_model(self, model, cache):
+        try:
+            model_cache.build_cache(model, cache, self.accessory_config["size"])
+            print(f"[Accessory] Cached TorchScript model to {cache}")
+        except Exception as e:
+            print(f"[Accessory] Could not cache the model: {e}")
+
+    def on_startup_loaded(self, loader):
+        """Called once the startup steps are done, on the loader thread when loading was deferred"""
+        if loader.error:
+            print(f"[Startup] {loader.error}")
+            self.current_status = loader.progress()
+            self.status_color = '#ff0000'
+            return
+        if self.startup_config["report"]:
+            print(startup_report.format())
+        self.current_status = "System ready - Please position yourself in front of the camera"
+        self.status_color = '#00ff00'
+        with self.startup_lock:
+            start = self.start_requested
+        if start:
+            self.start_camera()
+
+    def accessory_model_path(self):
+        """Model for the configured backend, or the PyTorch weights when that backend has not been exported"""
+        weights = self.accessory_config["weights"]
+        backend = self.accessory_config["backend"]
+        try:
+            path = backend_weights(weights, backend)
+        except ValueError as e:
+            print(f"[Accessory] {e} - using PyTorch")
+            return weights
+        if backend != "pytorch":
+            if not os.path.exists(path):
+                print(f"[Accessory] {path} not found, run `export_accessory_model.py --backend {backend}` - using PyTorch")
+                return weights
+            print(f"[Accessory] Using {backend} model {path}")
+        return path
+
+    def apply_thread_budget(self):
+        """Thread counts from the "inference_threads" config section, applied before the model loads"""
+        config = self.thread_config
+        if config["opencv_threads"] > 0:
+            cv2.setNumThreads(config["opencv_threads"])
+        if config["torch_interop_threads"] > 0:
+            try:
+                torch.set_num_interop_threads(config["torch_interop_threads"])
+            except RuntimeError as e:
+                print(f"[Threads] Could not set inter-op threads: {e}")
+        if config["torch_threads"] > 0:
+            torch.set_num_threads(config["torch_threads"])
+
+    def tune_accessory_threads(self):
+        """Pick torch's intra-op thread count for the accessory model, measuring it once per host"""
+        config = self.thread_config
+        # Exported backends bring their own runtime thread pools, so only the PyTorch model is tuned
+        if config["torch_threads"] > 0 or not config["auto_tune"] or not self.accessory_weights.endswith(".pt"):
+            return
+        key = host_key(torch.__version__, self.accessory_weights, self.accessory_config["size"])
+        tuned = config["tuned"] if isinstance(config["tuned"], dict) else {}
+        if tuned.get("host") == key:
+            torch.set_num_threads(tuned["torch_threads"])
+            print(f"[Threads] Using tuned intra-op threads: {tuned['torch_threads']}")
+            return
+
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        best, timings = tune_threads(
+            lambda: self.detect_accessories(frame),
+            torch.set_num_threads,
+            thread_candidates(reserved=config["reserved_cores"]),
+            runs=config["tune_runs"],
+        )
+        print("[Threads] " + ", ".join(f"{n}: {ms:.1f} ms" for n, ms in timings.items()) + f" -> using {best}")
+        config["tuned"] = {"host": key, "torch_threads": best}
+        try:
+            update_config({"inference_threads": config})
+        except Exception as e:
+            print(f"[Config] Error saving settings: {e}")
+
+    def warm_up_accessory_model(self):
+        """Run the accessory model on blank frames at the configured sizes before the first real one"""
+        runs = self.thread_config["warmup_runs"]
+        if runs <= 0:
+            return
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        times = warm_up(lambda: self.detect_accessories(frame), runs)
+        if self.accessory_config["roi_enabled"]:
+            crop = frame[:240, 160:480]
+            warm_up(lambda: self.detect_accessories(crop, size=self.accessory_config["roi_size"]), runs)
+        print(f"[Accessory] Model warmed up: first call {times[0]:.0f} ms, last {times[-1]:.0f} ms")
+
     def load_threshold_settings(self):
         """Load threshold setting from config file"""
         config_file = "config/system_config.json"
@@ -152,17 +429,85 @@ class SecuritySystem:
         except Exception as e:
             print(f"[Config] Error loading settings: {e}")
 
+    def load_matcher(self):
+        """
+        Load the encodings store and the matcher to search it with.
+
+        Returns (gallery, matcher): the IVF index for large watchlists when it has been built,
+        otherwise the exact centroid prefilter, otherwise the gallery itself.
+        """
+        if os.path.exists(self.encodings_path):
+            # Memory-mapped, so startup cost and private memory do not grow with the watchlist
+            gallery = FaceGallery.from_store(EmbeddingStore(self.encodings_path))
+        elif os.path.exists(self.legacy_encodings_path):
+            print("[Matcher] Loading legacy pickle encodings - run `save_encodings.py` to convert them")
+            gallery = FaceGallery.from_pickle(self.legacy_encodings_path)
+        else:
+            raise FileNotFoundError("❌ Face encodings not found. Please run `save_encodings.py` first.")
+        matcher = self.load_ann_index(gallery) or self.load_centroid_index(gallery) or gallery
+        return gallery, matcher
+
+    def load_new_matcher(self):
+        """Load a replacement matcher on the watcher thread and check it before it goes live"""
+        gallery, matcher = self.load_matcher()
+        if len(gallery) == 0:
+            raise ValueError("new encodings store is empty")
+        if len(self.gallery) and gallery.dim != self.gallery.dim:
+            raise ValueError(f"encoding size changed from {self.gallery.dim} to {gallery.dim}")
+        # An enrolled encoding must find itself (a copy of it, at least)
+        _, distances = matcher.match(gallery.embeddings[:1], k=1)
+        if float(distances[0, 0]) > 1e-3:
+            raise ValueError("new matcher failed its self-match check")
+        return gallery, matcher
+
+    def install_matcher(self, loaded):
+        """Swap in a matcher from load_new_matcher(); frames already in flight keep the old one"""
+        gallery, matcher = loaded
+        self.matcher = matcher
+        self.gallery = gallery
+        print(f"[Matcher] Watchlist reloaded: {len(gallery)} encodings, generation {gallery.generation}")
+        # The older generations are no longer ours; one a frame in flight still maps is retried next time
+        try:
+            remove_stale_generations(self.encodings_path)
+        except OSError as e:
+            print(f"[Matcher] Could not remove old encodings: {e}")
+
+    def load_ann_index(self, gallery):
+        """Load the approximate nearest-neighbour index built by save_encodings.py, if enabled and valid"""
+        if not self.matching_config["ann_enabled"] or not os.path.exists(self.index_path):
+            return None
+        try:
+            index = IVFIndex.load(
+                self.index_path,
+                gallery,
+                nprobe=self.matching_config["ann_nprobe"],
+                exact_margin=self.matching_config["ann_exact_margin"],
+            )
+            print(f"[Matcher] Using ANN index: {index.nlist} cells, nprobe={index.nprobe}")
+            return index
+        except Exception as e:
+            print(f"[Matcher] Ignoring ANN index, falling back to exact matching: {e}")
+            return None
+
+    def load_centroid_index(self, gallery):
+        """Per-identity centroids written by save_encodings.py, rebuilt in memory if missing or stale"""
+        if not self.matching_config["centroid_prefilter"]:
+            return None
+        candidates = self.matching_config["prefilter_candidates"]
+        if os.path.exists(self.centroids_path):
+            try:
+                return CentroidIndex.load(self.centroids_path, gallery, candidates=candidates)
+            except Exception as e:
+                print(f"[Matcher] Rebuilding identity centroids: {e}")
+        return CentroidIndex.build(gallery, candidates=candidates)
+
     def save_threshold_settings(self):
         """Save threshold setting to config file"""
-        config_file = "config/system_config.json"
         try:
-            os.makedirs(os.path.dirname(config_file), exist_ok=True)
-            config = {
+            update_config({
                 'recognition_threshold': self.user_conf_threshold,
                 'last_updated': time.time()
-            }
-            with open(config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            })
         except Exception as e:
             print(f"[Config] Error saving settings: {e}")
 
@@ -174,7 +519,7 @@ class SecuritySystem:
                 print(f"[Audio] Suppressing voice message during alarm: {text}")
                 return False
         
-        speak_event(event, text, sync)
+        voice.speak_event(event, text, sync)
         return True
 
     # Alarms with alarm_playing flag management
@@ -183,7 +528,7 @@ class SecuritySystem:
             with self.alarm_lock:
                 self.alarm_playing = True
             try:
-                playsound("alarms/threat.wav")
+                playsound.playsound("alarms/threat.wav")
             finally:
                 with self.alarm_lock:
                     self.alarm_playing = False
@@ -195,7 +540,7 @@ class SecuritySystem:
             with self.alarm_lock:
                 self.alarm_playing = True
             try:
-                playsound("alarms/safe.wav")
+                playsound.playsound("alarms/safe.wav")
             finally:
                 with self.alarm_lock:
                     self.alarm_playing = False
@@ -216,240 +561,296 @@ class SecuritySystem:
         with open(log_file, "a") as f:
             f.write(log_entry)
 
-    def is_low_light(self,frame, brightness_threshold=60):
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        return np.mean(gray) < brightness_threshold
+    def is_low_light(self,frame, brightness_threshold=60, stats=None):
+        stats = stats or FrameStats.compute(frame)
+        return stats.gray_mean < brightness_threshold
 
-    def enhance_for_low_light(self,frame):
+    def enhance_for_low_light(self,frame, stats=None, out=None):
+        """Brighten a dark frame, into `out` when given (which may be `frame` itself)"""
+        if self.low_light_config["mode"] == "lut":
+            return self.low_light_enhancer.enhance(frame, stats.gray_mean if stats else None, out=out)
         lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
         l, a, b = cv2.split(lab)
         l = cv2.equalizeHist(l)
         enhanced = cv2.merge((l, a, b))
-        return cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
+        return cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR, dst=out)
 
 
-    def is_frame_suspicious(self,frame, gray_thresh=15, color_var_thresh=30, edge_thresh=25):
+    def is_frame_suspicious(self,frame, gray_thresh=15, color_var_thresh=30, edge_thresh=25, stats=None):
         """
         Detects suspicious frames: black/white/gray, or low-texture plain color frames with slight gradient.
+        Pass the frame's FrameStats when they are already computed.
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray_mean = np.mean(gray)
-        gray_var = np.var(gray)
-
-        # Color channel variances
-        b_var = np.var(frame[:, :, 0])
-        g_var = np.var(frame[:, :, 1])
-        r_var = np.var(frame[:, :, 2])
-        color_var_avg = (b_var + g_var + r_var) / 3
-
-        # Laplacian edge variance
-        laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-
-    # 1. Too dark/bright with low variance
-        if (gray_mean < 10 or gray_mean > 245) and gray_var < gray_thresh:
-            return True
-
-    # 2. Very flat grayscale
-        if gray_var < gray_thresh:
-            return True
-
-    # 3. Plain color frame (even with slight gradient)
-        if color_var_avg < color_var_thresh and laplacian_var < edge_thresh:
-            return True
-
-        return False
+        stats = stats or FrameStats.compute(frame)
+        return stats.is_flat(gray_thresh, color_var_thresh, edge_thresh)
 
     #Accessory detection using object-detection model module
-    def detect_accessories(self,frame, conf_threshold=0.5):
-        results = self.yolo_model(frame)
-        detections = results.pandas().xyxy[0]
-        accessories_found = []
-
-        for _, row in detections.iterrows():
-            label = str(row['name']).lower()
-            conf = float(row['confidence'])
-            if label in self.ACCESSORY_CLASSES :
-                if label == "mask" and conf>=0.4:
-                    accessories_found.append(label)
-                elif conf>= conf_threshold:
-                    accessories_found.append(label)
-
-        return accessories_found
+    def detect_accessories(self,frame, conf_threshold=0.5, size=None):
+        results = self.yolo_model(frame, size=size or self.accessory_config["size"])
+        # Raw NMS output rows (x1, y1, x2, y2, conf, cls), read as NumPy instead of building DataFrames
+        detections = results.xyxy[0]
+        detections = detections.cpu().numpy() if hasattr(detections, "cpu") else np.asarray(detections)
+        if len(detections) == 0:
+            return []
+
+        # Masks are accepted from 0.4, other accessories from conf_threshold, anything else never
+        thresholds = np.where(self.accessory_is_mask, min(0.4, conf_threshold), conf_threshold)
+        thresholds = np.where(self.accessory_wanted, thresholds, np.inf)
+        classes = detections[:, 5].astype(int)
+        keep = detections[:, 4] >= thresholds[classes]
+        return [self.accessory_labels[c] for c in classes[keep]]
+
+    def detect_accessories_near_faces(self, frame):
+        """Run accessory detection on a padded crop around the latest faces, or on the full frame without them"""
+        config = self.accessory_config
+        boxes, seen_at = self.face_boxes
+        if config["roi_enabled"] and time.time() - seen_at <= config["roi_max_age"]:
+            roi = face_roi(frame.shape, boxes, config["roi_padding"], config["roi_top_padding"], config["roi_bottom_padding"])
+            if roi is not None:
+                top, right, bottom, left = roi
+                return self.detect_accessories(frame[top:bottom, left:right], size=config["roi_size"])
+        return self.detect_accessories(frame)
+
+    def status_screen(self, text):
+        """Blank frame with `text` on it. The same text returns the same array, so the GUI skips redrawing it"""
+        blank = self.status_screens.get(text)
+        if blank is None:
+            blank = np.zeros((480, 640, 3), dtype=np.uint8)
+            cv2.putText(blank, text, (90, 250), cv2.FONT_HERSHEY_SIMPLEX, 1, (170, 100, 100), 2)
+            self.status_screens[text] = blank
+        return blank
 
     def get_frame(self):
-        # Check if camera is started and opened
-        if not self.camera_started or self.face_cap is None or not self.face_cap.isOpened():
-            blank = np.zeros((480, 640, 3), dtype=np.uint8)
+        if not self.loader.ready:
+            blank = self.status_screen("Loading..." if not self.loader.error else "Startup failed")
+            self.current_status = self.loader.progress()
+            if self.start_requested and not self.loader.error:
+                self.current_status += " Camera starts when ready."
+            self.status_color = "#ffaa00" if not self.loader.error else "#ff0000"
+            return blank
+
+        # Check if camera is started
+        if not self.camera_started or self.face_cap is None:
             msg = "Camera not started" if not self.camera_error else f"Camera error: {self.camera_error}"
-            cv2.putText(blank, msg, (90, 250), cv2.FONT_HERSHEY_SIMPLEX, 1, (170, 100, 100), 2)
+            blank = self.status_screen(msg)
             self.current_status = msg
             self.status_color = "#888888" if not self.camera_error else "#ff0000"
             return blank
 
-        # Read frame from camera
-        ret, frame = self.face_cap.read()
-        if not ret:
-            self.current_status = " Camera error - Please check camera connection"
+        if self.capture_thread is None or self.capture_thread.failed:
+            # The capture thread keeps retrying and clears the error once frames arrive again
+            self.current_status = " Camera error - Please check camera connection. Reconnecting..."
             self.status_color = '#ff0000'  # Red for error
-            print("❌ Camera read failed.")
             return None
 
-        # Detect tamper every 3 seconds
-        suspicious = self.is_frame_suspicious(frame)
-
-        if not suspicious and self.is_low_light(frame):
-            self.night_mode_active = True
-            frame = self.enhance_for_low_light(frame)
-        else:
-            self.night_mode_active = False
-
-        if time.time() - self.tamper_last_check > 3:
-            if self.is_frame_suspicious(frame):
-                if not self.tamper_detected:
-                    self.tamper_detected = True
-                    print("[Tamper] Suspicious frame started")
-
-                if not self.tamper_alert_sent:
-                    self.current_status = "⚠️ Possible tampering detected - Low visual content. Please review the camera device"
-                    self.status_color = '#ff0000'
-                    print("[Tamper Alert] Visual anomaly Detected. Please review the camera device")
-                    self.tamper_alert_sent = True
-
-                    # Update status panel
-                    if hasattr(self, 'video_app') and hasattr(self.video_app, 'update_status'):
-                        self.video_app.update_status(self.current_status, self.status_color)
-
-            else:
-                if self.tamper_detected:
-                    print("[Tamper] Tampering ended")
-                    self.current_status = "✅ Camera recovered from tampering"
-                    self.status_color = "#00ff00"
+        # ------------- Pause Handling -----------------
+        if self.is_paused:
+            self.current_status = "⏸️ Detection Paused. Click Resume to continue."
+            self.status_color = '#888888'
+            # Return last frame to freeze the GUI. It is only recycled once a newer frame replaces
+            # it after resuming, so pausing needs no copy of its own.
+            return self.last_frame
+
+        # Newest frame that made it through the pipeline (None keeps the previous image on screen)
+        with self.output_lock:
+            frame, self.output_frame = self.output_frame, None
+        if frame is not None:
+            # The GUI finished drawing the previous frame before asking for this one
+            self.frame_pool.release(self.last_frame)
+            self.last_frame = frame
+        return frame
 
-                    # Update GUI immediately
-                    if hasattr(self, 'video_app') and hasattr(self.video_app, 'update_status'):
-                        self.video_app.update_status(self.current_status, self.status_color)
-                self.tamper_detected = False
-                self.tamper_alert_sent = False
+    # ---------------- Detection pipeline stages ----------------
+    # capture -> tamper -> accessories -> faces -> render, each on its own worker thread
 
+    def _capture_source(self):
+        if self.is_paused:
+            return None
+        entry = self.capture_thread.latest()
+        if entry is None:
+            return None
+        seq, captured_at, frame = entry
+        return FrameJob(seq, captured_at, frame)
+
+    def _tamper_stage(self, job):
+        frame = job.frame
+        job.stats = FrameStats.compute(frame)  # one pass, shared by the tamper and low-light checks
+        suspicious = self.is_frame_suspicious(frame, stats=job.stats)
+
+        job.night_mode = not suspicious and self.is_low_light(frame, stats=job.stats)
+        if not job.night_mode:
+            self.low_light_enhancer.reset()  # the next dark spell starts from a fresh tone curve
+        self.night_mode_active = job.night_mode
+
+        if self.tamper_detector is not None:
+            # Every frame against the learned view, with hysteresis inside the detector
+            self.tamper_detector.update(frame, job.stats, covered=suspicious)
+            self.report_tamper(self.tamper_detector.active, self.tamper_detector.describe())
+        elif time.time() - self.tamper_last_check > 3:
+            # Snapshot mode: one check every 3 seconds (equalizing a dark frame only adds contrast,
+            # so the camera frame decides)
+            self.report_tamper(suspicious)
             self.tamper_last_check = time.time()
 
         if self.tamper_detected:
-            cv2.putText(frame, "⚠️ CAMERA TAMPERING DETECTED", (40, 460), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
-            return frame  # Just show the suspicious frame but skip detection
-
-        frame = cv2.flip(frame, 1)
-        curr_time = time.time()
+            # Just show the suspicious frame but skip detection
+            if job.night_mode:
+                job.frame = self.enhance_for_low_light(frame, stats=job.stats, out=self.frame_pool.acquire(frame.shape))
+            job.tampered = True
+            job.halted = True
+            return job
+
+        job.frame = cv2.flip(frame, 1, dst=self.frame_pool.acquire(frame.shape))
+        if job.night_mode:
+            # The mirrored copy belongs to this job alone, so it is enhanced in place
+            self.enhance_for_low_light(job.frame, stats=job.stats, out=job.frame)
+        return job
+
+    def report_tamper(self, tampered, reason="Low visual content"):
+        """Raise or clear the tamper alert, announcing each change once"""
+        if tampered:
+            if not self.tamper_detected:
+                self.tamper_detected = True
+                print("[Tamper] Suspicious frame started")
+
+            if not self.tamper_alert_sent or reason != self.tamper_reason:
+                self.current_status = f"⚠️ Possible tampering detected - {reason}. Please review the camera device"
+                self.status_color = '#ff0000'
+                print(f"[Tamper Alert] Visual anomaly Detected ({reason}). Please review the camera device")
+                self.tamper_alert_sent = True
+                self.tamper_reason = reason
 
-        fps = 1 / (curr_time - self.prev_time) if (curr_time - self.prev_time) > 0 else 0
-
-        self.prev_time = curr_time
-
-        cv2.putText(frame, f"FPS: {int(fps)}", (520, 250), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 255), 3)
-
-        # ------------- Pause Handling -----------------
-        if self.is_paused:
-            self.current_status = "⏸️ Detection Paused. Click Resume to continue."
-            self.status_color = '#888888'
-            # Return last frame to freeze the GUI
-            if self.last_frame is not None:
-                return self.last_frame
-            else:
-                self.last_frame = frame.copy()
-                return self.last_frame
         else:
-            self.last_frame = frame.copy()
+            if self.tamper_detected:
+                print("[Tamper] Tampering ended")
+                self.current_status = "✅ Camera recovered from tampering"
+                self.status_color = "#00ff00"
+            self.tamper_detected = False
+            self.tamper_alert_sent = False
+            self.tamper_reason = None
+
+    def _accessory_stage(self, job):
+        if job.halted:
+            return job
 
         # --- START CAMERA START MESSAGE FEATURE ---
         if self.start_alert_playing:
-            message = "Security Screening System starting. Peaople are waiting in the line. Please cooperate with the scanning procedure."
-            self.scroll_x -= 8
-            if self.scroll_x < -len(message) * 15:
-                self.scroll_x = 640
-            cv2.putText(frame, message, (self.scroll_x, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            return frame  # show live video but skip detection
+            job.show_banner = True  # show live video but skip detection
+            job.halted = True
+            return job
 
         # -------------- Accessory Detection Before Face Recognition --------------
-        accessories = self.detect_accessories(frame)
+        # YOLO only runs when the scheduler says so, otherwise its last result is carried forward
+        accessories = self.accessory_scheduler.run(job.frame, self.detect_accessories_near_faces)
         if accessories:
-            # Reset the countdown timer when an accessory is detected
-            self.detection_time.clear()
-            
+            job.accessories = accessories
+            job.halted = True  # Skip face recognition while showing live frames
             self.current_status = f"⚠️ Please remove: {', '.join(accessories).title()}"
             self.safe_speak("remove_accessory", f"Please remove: {', '.join(accessories)}")
             self.status_color = '#ff0000'
-            return frame  # Skip face recognition while showing live frames
+        return job
 
-        small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
-        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+    def _face_stage(self, job):
+        if job.accessories:
+            # Reset the countdown timer when an accessory is detected
+            with self.detection_lock:
+                self.detection_time.clear()
+        if job.halted or self.is_paused:
+            # Frames still in flight when Pause is pressed must not start or finish countdowns
+            return job
+
+        frame = job.frame
+        curr_time = time.time()
 
-        face_locations = face_recognition.face_locations(rgb_small_frame)
-        face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
-        curr_names = []
+        # Downscale and convert into this stage's scratch arrays. The tracker keeps the previous grey
+        # frame for optical flow, so grey alternates between two buffers.
+        buffers = self.face_buffers
+        small_size = (round(frame.shape[0] * 0.25), round(frame.shape[1] * 0.25))
+        small_frame = cv2.resize(frame, (0, 0), fx=0.25, fy=0.25, dst=buffers.get("small", (*small_size, 3)))
+        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=buffers.get("rgb", (*small_size, 3)))
+        gray_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY, dst=buffers.get("gray", small_size, slots=2))
+
+        # Faces are followed across frames; only new or changed ones go through the encoder
+        tracker = self.face_tracker
+        face_locations = face_recognition.face_locations(rgb_small_frame) if tracker.should_detect() else None
+        tracks = tracker.update(gray_small_frame, face_locations)
+        if tracks:
+            self.face_boxes = ([tuple(coord * 4 for coord in track.location) for track in tracks], curr_time)
+        stale = [track for track in tracks if tracker.needs_encoding(track, curr_time)]
+
+        if stale:
+            face_encodings = face_recognition.face_encodings(rgb_small_frame, [track.location for track in stale])
+            # Match every face in the frame against the gallery in one batched call. The matcher is
+            # read once so a watchlist reload between frames never splits one frame across two galleries.
+            matcher = self.matcher
+            match_names, match_distances = matcher.match(face_encodings, k=1, threshold=self.user_conf_threshold)
+            for i, track in enumerate(stale):
+                best_distance = float(match_distances[i, 0])
+                # Use user-configured threshold instead of hardcoded 0.4
+                name = match_names[i][0] if best_distance < self.user_conf_threshold else "No match"
+                if tracker.record_identity(track, name, best_distance, curr_time):
+                    # A different identity decision restarts this face's countdown
+                    with self.detection_lock:
+                        self.detection_time.pop(track.id, None)
 
         # Update status based on face detection
-        if len(face_locations) == 0:
+        if len(tracks) == 0:
             self.current_status = "👁️ Scanning for faces... Please position yourself in front of the camera"
             self.status_color = '#ffff00'  # Yellow for scanning
-        elif len(face_locations) > 1:
+        elif len(tracks) > 1:
             self.current_status = "⚠️ Multiple faces detected - Please ensure only one person is in frame"
             self.status_color = '#ff8800'  # Orange for warning
 
-        for face_encoding, face_location in zip(face_encodings, face_locations):
-            face_distances = face_recognition.face_distance(self.face_encode, face_encoding)
-            best_match_index = np.argmin(face_distances)
-            name = "No match"
+        for track in tracks:
+            name = track.name
+            confidence = track.confidence
 
-            # Use user-configured threshold instead of hardcoded 0.4
-            if face_distances[best_match_index] < self.user_conf_threshold:
-                name = self.face_name[best_match_index]
-                confidence = (1 - face_distances[best_match_index]) * 100
-                confidence_text = f"{confidence:.2f}%"
+            if name != "No match":
                 # Update status for recognized face
                 self.current_status = f"✅ Match found: {name} (Confidence: {confidence:.1f}%)"
                 self.status_color = '#00ff00'  # Green for match
             else:
-                confidence_text = f"{(1 - face_distances[best_match_index]) * 100:.2f}%"
                 # Update status for unrecognized face
                 self.current_status = "❌ No match detected. You are safe to go."
                 self.status_color = '#ff0000'  # Red for no match
 
-            curr_names.append(name)
-
-            top, right, bottom, left = [coord * 4 for coord in face_location]
-            color = (0, 255, 0) if name != "No match" else (0, 0, 255)
-
-            cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
-            cv2.putText(frame, name, (left, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-            cv2.putText(frame, confidence_text, (right, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-
-            # added: a countdown timer for each detected face
-            if name in self.detection_time:
-                scan_time = curr_time - self.detection_time[name]
+            # added: a countdown timer for each tracked face
+            remaining_time = None
+            if track.id in self.detection_time:
+                scan_time = curr_time - self.detection_time[track.id]
                 remaining_time = max(0, 10 - int(scan_time))
-                cv2.putText(frame, f"{remaining_time:.1f}s", (left, top + 20), cv2.FONT_HERSHEY_COMPLEX, 0.5, color, 2)
 
                 # Update status during countdown
                 if remaining_time > 0:
                     self.current_status = f"⏱️ Please stand still for {remaining_time:.0f} seconds - Processing..."
                     self.status_color = '#ffaa00'  # Orange for processing
 
+            job.faces.append({
+                "location": [coord * 4 for coord in track.location],
+                "name": name,
+                "confidence_text": f"{confidence:.2f}%",
+                "remaining_time": remaining_time,
+            })
+
         # starting timer
-        detected_now = set(curr_names)
-        for name in detected_now:
-            if name not in self.detection_time:
-                self.detection_time[name] = curr_time
-                self.last_alarmed[name] = 0
-                    
-                last_time = self.last_alerted.get(name, 0)
+        for track in tracks:
+            if track.id not in self.detection_time:
+                with self.detection_lock:
+                    self.detection_time[track.id] = curr_time
+                self.last_alarmed[track.id] = 0
+
+                last_time = self.last_alerted.get(track.name, 0)
                 if (curr_time - last_time) >= self.alert_cooldown:
                         self.safe_speak("face_detected", "Please stand still for 10 seconds.")
-                        self.last_alerted[name] = curr_time
+                        self.last_alerted[track.name] = curr_time
 
 
-        for name in detected_now:
-            scan_time = curr_time - self.detection_time[name]
-            if scan_time >= 10 and (curr_time - self.last_alarmed.get(name, 0)) >= 30:
+        for track in tracks:
+            name = track.name
+            scan_time = curr_time - self.detection_time[track.id]
+            if scan_time >= 10 and (curr_time - self.last_alarmed.get(track.id, 0)) >= 30:
                 if name != "No match":
+                    confidence = track.confidence
                     self.current_status = f"🚨 THREAT DETECTED: {name} - Security alert triggered!"
                     self.status_color = '#ff0000'  # Red for threat
                     self.safe_speak("scan_complete_threat", "scan complete", sync=True)
@@ -457,23 +858,26 @@ class SecuritySystem:
                     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                     filename = f"{name}_{timestamp}.jpg"
                     filepath = os.path.join(self.IMAGE_LOG_DIR, filename)
-                    cv2.imwrite(filepath, frame)
+                    # Evidence image carries the face boxes, the live overlay is drawn later in the render stage
+                    snapshot = frame.copy()
+                    self.draw_faces(snapshot, job.faces)
+                    cv2.imwrite(filepath, snapshot)
 
                     if confidence > 90:
-                        send_call(name, confidence)
-                        send_sms(name, confidence)
+                        message.send_call(name, confidence)
+                        message.send_sms(name, confidence)
                         self.current_status = f"🚨 Very HIGH THREAT DETECTED: {name} - Security alert triggered! Call and SMS sent."
                         self.status_color = '#8B0000'  # Crimson for very high alert
                         self.log_event("Very High Threat", name, confidence, filename)
                     elif confidence > 80:
-                        send_email(name, frame, confidence)
-                        send_sms(name, confidence)
+                        message.send_email(name, snapshot, confidence)
+                        message.send_sms(name, confidence)
                         self.current_status = f"🚨 HIGH THREAT DETECTED: {name} - Security alert triggered! Email and SMS sent."
                         self.status_color = '#ff0000'  # Red for high threat
                         self.log_event("High Threat", name, confidence, filename)
                     elif confidence > 70:
-                        send_email(name, frame, confidence)
-                        
+                        message.send_email(name, snapshot, confidence)
+
                         self.current_status = f"🚨 MEDIUM THREAT DETECTED: {name} - Security alert triggered! Email sent."
                         self.status_color = '#ff8800'  # Orange for medium threat
                         self.log_event("Medium Threat", name, confidence, filename)
@@ -488,16 +892,81 @@ class SecuritySystem:
                     self.safe_speak("scan_complete_safe", "scan completed you are free to go.", sync=True)
                     self.safe_alarm()
 
-                self.last_alarmed[name] = curr_time
+                self.last_alarmed[track.id] = curr_time
+
+        # Timers survive a face missing for a few frames, and end with its track
+        active = tracker.active_ids()
+        with self.detection_lock:
+            for track_id in list(self.detection_time.keys()):
+                if track_id not in active:
+                    del self.detection_time[track_id]
+        for track_id in list(self.last_alarmed.keys()):
+            if track_id not in active:
+                del self.last_alarmed[track_id]
 
-        for name in list(self.detection_time.keys()):
-            if name not in detected_now:
-                del self.detection_time[name]
+        return job
 
-        if self.night_mode_active:
+    def draw_faces(self, frame, faces):
+        for face in faces:
+            top, right, bottom, left = face["location"]
+            name = face["name"]
+            color = (0, 255, 0) if name != "No match" else (0, 0, 255)
+
+            cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
+            cv2.putText(frame, name, (left, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            cv2.putText(frame, face["confidence_text"], (right, top - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            if face["remaining_time"] is not None:
+                cv2.putText(frame, f"{face['remaining_time']:.1f}s", (left, top + 20), cv2.FONT_HERSHEY_COMPLEX, 0.5, color, 2)
+
+    def _render_stage(self, job):
+        frame = job.frame
+
+        if job.tampered:
+            cv2.putText(frame, "⚠️ CAMERA TAMPERING DETECTED", (40, 460), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 3)
+            return job
+
+        curr_time = time.time()
+        fps = 1 / (curr_time - self.prev_time) if (curr_time - self.prev_time) > 0 else 0
+        self.prev_time = curr_time
+        cv2.putText(frame, f"FPS: {int(fps)}", (520, 250), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 255), 3)
+
+        if job.show_banner:
+            message = "Security Screening System starting. Peaople are waiting in the line. Please cooperate with the scanning procedure."
+            self.scroll_x -= 8
+            if self.scroll_x < -len(message) * 15:
+                self.scroll_x = 640
+            cv2.putText(frame, message, (self.scroll_x, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+            return job
+
+        self.draw_faces(frame, job.faces)
+
+        if job.night_mode:
             cv2.putText(frame, "🌙 Night Mode", (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (180, 180, 255), 1)
 
-        return frame
+        return job
+
+    def _pipeline_sink(self, job):
+        with self.output_lock:
+            replaced, self.output_frame = self.output_frame, job.frame
+        if replaced is not None and replaced is not job.frame:
+            self.frame_pool.release(replaced)  # never shown, the GUI fell behind the pipeline
+        self.capture_thread.mark_processed()
+
+        if time.time() - self.pipeline_stats_last_log >= self.pipeline_stats_interval:
+            print(f"[Pipeline] {self.pipeline.format_stats()} | frames: {self.get_capture_stats()}"
+                  f" | accessory detection: {self.accessory_scheduler.stats()}"
+                  f" | frame buffers: {self.frame_pool.stats()}")
+            self.pipeline_stats_last_log = time.time()
+
+    def _pipeline_drop(self, job):
+        """A newer frame overtook this job while it waited for a busy stage"""
+        self.frame_pool.release(job.frame)
+
+    def get_pipeline_stats(self):
+        """Return per-stage latency and queue depth of the detection pipeline"""
+        if self.pipeline is None:
+            return {}
+        return self.pipeline.stats()
 
 
     def start_camera(self):
@@ -509,10 +978,30 @@ class SecuritySystem:
             self.current_status = "Camera already started"
             self.status_color = "#28ce5a"
             return
+        with self.startup_lock:
+            if not self.loader.ready:
+                # on_startup_loaded() starts the camera once the models are in
+                self.start_requested = not self.loader.error
+                self.current_status = self.loader.progress()
+                self.status_color = "#ffaa00" if not self.loader.error else "#ff0000"
+                return
         try:
-            self.face_cap = cv2.VideoCapture(0)
-            if not self.face_cap.isOpened():
-                raise RuntimeError("Could not access the webcam.")
+            self.face_cap = self.open_camera()
+            # A camera that stops delivering frames is reopened by the capture thread
+            self.capture_thread = CaptureThread(self.face_cap, reopen=self.reopen_camera)
+            self.capture_thread.start()
+            self.pipeline = Pipeline(
+                source=self._capture_source,
+                stages=[
+                    ("tamper", self._tamper_stage),
+                    ("accessories", self._accessory_stage),
+                    ("faces", self._face_stage),
+                    ("render", self._render_stage),
+                ],
+                sink=self._pipeline_sink,
+                on_drop=self._pipeline_drop,
+            )
+            self.pipeline.start()
 
             self.current_status = "Camera started"
             self.camera_started = True
@@ -537,9 +1026,44 @@ class SecuritySystem:
             self.current_status = f"Camera error: {e}"
             self.camera_error = str(e)
             self.status_color = "#ff0000"
+            if self.pipeline is not None:
+                self.pipeline.stop()
+            if self.capture_thread is not None:
+                self.capture_thread.stop()
             self.face_cap = None
+            self.capture_thread = None
+            self.pipeline = None
             self.camera_started = False
 
+    def open_camera(self):
+        cap = cv2.VideoCapture(0)
+        if not cap.isOpened():
+            raise RuntimeError("Could not access the webcam.")
+        # Keep the driver queue short, the capture thread drains it continuously anyway
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
+    def reopen_camera(self):
+        """Called on the capture thread after repeated read failures (USB glitch, driver restart)"""
+        self.face_cap = self.open_camera()
+        return self.face_cap
+
+    def get_capture_stats(self):
+        """Return captured/dropped/processed frame counters of the capture thread"""
+        if self.capture_thread is None:
+            return {"captured": 0, "dropped": 0, "processed": 0}
+        return self.capture_thread.stats()
+
+    def shutdown(self):
+        """Stop the background threads and release the camera once the GUI has closed"""
+        if self.gallery_watcher is not None:
+            self.gallery_watcher.stop()
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        if self.capture_thread is not None:
+            self.capture_thread.stop()
+        if self.face_cap is not None:
+            self.face_cap.release()
 
     def get_status(self):
         """Return current status message and color for GUI"""
@@ -553,6 +1077,7 @@ class SecuritySystem:
             status_callback=self.get_status,
             start_camera_callback=self.start_camera 
         )
+        startup_report.mark("window shown")
 
     # Set pause state references for bidirectional access
         self.video_app.set_pause_vars(
@@ -562,11 +1087,14 @@ class SecuritySystem:
             lambda v: setattr(self, 'pause_start_time', v),
             lambda: self.paused_names_time,
             lambda v: setattr(self, 'paused_names_time', v),
-            lambda: self.detection_time
+            lambda: self.detection_time,
+            self.detection_lock
         )
 
         self.video_app.run()
+        self.shutdown()
 
 if __name__== '__main__':
-    Security_Screening_System=SecuritySystem()
+    startup = load_section("startup", STARTUP_DEFAULTS)
+    Security_Screening_System=SecuritySystem(deferred_loading=startup["deferred_loading"])
     Security_Screening_System.run()
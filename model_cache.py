@@ -0,0 +1,87 @@
+import copy
+import glob
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+YOLOV5_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "yolov5")
+CACHE_DIR = "models/cache"
+
+
+def _yolov5_path():
+    if YOLOV5_DIR not in sys.path:
+        sys.path.insert(0, YOLOV5_DIR)
+
+
+def weights_digest(path, chunk_size=1 << 20):
+    """SHA-256 of the weights file, so retrained weights under the same name never reuse a stale cache"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(weights, torch_version, cache_dir=CACHE_DIR):
+    """Cached TorchScript model for `weights` under this torch version (TorchScript is not portable across them)"""
+    stem = os.path.splitext(os.path.basename(weights))[0]
+    version = str(torch_version).replace("+", "_")
+    return os.path.join(cache_dir, f"{stem}-{weights_digest(weights)[:16]}-torch{version}.torchscript")
+
+
+def build_cache(model, path, imgsz=640):
+    """
+    Trace the fused, eval-mode network inside a torch.hub AutoShape model and save it as TorchScript at `path`.
+
+    The network is copied first, so the live model keeps serving frames while this runs. Detect is traced
+    with dynamic grids, so the cached model accepts any input shape like the exported ONNX/OpenVINO models.
+    Older cache files for the same weights are removed. Returns `path`.
+    """
+    import torch
+
+    _yolov5_path()
+    from export import export_torchscript
+    from models.yolo import Detect
+
+    network = model.model.model  # AutoShape -> DetectMultiBackend -> DetectionModel
+    if not isinstance(network, torch.nn.Module):
+        raise TypeError(f"expected a PyTorch model, got {type(network).__name__}")
+    network = copy.deepcopy(network).float().eval()
+    for m in network.modules():
+        if isinstance(m, Detect):
+            m.inplace = False
+            m.dynamic = True
+            m.export = True
+    im = torch.zeros(1, 3, imgsz, imgsz)
+    with torch.no_grad():
+        network(im)  # dry run, builds the Detect grids
+
+    cache_dir = os.path.dirname(path) or "."
+    os.makedirs(cache_dir, exist_ok=True)
+    stem = os.path.basename(path).rsplit("-", 2)[0]  # {stem}-{digest}-torch{version}.torchscript
+    tmp_dir = tempfile.mkdtemp(dir=cache_dir)
+    try:
+        with torch.no_grad():
+            f, _ = export_torchscript(network, im, Path(tmp_dir) / stem, optimize=False)
+        if f is None:
+            raise RuntimeError("TorchScript export failed")
+        for old in glob.glob(os.path.join(cache_dir, f"{stem}-*.torchscript")):
+            if old != path:
+                os.remove(old)
+        os.replace(f, path)  # atomic, a crash mid-write never leaves a half-written cache behind
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return path
+
+
+def load_cached(path):
+    """Load a cache written by build_cache() as an AutoShape model, without going through torch.hub"""
+    import torch
+
+    _yolov5_path()
+    from models.common import AutoShape, DetectMultiBackend
+
+    return AutoShape(DetectMultiBackend(path, device=torch.device("cpu")), verbose=False)
@@ -0,0 +1,206 @@
+import threading
+import time
+
+
+class FrameJob:
+    """One camera frame travelling through the screening pipeline, plus what each stage found."""
+
+    def __init__(self, seq, captured_at, frame):
+        self.seq = seq
+        self.captured_at = captured_at
+        self.frame = frame
+        self.halted = False        # Set by a stage to skip the remaining detection stages
+        self.tampered = False
+        self.stats = None          # FrameStats of the camera frame, computed once by the tamper stage
+        self.night_mode = False
+        self.show_banner = False   # Camera start message is scrolling, detection skipped
+        self.accessories = []
+        self.faces = []            # list of dicts describing each recognised face (see SecuritySystem._face_stage)
+
+
+class StageStats:
+    """Latency bookkeeping for a single pipeline stage."""
+
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self.count = 0
+        self.errors = 0
+        self.dropped = 0           # jobs replaced by a newer one while waiting for this stage
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+
+    def record(self, elapsed_ms):
+        self.count += 1
+        self.last_ms = elapsed_ms
+        if self.count == 1:
+            self.avg_ms = elapsed_ms
+        else:
+            self.avg_ms += self.smoothing * (elapsed_ms - self.avg_ms)
+
+
+class LatestSlot:
+    """
+    One-item hand-off between two pipeline threads where the newest item wins.
+
+    put() never blocks: an item still waiting is replaced and returned to the caller, so a
+    slow consumer always picks up the most recent item instead of working through a backlog.
+    """
+
+    _EMPTY = object()
+
+    def __init__(self):
+        self._item = self._EMPTY
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        """Store `item`, returning the item it replaced or None."""
+        with self._cond:
+            replaced = None if self._item is self._EMPTY else self._item
+            self._item = item
+            self._cond.notify()
+        return replaced
+
+    def get(self, timeout=None):
+        """Take the waiting item, or None if nothing arrived within `timeout` seconds."""
+        with self._cond:
+            if self._item is self._EMPTY:
+                self._cond.wait(timeout)
+                if self._item is self._EMPTY:
+                    return None
+            item, self._item = self._item, self._EMPTY
+        return item
+
+    def empty(self):
+        return self._item is self._EMPTY
+
+    def qsize(self):
+        return 0 if self.empty() else 1
+
+
+class Pipeline:
+    """
+    Runs a source and a chain of stages on separate worker threads connected by newest-wins slots.
+
+    `source()` is polled for new items (return None when nothing is available), but only once the
+    first stage has taken the previous one, so the source always hands over its newest frame. Each
+    stage is a (name, func) pair; `func(item)` returns the item for the next stage, or None to drop
+    it. Whatever comes out of the last stage is handed to `sink(item)`. Because every stage has its
+    own thread, stage k can work on frame N while stage k+1 is still busy with frame N-1. A job
+    waiting in front of a busy stage is replaced by the next one instead of queueing behind it, so
+    a slow stage never works on stale frames; replaced jobs are counted as dropped for that stage
+    and passed to `on_drop(item)`.
+    """
+
+    def __init__(self, source, stages, sink, source_name="capture", idle_sleep=0.005, on_drop=None):
+        self.source = source
+        self.sink = sink
+        self.source_name = source_name
+        self.idle_sleep = idle_sleep
+        self.on_drop = on_drop
+        self.stage_names = [name for name, _ in stages]
+        self._funcs = [func for _, func in stages]
+        self.slots = [LatestSlot() for _ in stages]
+        self.stats_by_stage = {name: StageStats() for name in [source_name] + self.stage_names}
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop_event.clear()
+        self._threads.append(threading.Thread(target=self._source_loop, daemon=True, name=f"Pipeline-{self.source_name}"))
+        for i, name in enumerate(self.stage_names):
+            self._threads.append(threading.Thread(target=self._stage_loop, args=(i,), daemon=True, name=f"Pipeline-{name}"))
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout=1.0):
+        self._stop_event.set()
+        for t in self._threads:
+            if t is not threading.current_thread():
+                t.join(timeout)
+        self._threads = []
+
+    @property
+    def running(self):
+        return bool(self._threads) and not self._stop_event.is_set()
+
+    def _hand_off(self, index, item):
+        """Give `item` to stage `index`, dropping a job that was still waiting for it."""
+        replaced = self.slots[index].put(item)
+        if replaced is not None:
+            self.stats_by_stage[self.stage_names[index]].dropped += 1
+            if self.on_drop is not None:
+                self.on_drop(replaced)
+
+    def _source_loop(self):
+        stats = self.stats_by_stage[self.source_name]
+        first = self.slots[0]
+        while not self._stop_event.is_set():
+            if not first.empty():
+                # The first stage is still busy; the source keeps the newest frame until it is free
+                time.sleep(self.idle_sleep)
+                continue
+            start = time.perf_counter()
+            try:
+                item = self.source()
+            except Exception as e:
+                stats.errors += 1
+                print(f"[Pipeline] Error in {self.source_name}: {e}")
+                item = None
+            if item is None:
+                time.sleep(self.idle_sleep)
+                continue
+            stats.record((time.perf_counter() - start) * 1000)
+            self._hand_off(0, item)
+
+    def _stage_loop(self, index):
+        name = self.stage_names[index]
+        func = self._funcs[index]
+        stats = self.stats_by_stage[name]
+        slot = self.slots[index]
+        last = index + 1 == len(self.slots)
+        while not self._stop_event.is_set():
+            item = slot.get(timeout=0.1)
+            if item is None:
+                continue
+            start = time.perf_counter()
+            try:
+                item = func(item)
+            except Exception as e:
+                stats.errors += 1
+                print(f"[Pipeline] Error in stage '{name}': {e}")
+                continue
+            stats.record((time.perf_counter() - start) * 1000)
+            if item is None:
+                continue
+            if last:
+                self.sink(item)
+            else:
+                self._hand_off(index + 1, item)
+
+    def stats(self):
+        """Per-stage latency (ms), jobs waiting for that stage (0 or 1) and jobs dropped in front of it."""
+        result = {}
+        for name, stats in self.stats_by_stage.items():
+            result[name] = {
+                "count": stats.count,
+                "errors": stats.errors,
+                "last_ms": round(stats.last_ms, 2),
+                "avg_ms": round(stats.avg_ms, 2),
+                "dropped": stats.dropped,
+                "queue_depth": 0,
+            }
+        for name, slot in zip(self.stage_names, self.slots):
+            result[name]["queue_depth"] = slot.qsize()
+        return result
+
+    def bottleneck(self):
+        """Name of the stage with the highest average latency."""
+        return max(self.stats_by_stage, key=lambda name: self.stats_by_stage[name].avg_ms)
+
+    def format_stats(self):
+        parts = []
+        for name, s in self.stats().items():
+            parts.append(f"{name} {s['avg_ms']:.1f}ms q={s['queue_depth']} dropped={s['dropped']}")
+        return " | ".join(parts) + f" | bottleneck: {self.bottleneck()}"
@@ -10,30 +10,226 @@ def _import_or_exit(module, pip_name=None):
         exit(1)
 
 os = _import_or_exit('os')
-pickle = _import_or_exit('pickle')
+json = _import_or_exit('json')
+hashlib = _import_or_exit('hashlib')
+argparse = _import_or_exit('argparse')
+multiprocessing = _import_or_exit('multiprocessing')
 face_recognition = _import_or_exit('face_recognition')
+try:
+    from tqdm import tqdm
+except ImportError:
+    print("\n[ERROR] Required package 'tqdm' is not installed.\nPlease install it with: pip install tqdm\n")
+    exit(1)
+
+try:
+    import numpy as np
+except ImportError:
+    print("\n[ERROR] Required package 'numpy' is not installed.\nPlease install it with: pip install numpy\n")
+    exit(1)
+
+from embedding_store import EmbeddingStore, write_store
+from face_gallery import CentroidIndex, FaceGallery, IVFIndex, MATCHING_DEFAULTS
+from settings import load_section
 
 data_path = "data/"
-encodings_path = "encodings/face_encodings.pkl"
-
-face_encodings = []
-face_names = []
-
-for person_name in os.listdir(data_path):
-    person_folder = os.path.join(data_path, person_name)
-    if os.path.isdir(person_folder):
-        for file in os.listdir(person_folder):
-            if file.lower().endswith(("jpg", "jpeg", "png")):
-                img_path = os.path.join(person_folder, file)
-                img = face_recognition.load_image_file(img_path)
-                encodings = face_recognition.face_encodings(img)
-                if encodings:
-                    face_encodings.append(encodings[0])
-                    face_names.append(person_name)
-
-# Save encodings
-os.makedirs("encodings", exist_ok=True)
-with open(encodings_path, "wb") as f:
-    pickle.dump((face_encodings, face_names), f)
-
-print(f"✅ Encodings saved to {encodings_path}")
+encodings_path = "encodings/face_encodings.bin"
+
+MANIFEST_VERSION = 1
+IMAGE_EXTENSIONS = ("jpg", "jpeg", "png")
+
+
+def sidecar_path(encodings_file, name):
+    """Files derived from the encodings store live next to it"""
+    return os.path.join(os.path.dirname(encodings_file) or ".", name)
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def scan_images(data_dir):
+    """Return sorted (relative path, person name) pairs for every enrollment image under data_dir"""
+    images = []
+    for person_name in sorted(os.listdir(data_dir)):
+        person_folder = os.path.join(data_dir, person_name)
+        if os.path.isdir(person_folder):
+            for file in sorted(os.listdir(person_folder)):
+                if file.lower().endswith(IMAGE_EXTENSIONS):
+                    images.append((f"{person_name}/{file}", person_name))
+    return images
+
+
+def encode_image(img_path):
+    img = face_recognition.load_image_file(img_path)
+    encodings = face_recognition.face_encodings(img)
+    return encodings[0] if encodings else None
+
+
+def _encode_job(img_path):
+    """Worker entry point: content hash and first face encoding of one image"""
+    return file_hash(img_path), encode_image(img_path)
+
+
+def encode_images(img_paths, workers=1, chunksize=None):
+    """
+    Hash and encode images, serially or on a process pool.
+
+    Results come back in the same order as img_paths whatever the worker count, so the
+    store layout is deterministic. With workers > 1 the paths are handed out in chunks
+    to amortise inter-process overhead.
+    """
+    results = []
+    if not img_paths:
+        return results
+    progress = tqdm(total=len(img_paths), desc="Encoding faces", unit="img")
+    if workers <= 1 or len(img_paths) == 1:
+        for img_path in img_paths:
+            results.append(_encode_job(img_path))
+            progress.update(1)
+    else:
+        workers = min(workers, len(img_paths))
+        if not chunksize:
+            # A few chunks per worker keeps them all busy without too much IPC per image
+            chunksize = max(1, len(img_paths) // (workers * 4))
+        with multiprocessing.Pool(workers) as pool:
+            for result in pool.imap(_encode_job, img_paths, chunksize=chunksize):
+                results.append(result)
+                progress.update(1)
+    progress.close()
+    return results
+
+
+def load_manifest(manifest_file, store_file):
+    """
+    Load the enrollment manifest together with the store it describes.
+
+    Returns (files, encodings, names). Anything inconsistent (missing store, row count
+    mismatch, older manifest version) yields an empty manifest so everything is re-encoded.
+    """
+    if not (os.path.exists(manifest_file) and os.path.exists(store_file)):
+        return {}, [], []
+    try:
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+        store = EmbeddingStore(store_file)
+        if (manifest.get("version") != MANIFEST_VERSION or manifest.get("rows") != len(store)
+                or manifest.get("generation") != store.generation):
+            raise ValueError("manifest does not match the encodings store")
+        # Copy out of the mapping so the store file can be replaced afterwards
+        return manifest["files"], np.array(store.embeddings), list(store.names)
+    except Exception as e:
+        print(f"[Enroll] Ignoring manifest, re-encoding everything: {e}")
+        return {}, [], []
+
+
+def update_encodings(data_dir=data_path, store_file=encodings_path, workers=1, chunksize=None):
+    """
+    Bring the encodings store in line with data_dir, encoding only new or changed images.
+
+    Each image is tracked in manifest.json by path, size, mtime and SHA-1 of its content.
+    Unchanged size+mtime skips the file outright; otherwise the content hash decides whether
+    it really changed (so a touched-but-identical file is not re-encoded). Images that were
+    removed from data_dir are pruned from the store. New or changed images are encoded by
+    encode_images() with the given worker count.
+    """
+    manifest_file = sidecar_path(store_file, "manifest.json")
+    old_files, old_encodings, old_names = load_manifest(manifest_file, store_file)
+
+    # First pass: decide what can be reused and what has to be encoded
+    images = []
+    to_encode = []
+    for rel_path, person_name in scan_images(data_dir):
+        img_path = os.path.join(data_dir, rel_path)
+        stat = os.stat(img_path)
+        entry = old_files.get(rel_path)
+
+        unchanged = entry is not None and entry["name"] == person_name and entry["size"] == stat.st_size
+        if unchanged and entry["mtime"] != stat.st_mtime:
+            unchanged = entry["sha1"] == file_hash(img_path)
+        if not unchanged:
+            entry = None
+            to_encode.append(img_path)
+        images.append((rel_path, person_name, stat, entry))
+
+    encoded = iter(encode_images(to_encode, workers, chunksize))
+
+    face_encodings = []
+    face_names = []
+    files = {}
+    counts = {"reused": len(images) - len(to_encode), "encoded": len(to_encode), "removed": 0}
+
+    for rel_path, person_name, stat, entry in images:
+        if entry is not None:
+            digest = entry["sha1"]
+            encoding = old_encodings[entry["row"]] if entry["row"] is not None else None
+        else:
+            digest, encoding = next(encoded)
+
+        row = None
+        if encoding is not None:
+            row = len(face_encodings)
+            face_encodings.append(encoding)
+            face_names.append(person_name)
+        files[rel_path] = {
+            "name": person_name,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "sha1": digest,
+            "row": row,  # None when no face was found, so the image is not retried until it changes
+        }
+
+    counts["removed"] = len(set(old_files) - set(files))
+
+    # Save encodings, then the manifest that describes them
+    generation = write_store(store_file, face_encodings, face_names)
+    with open(manifest_file, "w") as f:
+        json.dump({"version": MANIFEST_VERSION, "rows": len(face_encodings), "generation": generation, "files": files}, f)
+
+    print(f"[Enroll] {counts['encoded']} encoded, {counts['reused']} unchanged, {counts['removed']} removed")
+    return face_encodings, face_names
+
+
+def build_matching_files(store_file=encodings_path):
+    """Write the centroid prefilter and, for large watchlists, the ANN index next to the store"""
+    centroids_path = sidecar_path(store_file, "face_centroids.npz")
+    index_path = sidecar_path(store_file, "face_index.npz")
+    gallery = FaceGallery.from_store(EmbeddingStore(store_file))
+
+    # Per-identity centroids and radii for the matcher's prefilter
+    if len(gallery):
+        CentroidIndex.build(gallery).save(centroids_path)
+        print(f"✅ Identity centroids saved to {centroids_path}")
+
+    # Build the approximate nearest-neighbour index for large watchlists
+    matching = load_section("face_matching", MATCHING_DEFAULTS)
+    if matching["ann_enabled"] and len(gallery) >= matching["ann_min_gallery_size"]:
+        index = IVFIndex.build(gallery, nlist=matching["ann_nlist"])
+        index.save(index_path)
+        print(f"✅ ANN index ({index.nlist} cells) saved to {index_path}")
+    elif os.path.exists(index_path):
+        os.remove(index_path)  # built for an older gallery, main.py would reject it anyway
+
+
+def main(data_dir=data_path, store_file=encodings_path, workers=1, chunksize=None):
+    update_encodings(data_dir, store_file, workers, chunksize)
+    print(f"✅ Encodings saved to {store_file}")
+    build_matching_files(store_file)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Encode enrolled faces under data/ into the encodings store")
+    parser.add_argument("--data", default=data_path, help="folder with one sub-folder of images per person")
+    parser.add_argument("--output", default=encodings_path, help="encodings store to create or update")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="encoding processes (1 = serial, default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=None, help="images handed to a worker at a time")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args.data, args.output, args.workers, args.chunksize)
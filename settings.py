@@ -0,0 +1,34 @@
+import json
+import os
+
+CONFIG_FILE = "config/system_config.json"
+
+
+def load_config(config_file=CONFIG_FILE):
+    """Return the whole config dict, or {} if the file is missing or unreadable."""
+    try:
+        if os.path.exists(config_file):
+            with open(config_file, 'r') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"[Config] Error loading settings: {e}")
+    return {}
+
+
+def load_section(section, defaults, config_file=CONFIG_FILE):
+    """Return `defaults` overridden by whatever keys the config file has under `section`."""
+    values = dict(defaults)
+    stored = load_config(config_file).get(section, {})
+    if isinstance(stored, dict):
+        values.update({k: v for k, v in stored.items() if k in defaults})
+    return values
+
+
+def update_config(values, config_file=CONFIG_FILE):
+    """Merge `values` into the config file, keeping every other key that is already there."""
+    config = load_config(config_file)
+    config.update(values)
+    os.makedirs(os.path.dirname(config_file), exist_ok=True)
+    with open(config_file, 'w') as f:
+        json.dump(config, f, indent=2)
+    return config
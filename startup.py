@@ -0,0 +1,155 @@
+import importlib
+import importlib.util
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+STARTUP_DEFAULTS = {
+    "deferred_loading": True,  # open the window first, load gallery/models/messaging on a background thread
+    "report": True,            # print the startup time breakdown once everything has loaded
+}
+
+
+def require(module, pip_name=None):
+    """Exit with an install hint when `module` is not installed, without importing it"""
+    if module not in sys.modules and importlib.util.find_spec(module) is None:
+        pkg = pip_name if pip_name else module
+        print(f"\n[ERROR] Required package '{pkg}' is not installed.\nPlease install it with: pip install {pkg}\n")
+        exit(1)
+
+
+class StartupReport:
+    """Wall-clock cost of every startup step, grouped into imports, loads and milestones"""
+
+    KINDS = ("import", "load", "milestone")
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.steps = []  # (kind, name, seconds)
+        self._lock = threading.Lock()
+
+    def add(self, kind, name, seconds):
+        with self._lock:
+            self.steps.append((kind, name, seconds))
+
+    @contextmanager
+    def timed(self, kind, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.add(kind, name, self.clock() - start)
+
+    def mark(self, name):
+        """Record that `name` happened, as seconds since the report was created"""
+        self.add("milestone", name, self.clock() - self.started)
+
+    def format(self):
+        with self._lock:
+            steps = list(self.steps)
+        lines = [f"[Startup] Ready after {self.clock() - self.started:.2f} s"]
+        for kind in self.KINDS:
+            entries = [(name, seconds) for k, name, seconds in steps if k == kind]
+            if kind != "milestone":
+                entries.sort(key=lambda entry: entry[1], reverse=True)
+            for name, seconds in entries:
+                label = f"{name} after" if kind == "milestone" else name
+                lines.append(f"  {kind:<9} {label:<28} {seconds:7.2f} s")
+        return "\n".join(lines)
+
+
+class LazyModule:
+    """
+    Stands in for a module and imports it on first attribute access, timing the import.
+
+    Heavy packages (torch, face_recognition, twilio via message.py) then cost nothing until
+    they are used, or until the background loader imports them ahead of time with load().
+    """
+
+    def __init__(self, name, report=None):
+        self._name = name
+        self._report = report
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self._module is None:
+                if self._report is None:
+                    self._module = importlib.import_module(self._name)
+                else:
+                    with self._report.timed("import", self._name):
+                        self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+class BackgroundLoader(threading.Thread):
+    """
+    Runs named startup steps in order on a daemon thread.
+
+    A step is a callable, timed into the report as a load, or a LazyModule, which times its own
+    import. If a step fails the rest are skipped and `error` says which one and why. `on_done`
+    is called from the loader thread when it finishes either way.
+    """
+
+    def __init__(self, steps, report, on_done=None):
+        super().__init__(daemon=True, name="startup-loader")
+        self.steps = list(steps)
+        self.report = report
+        self.on_done = on_done
+        self.current = None
+        self.completed = 0
+        self.error = None
+        self.finished = threading.Event()
+
+    def run_steps(self):
+        """Run every step on the calling thread, letting exceptions through"""
+        for label, step in self.steps:
+            self.current = label
+            if isinstance(step, LazyModule):
+                step.load()
+            else:
+                with self.report.timed("load", label):
+                    step()
+            self.completed += 1
+        self.current = None
+        self.finished.set()
+
+    def run(self):
+        try:
+            self.run_steps()
+        except SystemExit:
+            # The module's own import guard has already printed which package is missing
+            self.error = f"{self.current}: required package missing, see console"
+        except Exception as e:
+            self.error = f"{self.current}: {e}"
+        finally:
+            self.finished.set()
+            if self.on_done is not None:
+                self.on_done(self)
+
+    @property
+    def ready(self):
+        return self.finished.is_set() and self.error is None
+
+    def progress(self):
+        """One-line status for the GUI"""
+        if self.error:
+            return f"❌ Startup failed - {self.error}"
+        if self.finished.is_set():
+            return "Startup complete"
+        current = self.current or self.steps[0][0]
+        return f"⏳ Loading {current} ({self.completed + 1}/{len(self.steps)})..."
@@ -0,0 +1,162 @@
+import time
+
+import cv2
+import numpy as np
+
+TAMPER_DEFAULTS = {
+    "mode": "rolling",               # "rolling" checks every frame against a learned view, "snapshot" every 3 seconds
+    "learning_rate": 0.02,           # weight of each normal frame in the learned view
+    "warmup_frames": 15,             # frames averaged into the first view before changes can be reported
+    "trigger_seconds": 0.4,          # how long a problem must last before it is reported
+    "clear_seconds": 1.5,            # how long the view must look normal again before the report is cleared
+    "defocus_ratio": 0.3,            # sharpness below this fraction of the learned view's counts as defocused
+    "scene_similarity": 0.15,        # correlation with the learned view below which the scene has been replaced
+    "shift_response": 0.5,           # phase-correlation peak that makes a global shift a camera move
+    "min_shift": 1.5,                # shift in thumbnail pixels (1/10 of a 640-wide frame) that counts as moved
+    "relearn_seconds": 30.0,         # a moved/changed view that lasts this long becomes the new learned view, 0 = never
+}
+
+THUMB_SIZE = (64, 48)
+REASONS = {
+    "covered": "Low visual content",
+    "defocused": "Camera out of focus",
+    "moved": "Camera moved",
+    "scene_change": "Camera view changed",
+}
+
+
+class TamperDetector:
+    """
+    Streaming camera-tamper detector that compares every frame with a learned view of the lane.
+
+    The learned view is an exponentially weighted average of contrast-normalised 64x48 thumbnails
+    of normal frames, plus their sharpness (edge variance over grey variance, from FrameStats).
+    Normalising both by the frame's own contrast keeps lights being dimmed or night mode from
+    looking like tampering. Each frame is classified as:
+      - covered: the flat/low-content check the caller already ran (is_frame_suspicious)
+      - defocused: sharpness fell below `defocus_ratio` of the learned sharpness
+      - moved: phase correlation with the learned view has a strong peak away from zero, the
+        whole picture slid. Someone stepping in front of the camera leaves the background where
+        it was, so the peak stays at zero or gets weak.
+      - scene_change: the thumbnail has (almost) no correlation with the learned view any more,
+        the camera is looking at something else.
+    A problem is reported once it has lasted `trigger_seconds` and cleared after `clear_seconds`
+    of normal frames. A moved or changed view that stays for `relearn_seconds` is learned afresh.
+    """
+
+    def __init__(self, learning_rate=0.02, warmup_frames=15, trigger_seconds=0.4, clear_seconds=1.5,
+                 defocus_ratio=0.3, scene_similarity=0.15, shift_response=0.5, min_shift=1.5,
+                 relearn_seconds=30.0):
+        self.learning_rate = learning_rate
+        self.warmup_frames = max(1, int(warmup_frames))
+        self.trigger_seconds = trigger_seconds
+        self.clear_seconds = clear_seconds
+        self.defocus_ratio = defocus_ratio
+        self.scene_similarity = scene_similarity
+        self.shift_response = shift_response
+        self.min_shift = min_shift
+        self.relearn_seconds = relearn_seconds
+
+        self.view = None
+        self.sharpness = None
+        self.frames_learned = 0
+        self.active = False
+        self.reason = None
+        self._problem_since = None
+        self._changed_since = None
+        self._normal_since = None
+        self._window = cv2.createHanningWindow(THUMB_SIZE, cv2.CV_32F)
+
+    @staticmethod
+    def signature(frame):
+        """Contrast-normalised float32 grey thumbnail"""
+        thumb = cv2.resize(frame, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        if thumb.ndim == 3:
+            thumb = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+        view = thumb.astype(np.float32)
+        mean, std = cv2.meanStdDev(view)
+        view -= float(mean[0, 0])
+        view /= max(float(std[0, 0]), 1.0)
+        return view
+
+    @staticmethod
+    def frame_sharpness(stats):
+        return stats.edge_var / (stats.gray_var + 1.0)
+
+    @property
+    def learned(self):
+        return self.frames_learned >= self.warmup_frames
+
+    def classify(self, view, sharpness, covered=False):
+        """Reason this frame looks tampered with, or None"""
+        if covered:
+            return "covered"
+        if not self.learned:
+            return None
+        if sharpness < self.defocus_ratio * self.sharpness:
+            return "defocused"
+        # phaseCorrelate applies a window argument in place, so the windowed copies are made here
+        (dx, dy), response = cv2.phaseCorrelate(self.view * self._window, view * self._window)
+        if response >= self.shift_response and max(abs(dx), abs(dy)) >= self.min_shift:
+            return "moved"
+        # Both views are zero-mean with unit variance, so their mean product is the correlation coefficient
+        if float(np.mean(self.view * view)) < self.scene_similarity:
+            return "scene_change"
+        return None
+
+    def learn(self, view, sharpness):
+        if self.view is None:
+            self.view = view.copy()
+            self.sharpness = sharpness
+        else:
+            rate = max(self.learning_rate, 1.0 / (self.frames_learned + 1))  # plain average while warming up
+            cv2.accumulateWeighted(view, self.view, rate)
+            self.sharpness += rate * (sharpness - self.sharpness)
+        self.frames_learned += 1
+
+    def update(self, frame, stats, covered=False, now=None):
+        """Feed one camera frame (and its FrameStats); returns whether tampering is being reported"""
+        now = time.time() if now is None else now
+        view = self.signature(frame)
+        sharpness = self.frame_sharpness(stats)
+        reason = self.classify(view, sharpness, covered)
+
+        if reason is None:
+            self.learn(view, sharpness)
+            self._problem_since = self._changed_since = None
+            if self.active:
+                if self._normal_since is None:
+                    self._normal_since = now
+                if now - self._normal_since >= self.clear_seconds:
+                    self.active = False
+                    self.reason = None
+            return self.active
+
+        self._normal_since = None
+        if self._problem_since is None:
+            self._problem_since = now
+        if now - self._problem_since >= self.trigger_seconds:
+            self.active = True
+            self.reason = reason
+        if reason in ("moved", "scene_change"):
+            if self._changed_since is None:
+                self._changed_since = now
+            if self.relearn_seconds > 0 and now - self._changed_since >= self.relearn_seconds:
+                print("[Tamper] Camera view stayed changed, learning it as the new view")
+                self.reset(keep_state=True)
+        else:
+            self._changed_since = None
+        return self.active
+
+    def describe(self):
+        return REASONS.get(self.reason, "Visual anomaly")
+
+    def reset(self, keep_state=False):
+        self.view = None
+        self.sharpness = None
+        self.frames_learned = 0
+        self._problem_since = self._changed_since = None
+        if not keep_state:
+            self.active = False
+            self.reason = None
+            self._normal_since = None
@@ -0,0 +1,76 @@
+import unittest
+import importlib.util
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from accessory_detector import backend_weights
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SAMPLE_IMAGE = os.path.join(ROOT, 'data', 'Sample_image', '0fa6c76f-5158-4a19-b602-9ad2db724852.jpg')
+HAS_ONNX_RUNTIME = all(importlib.util.find_spec(m) for m in ('torch', 'onnx', 'onnxruntime'))
+
+
+class TestBackendWeights(unittest.TestCase):
+    def test_paths_follow_export_naming(self):
+        self.assertEqual(backend_weights('models/yolov5n_best.pt', 'pytorch'), 'models/yolov5n_best.pt')
+        self.assertEqual(backend_weights('models/yolov5n_best.pt', 'onnx'), 'models/yolov5n_best.onnx')
+        self.assertEqual(backend_weights('models/yolov5n_best.pt', 'openvino'), 'models/yolov5n_best_openvino_model')
+        self.assertEqual(backend_weights('models/yolov5n_best.pt', 'openvino_int8'),
+                         'models/yolov5n_best_int8_openvino_model')
+        with self.assertRaises(ValueError):
+            backend_weights('models/yolov5n_best.pt', 'tensorrt')
+
+
+class TestCalibrationSplit(unittest.TestCase):
+    def test_held_out_split_is_stable_and_partial(self):
+        from export_accessory_model import is_held_out
+
+        names = [f'frame_{i:05d}.jpg' for i in range(500)]
+        held_out = [n for n in names if is_held_out(n)]
+        self.assertEqual(held_out, [n for n in names if is_held_out(os.path.join('other', n))])
+        self.assertTrue(0.1 < len(held_out) / len(names) < 0.3)
+
+
+@unittest.skipUnless(HAS_ONNX_RUNTIME, 'needs torch, onnx and onnxruntime')
+class TestOnnxParity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import torch
+        from export_accessory_model import export_model
+
+        cls.tmp_dir = tempfile.mkdtemp()
+        weights = os.path.join(cls.tmp_dir, 'yolov5n_best.pt')
+        shutil.copy(os.path.join(ROOT, 'models', 'yolov5n_best.pt'), weights)
+        onnx_path = export_model(weights, 'onnx')
+        yolov5 = os.path.join(ROOT, 'yolov5')
+        cls.pt_model = torch.hub.load(yolov5, 'custom', path=weights, source='local')
+        cls.onnx_model = torch.hub.load(yolov5, 'custom', path=onnx_path, source='local')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    def assert_same_detections(self, frame, size):
+        expected = self.pt_model(frame, size=size).xyxy[0].cpu().numpy()
+        actual = self.onnx_model(frame, size=size).xyxy[0].cpu().numpy()
+        # Every confident PyTorch detection has an ONNX twin: same class, box within 2 px, close score
+        for det in expected[expected[:, 4] >= 0.3]:
+            same_class = actual[actual[:, 5] == det[5]]
+            self.assertTrue(len(same_class), f"class {int(det[5])} missing at size {size}")
+            twin = same_class[np.abs(same_class[:, :4] - det[:4]).max(1).argmin()]
+            np.testing.assert_allclose(twin[:4], det[:4], atol=2)
+            self.assertAlmostEqual(float(twin[4]), float(det[4]), delta=0.02)
+        self.assertLessEqual(abs(len(expected) - len(actual)), 1)
+
+    def test_detections_match_pytorch(self):
+        import cv2
+        frame = cv2.imread(SAMPLE_IMAGE)
+        for size in (640, 320):
+            self.assert_same_detections(frame, size)
+            self.assert_same_detections(cv2.resize(frame, (640, 480)), size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,20 @@
 import unittest
 from unittest.mock import patch, MagicMock
+import time
 import numpy as np
 
 
 class TestAccessoryDetection(unittest.TestCase):
+    def setUp(self):
+        # SecuritySystem() tunes model threads on startup, keep its result out of the real config file
+        saver = patch('main.update_config')
+        saver.start()
+        self.addCleanup(saver.stop)
+        # Keep a TorchScript cache from a local run out of the tests, and never trace the mocked model
+        no_cache = patch('main.SecuritySystem.accessory_cache_path', return_value=None)
+        no_cache.start()
+        self.addCleanup(no_cache.stop)
+
     @patch('main.torch.hub.load')
     def test_detect_accessories(self, mock_yolo_load):
         # Mock YOLO model output
@@ -21,5 +32,52 @@ class TestAccessoryDetection(unittest.TestCase):
         except Exception as e:
             self.fail(f"detect_accessories raised Exception unexpectedly: {e}")
 
+    @patch('main.torch.hub.load')
+    def test_per_class_thresholds(self, mock_yolo_load):
+        mock_model = MagicMock()
+        mock_model.names = {0: "mask", 1: "sunglasses", 2: "cap", 3: "person"}
+        mock_yolo_load.return_value = mock_model
+
+        from main import SecuritySystem
+        system = SecuritySystem()
+        mock_model.return_value.xyxy = [np.array([
+            [0, 0, 10, 10, 0.45, 0],  # mask passes from 0.4
+            [0, 0, 10, 10, 0.45, 1],  # sunglasses need 0.5
+            [0, 0, 10, 10, 0.60, 2],
+            [0, 0, 10, 10, 0.99, 3],  # not an accessory
+        ])]
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        self.assertEqual(system.detect_accessories(frame), ["mask", "cap"])
+
+        mock_model.return_value.xyxy = [np.zeros((0, 6))]
+        self.assertEqual(system.detect_accessories(frame), [])
+
+    @patch('main.torch.hub.load')
+    def test_roi_mode_crops_around_recent_faces(self, mock_yolo_load):
+        mock_model = MagicMock()
+        mock_model.names = ["mask", "sunglasses", "cap", "scarf-kerchief"]
+        mock_model.return_value.xyxy = [np.zeros((0, 6))]
+        mock_yolo_load.return_value = mock_model
+
+        from main import SecuritySystem
+        system = SecuritySystem()
+        system.accessory_config = dict(system.accessory_config, roi_enabled=True, roi_size=320)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        # No face seen yet: full frame at the default size
+        system.detect_accessories_near_faces(frame)
+        self.assertEqual(mock_model.call_args.args[0].shape, (480, 640, 3))
+        self.assertEqual(mock_model.call_args.kwargs["size"], 640)
+
+        system.face_boxes = ([(200, 400, 300, 300)], time.time())
+        system.detect_accessories_near_faces(frame)
+        self.assertEqual(mock_model.call_args.args[0].shape, (260, 200, 3))
+        self.assertEqual(mock_model.call_args.kwargs["size"], 320)
+
+        # Stale boxes are not trusted
+        system.face_boxes = ([(200, 400, 300, 300)], time.time() - 60)
+        system.detect_accessories_near_faces(frame)
+        self.assertEqual(mock_model.call_args.kwargs["size"], 640)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
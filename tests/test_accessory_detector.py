@@ -0,0 +1,24 @@
+import unittest
+
+from accessory_detector import face_roi
+
+
+class TestFaceRoi(unittest.TestCase):
+    def test_pads_around_face(self):
+        # 100x100 face box in a 480x640 frame
+        self.assertEqual(face_roi((480, 640, 3), [(200, 400, 300, 300)], 0.5, 0.8, 0.8), (120, 450, 380, 250))
+
+    def test_clipped_to_frame(self):
+        self.assertEqual(face_roi((480, 640, 3), [(10, 630, 110, 530)], 0.5, 0.8, 0.8), (0, 640, 190, 480))
+
+    def test_several_faces_share_one_region(self):
+        roi = face_roi((480, 640, 3), [(100, 200, 200, 100), (150, 500, 250, 400)], 0, 0, 0)
+        self.assertEqual(roi, (100, 500, 250, 100))
+
+    def test_no_faces(self):
+        self.assertIsNone(face_roi((480, 640, 3), []))
+        self.assertIsNone(face_roi((480, 640, 3), [(500, 700, 600, 650)], 0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
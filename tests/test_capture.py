@@ -0,0 +1,96 @@
+import unittest
+import time
+from unittest.mock import MagicMock
+
+from capture import FrameRingBuffer, CaptureThread
+
+
+class TestFrameRingBuffer(unittest.TestCase):
+    def test_latest_returns_newest_and_counts_dropped(self):
+        buf = FrameRingBuffer(size=4)
+        for i in range(3):
+            buf.put(f"frame{i}")
+        seq, _, frame = buf.latest()
+        self.assertEqual((seq, frame), (2, "frame2"))
+        self.assertEqual(buf.dropped, 2)
+        self.assertIsNone(buf.latest())
+
+    def test_overwrites_oldest_when_full(self):
+        buf = FrameRingBuffer(size=2)
+        for i in range(5):
+            buf.put(i)
+        self.assertEqual(buf.pending(), 5)
+        seq, _, frame = buf.latest()
+        self.assertEqual(frame, 4)
+        buf.mark_processed()
+        self.assertEqual(buf.stats(), {"captured": 5, "dropped": 4, "processed": 1})
+
+
+class TestCaptureThread(unittest.TestCase):
+    def test_thread_fills_buffer_from_capture(self):
+        cap = MagicMock()
+        cap.read.return_value = (True, "frame")
+        thread = CaptureThread(cap, buffer_size=3)
+        thread.start()
+        deadline = time.time() + 2
+        while thread.stats()["captured"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        thread.stop()
+        self.assertIsNotNone(thread.latest())
+        self.assertFalse(thread.failed)
+
+    def wait_for(self, condition, timeout=2):
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            time.sleep(0.005)
+        return condition()
+
+    def test_thread_reports_failure_and_keeps_retrying(self):
+        cap = MagicMock()
+        cap.read.return_value = (False, None)
+        thread = CaptureThread(cap, max_read_failures=3, retry_delay=0.001, reopen_delay=0.001)
+        thread.start()
+        self.assertTrue(self.wait_for(lambda: thread.failed))
+        self.assertTrue(self.wait_for(lambda: cap.read.call_count > 10))
+        self.assertTrue(thread.is_alive())
+        self.assertIsNone(thread.latest())
+        thread.stop()
+        self.assertFalse(thread.is_alive())
+
+    def test_recovers_after_a_run_of_failed_reads(self):
+        reads = [(False, None)] * 35 + [(True, "frame")] * 1000
+        cap = MagicMock()
+        cap.read.side_effect = reads
+        reopened = MagicMock()
+        reopened.read.side_effect = reads[31:]  # the reopened camera fails a few more times, then works
+        thread = CaptureThread(cap, reopen=lambda: reopened, retry_delay=0.001, reopen_delay=0.001)
+        thread.start()
+        self.assertTrue(self.wait_for(lambda: thread.failed))
+        self.assertTrue(self.wait_for(lambda: thread.stats()["captured"] > 0))
+        thread.stop()
+        cap.release.assert_called_once()
+        self.assertIs(thread.capture, reopened)
+        self.assertEqual(thread.reopens, 1)
+        self.assertFalse(thread.failed)
+        self.assertIsNone(thread.error)
+
+    def test_failing_reopen_keeps_the_thread_alive(self):
+        cap = MagicMock()
+        cap.read.return_value = (False, None)
+        attempts = []
+
+        def reopen():
+            attempts.append(1)
+            raise RuntimeError("Could not access the webcam.")
+
+        thread = CaptureThread(cap, max_read_failures=2, reopen=reopen, retry_delay=0.001,
+                               reopen_delay=0.001, max_reopen_delay=0.002)
+        thread.start()
+        self.assertTrue(self.wait_for(lambda: len(attempts) >= 3))
+        self.assertTrue(thread.is_alive())
+        self.assertTrue(thread.failed)
+        thread.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+
+from detection_scheduler import DetectionScheduler
+
+
+class TestDetectionScheduler(unittest.TestCase):
+    def setUp(self):
+        self.frame = np.full((120, 160, 3), 100, dtype=np.uint8)
+        self.detect = MagicMock(return_value=["cap"])
+
+    def test_runs_every_n_frames_and_carries_result(self):
+        scheduler = DetectionScheduler(interval=3, max_age=10, motion_threshold=8)
+        results = [scheduler.run(self.frame, self.detect, now=i * 0.01) for i in range(7)]
+        self.assertEqual(self.detect.call_count, 3)  # frames 0, 3 and 6
+        self.assertEqual(results, [["cap"]] * 7)
+        self.assertEqual(scheduler.stats(), {"runs": 3, "skipped": 4, "motion_runs": 0})
+
+    def test_result_expires(self):
+        scheduler = DetectionScheduler(interval=100, max_age=0.5)
+        scheduler.run(self.frame, self.detect, now=0.0)
+        scheduler.run(self.frame, self.detect, now=0.4)
+        self.assertEqual(self.detect.call_count, 1)
+        scheduler.run(self.frame, self.detect, now=0.5)
+        self.assertEqual(self.detect.call_count, 2)
+
+    def test_scene_change_triggers_early_run(self):
+        scheduler = DetectionScheduler(interval=100, max_age=10, motion_threshold=8)
+        scheduler.run(self.frame, self.detect, now=0.0)
+        scheduler.run(self.frame + 3, self.detect, now=0.1)  # camera noise
+        self.assertEqual(self.detect.call_count, 1)
+
+        changed = self.frame.copy()
+        changed[:, :80] = 255
+        self.detect.return_value = []
+        self.assertEqual(scheduler.run(changed, self.detect, now=0.2), [])
+        self.assertEqual(scheduler.motion_runs, 1)
+
+    def test_interval_one_detects_every_frame(self):
+        scheduler = DetectionScheduler(interval=1, motion_threshold=0)
+        for i in range(4):
+            scheduler.run(self.frame, self.detect, now=i * 0.01)
+        self.assertEqual(self.detect.call_count, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+
+from unittest.mock import patch
+
+from embedding_store import (
+    EmbeddingStore, generation_path, read_header, remove_stale_generations, resolve, write_store,
+)
+from face_gallery import FaceGallery
+
+
+class TestEmbeddingStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'face_encodings.bin')
+        rng = np.random.default_rng(0)
+        self.encodings = rng.normal(size=(12, 128)) * 0.1
+        self.names = [f"person{i % 4}" for i in range(12)]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        write_store(self.path, self.encodings, self.names)
+        store = EmbeddingStore(self.path)
+        self.assertEqual(len(store), 12)
+        self.assertEqual(store.dim, 128)
+        self.assertEqual(list(store.names), self.names)
+        self.assertEqual(store.names[5], "person1")
+        np.testing.assert_allclose(store.embeddings, self.encodings, rtol=1e-6)
+        np.testing.assert_allclose(store.sq_norms, np.sum(store.embeddings ** 2, axis=1), rtol=1e-5)
+
+    def test_gallery_wraps_mapping_without_copying(self):
+        write_store(self.path, self.encodings, self.names)
+        gallery = FaceGallery.from_store(EmbeddingStore(self.path))
+        self.assertIsInstance(gallery.embeddings, np.memmap)
+        names, _ = gallery.match(self.encodings[[2]])
+        self.assertEqual(names, [["person2"]])
+
+        # Adding copies into private memory instead of writing through the mapping
+        gallery.add(self.encodings[:1], ["new"])
+        self.assertEqual(len(gallery), 13)
+        self.assertEqual(len(EmbeddingStore(self.path)), 12)
+
+    def test_generation_increments_on_rewrite(self):
+        self.assertEqual(write_store(self.path, self.encodings, self.names), 1)
+        self.assertEqual(write_store(self.path, self.encodings[:3], self.names[:3]), 2)
+        self.assertEqual(read_header(self.path)["generation"], 2)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_rewrite_never_touches_a_mapped_generation(self):
+        write_store(self.path, self.encodings, self.names)
+        old = EmbeddingStore(self.path)
+        self.assertEqual(old.data_path, generation_path(self.path, 1))
+        write_store(self.path, self.encodings[:3], self.names[:3])
+        self.assertEqual(resolve(self.path), generation_path(self.path, 2))
+        self.assertEqual(len(EmbeddingStore(self.path)), 3)
+        # The reader that has not remapped yet still sees its complete generation
+        self.assertEqual(list(old.names), self.names)
+        np.testing.assert_allclose(old.embeddings, self.encodings, rtol=1e-6)
+
+    def test_old_generations_are_removed(self):
+        for count in (12, 6, 3):
+            write_store(self.path, self.encodings[:count], self.names[:count])
+        # The writer keeps the previous generation for readers that are about to remap
+        self.assertFalse(os.path.exists(generation_path(self.path, 1)))
+        self.assertTrue(os.path.exists(generation_path(self.path, 2)))
+        # A reader that has remapped drops it
+        self.assertEqual(remove_stale_generations(self.path), [generation_path(self.path, 2)])
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ['face_encodings.bin', 'face_encodings.g3.bin'])
+
+    def test_generation_still_mapped_is_skipped(self):
+        for count in (12, 6, 3):
+            with patch('embedding_store.os.remove', side_effect=PermissionError("mapped by another process")):
+                write_store(self.path, self.encodings[:count], self.names[:count])
+        self.assertEqual(len(EmbeddingStore(self.path)), 3)
+        self.assertTrue(os.path.exists(generation_path(self.path, 1)))
+        remove_stale_generations(self.path)
+        self.assertFalse(os.path.exists(generation_path(self.path, 1)))
+
+    def test_reads_and_upgrades_in_place_store(self):
+        write_store(self.path, self.encodings, self.names)
+        os.replace(generation_path(self.path, 1), self.path)  # the layout older versions wrote
+        self.assertEqual(len(EmbeddingStore(self.path)), 12)
+        self.assertEqual(write_store(self.path, self.encodings[:3], self.names[:3]), 2)
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ['face_encodings.bin', 'face_encodings.g2.bin'])
+
+    def test_empty_store(self):
+        write_store(self.path, [], [])
+        store = EmbeddingStore(self.path)
+        self.assertEqual(len(store), 0)
+        self.assertEqual(FaceGallery.from_store(store).match(self.encodings[:1])[0], [[None]])
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\x80\x04' + b'\0' * 200)
+        with self.assertRaises(ValueError):
+            EmbeddingStore(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
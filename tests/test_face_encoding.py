@@ -1,43 +1,111 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import os
-import pickle
 import shutil
+import tempfile
+import numpy as np
+
+from embedding_store import EmbeddingStore
 
 class TestFaceEncoding(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_dir = os.path.join(self.tmp_dir, 'data')
+        self.encodings_path = os.path.join(self.tmp_dir, 'encodings', 'face_encodings.bin')
+        self.add_image('person1', 'test.jpg', 'fake')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def add_image(self, person, file, content):
+        os.makedirs(os.path.join(self.data_dir, person), exist_ok=True)
+        path = os.path.join(self.data_dir, person, file)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def run_save_encodings(self):
+        import save_encodings
+        save_encodings.main(self.data_dir, self.encodings_path)
+        return self.read_store()
+
+    def read_store(self):
+        store = EmbeddingStore(self.encodings_path)
+        return np.array(store.embeddings), list(store.names)
+
     @patch('face_recognition.load_image_file')
     @patch('face_recognition.face_encodings')
-    def test_face_encoding_saves_pickle(self, mock_encodings, mock_load_image):
+    def test_face_encoding_saves_store(self, mock_encodings, mock_load_image):
         # Setup mocks
         mock_load_image.return_value = 'fake_image_data'
         mock_encodings.return_value = [[0.1, 0.2, 0.3]]
 
-        # Simulate directory and file structure
-        test_data_dir = 'tests/mock_data/person1'
-        os.makedirs(test_data_dir, exist_ok=True)
-        test_img_path = os.path.join(test_data_dir, 'test.jpg')
-        with open(test_img_path, 'w') as f:
-            f.write('fake')
-
-        # Patch os.listdir and isdir
-        with patch('os.listdir', side_effect=[["person1"], ["test.jpg"]]), \
-             patch('os.path.isdir', return_value=True):
-            import save_encodings
-            # Check if encodings file is created
-            self.assertTrue(os.path.exists('encodings/face_encodings.pkl'))
-            with open('encodings/face_encodings.pkl', 'rb') as f:
-                encodings, names = pickle.load(f)
-                self.assertEqual(names, ["person1"])
-                self.assertEqual(encodings, [[0.1, 0.2, 0.3]])
-        # Cleanup
-        if os.path.exists(test_img_path):
-            os.remove(test_img_path)
-        # Remove the mock_data directory tree safely
-        mock_data_root = 'tests/mock_data'
-        if os.path.exists(mock_data_root):
-            shutil.rmtree(mock_data_root)
-        if os.path.exists('encodings/face_encodings.pkl'):
-            os.remove('encodings/face_encodings.pkl')
+        encodings, names = self.run_save_encodings()
+        # Check if encodings file is created
+        self.assertTrue(os.path.exists(self.encodings_path))
+        self.assertEqual(names, ["person1"])
+        np.testing.assert_allclose(encodings, [[0.1, 0.2, 0.3]], rtol=1e-6)
+
+    @patch('face_recognition.load_image_file')
+    @patch('face_recognition.face_encodings')
+    def test_rerun_only_encodes_new_or_changed_images(self, mock_encodings, mock_load_image):
+        mock_encodings.return_value = [[0.1, 0.2, 0.3]]
+        self.run_save_encodings()
+        self.assertEqual(mock_load_image.call_count, 1)
+
+        # Nothing changed: nothing is encoded again
+        self.run_save_encodings()
+        self.assertEqual(mock_load_image.call_count, 1)
+
+        # Touched but identical content is still skipped
+        path = os.path.join(self.data_dir, 'person1', 'test.jpg')
+        os.utime(path, (0, 12345))
+        self.run_save_encodings()
+        self.assertEqual(mock_load_image.call_count, 1)
+
+        # New person and changed content are encoded
+        self.add_image('person2', 'new.jpg', 'other')
+        self.add_image('person1', 'test.jpg', 'changed')
+        mock_encodings.return_value = [[0.4, 0.5, 0.6]]
+        encodings, names = self.run_save_encodings()
+        self.assertEqual(mock_load_image.call_count, 3)
+        self.assertEqual(names, ["person1", "person2"])
+        np.testing.assert_allclose(encodings, [[0.4, 0.5, 0.6], [0.4, 0.5, 0.6]], rtol=1e-6)
+
+    @patch('face_recognition.load_image_file')
+    @patch('face_recognition.face_encodings')
+    def test_deleted_images_are_pruned(self, mock_encodings, mock_load_image):
+        mock_encodings.return_value = [[0.1, 0.2, 0.3]]
+        self.add_image('person2', 'b.jpg', 'other')
+        self.assertEqual(self.run_save_encodings()[1], ["person1", "person2"])
+
+        os.remove(os.path.join(self.data_dir, 'person1', 'test.jpg'))
+        encodings, names = self.run_save_encodings()
+        self.assertEqual(names, ["person2"])
+        self.assertEqual(mock_load_image.call_count, 2)
+
+    @patch('face_recognition.load_image_file')
+    @patch('face_recognition.face_encodings')
+    def test_worker_pool_keeps_deterministic_order(self, mock_encodings, mock_load_image):
+        import save_encodings
+        os.remove(os.path.join(self.data_dir, 'person1', 'test.jpg'))
+        for i in range(6):
+            self.add_image(f'person{i}', 'a.jpg', f'img{i}')
+        mock_load_image.side_effect = lambda path: path
+        mock_encodings.side_effect = lambda path: [[float(path.split('person')[-1][0])]]
+
+        # In-process stand-in for multiprocessing.Pool so the mocks apply inside the workers
+        pool = MagicMock()
+        pool.__enter__.return_value = pool
+        pool.imap.side_effect = lambda func, items, chunksize: [func(x) for x in items]
+        with patch('save_encodings.multiprocessing.Pool', return_value=pool) as mock_pool:
+            save_encodings.main(self.data_dir, self.encodings_path, workers=3, chunksize=2)
+        mock_pool.assert_called_once_with(3)
+        self.assertEqual(pool.imap.call_args.kwargs['chunksize'], 2)
+
+        encodings, names = self.read_store()
+        self.assertEqual(names, ['person0', 'person1', 'person2', 'person3', 'person4', 'person5'])
+        self.assertEqual(encodings.tolist(), [[0.0], [1.0], [2.0], [3.0], [4.0], [5.0]])
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+
+from face_gallery import CentroidIndex, FaceGallery, IVFIndex
+
+
+class TestFaceGallery(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.encodings = rng.normal(size=(50, 128)) * 0.1
+        self.names = [f"person{i % 10}" for i in range(50)]
+        self.gallery = FaceGallery(self.encodings, self.names, capacity=8)
+
+    def test_matrix_is_contiguous_float32(self):
+        self.assertEqual(len(self.gallery), 50)
+        self.assertEqual(self.gallery.embeddings.dtype, np.float32)
+        self.assertTrue(self.gallery.embeddings.flags.c_contiguous)
+
+    def test_distances_match_euclidean(self):
+        queries = self.encodings[:3] + 0.01
+        expected = np.linalg.norm(self.encodings[None, :, :] - queries[:, None, :], axis=2)
+        np.testing.assert_allclose(self.gallery.distances(queries), expected, atol=1e-4)
+
+    def test_match_returns_top_k_sorted(self):
+        queries = self.encodings[[4, 17]]
+        names, distances = self.gallery.match(queries, k=3)
+        self.assertEqual(distances.shape, (2, 3))
+        self.assertEqual(names[0][0], "person4")
+        self.assertEqual(names[1][0], "person7")
+        self.assertTrue(np.all(np.diff(distances, axis=1) >= 0))
+        self.assertAlmostEqual(float(distances[0, 0]), 0.0, places=3)
+
+    def test_match_handles_empty_inputs(self):
+        names, distances = FaceGallery().match(self.encodings[:2], k=2)
+        self.assertEqual(names, [[None, None], [None, None]])
+        self.assertTrue(np.all(np.isinf(distances)))
+        names, distances = self.gallery.match(np.empty((0, 128)))
+        self.assertEqual(names, [])
+
+
+class TestIVFIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.centres = rng.normal(size=(200, 128)) * 0.1
+        encodings = np.repeat(self.centres, 5, axis=0) + rng.normal(size=(1000, 128)) * 0.02
+        self.gallery = FaceGallery(encodings, [f"person{i // 5}" for i in range(1000)])
+        self.index = IVFIndex.build(self.gallery, nlist=20, nprobe=4)
+
+    def test_agrees_with_exact_matching(self):
+        queries = self.centres[:50]
+        exact_names, _ = self.gallery.match(queries)
+        approx_names, approx_dist = self.index.match(queries)
+        agreement = np.mean([a[0] == e[0] for a, e in zip(approx_names, exact_names)])
+        self.assertGreaterEqual(agreement, 0.95)
+        self.assertEqual(approx_dist.shape, (50, 1))
+
+    def test_exhaustive_probe_is_exact(self):
+        queries = self.centres[:20] + 0.05
+        _, exact = self.gallery.match(queries, k=3)
+        _, approx = self.index.match(queries, k=3, nprobe=self.index.nlist)
+        np.testing.assert_allclose(approx, exact, atol=1e-5)
+
+    def test_near_threshold_queries_fall_back_to_exact(self):
+        _, dist = self.gallery.match(self.centres[:5])
+        self.index.match(self.centres[:5], threshold=float(dist[0, 0]))
+        self.assertGreaterEqual(self.index.exact_fallbacks, 1)
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            self.index.save(path)
+            loaded = IVFIndex.load(path, self.gallery, nprobe=4)
+            self.assertEqual(loaded.match(self.centres[:3])[0], self.index.match(self.centres[:3])[0])
+            with self.assertRaises(ValueError):
+                IVFIndex.load(path, FaceGallery(self.centres[:3], ["a", "b", "c"]))
+
+
+class TestCentroidIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.centres = rng.normal(size=(100, 128)) * 0.1
+        encodings = np.repeat(self.centres, 5, axis=0) + rng.normal(size=(500, 128)) * 0.02
+        self.gallery = FaceGallery(encodings, [f"person{i // 5}" for i in range(500)])
+        self.index = CentroidIndex.build(self.gallery, candidates=2)
+
+    def test_one_centroid_per_identity(self):
+        self.assertEqual(len(self.index.identities), 100)
+        self.assertEqual(self.index.centroids.shape, (100, 128))
+        self.assertTrue(np.all(self.index.radii > 0))
+
+    def test_results_identical_to_brute_force(self):
+        rng = np.random.default_rng(3)
+        queries = np.vstack([self.centres[:20] + 0.01, rng.normal(size=(5, 128)) * 0.1])
+        exact_names, exact_dist = self.gallery.match(queries, k=2)
+        names, dist = self.index.match(queries, k=2)
+        self.assertEqual(names, exact_names)
+        np.testing.assert_allclose(dist, exact_dist, atol=1e-5)
+
+    def test_known_faces_skip_most_comparisons(self):
+        self.index.match(self.centres[:10])
+        self.assertLess(self.index.comparisons, 10 * len(self.gallery) / 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+
+from frame_buffers import FramePool, ScratchBuffers
+
+
+class TestFramePool(unittest.TestCase):
+    def test_released_buffer_is_reused(self):
+        pool = FramePool()
+        first = pool.acquire((480, 640, 3))
+        pool.release(first)
+        self.assertIs(pool.acquire((480, 640, 3)), first)
+        self.assertEqual(pool.stats(), {"allocated": 1, "reused": 1, "idle": 0})
+
+    def test_shapes_and_dtypes_are_kept_apart(self):
+        pool = FramePool()
+        frame = pool.acquire((480, 640, 3))
+        pool.release(frame)
+        self.assertIsNot(pool.acquire((240, 320, 3)), frame)
+        self.assertIsNot(pool.acquire((480, 640, 3), dtype=np.float32), frame)
+        self.assertIs(pool.acquire((480, 640, 3)), frame)
+
+    def test_release_ignores_none_views_and_duplicates(self):
+        pool = FramePool()
+        frame = pool.acquire((48, 64, 3))
+        pool.release(None)
+        pool.release(frame[:, ::-1])
+        pool.release(frame)
+        pool.release(frame)
+        self.assertEqual(pool.stats()["idle"], 1)
+
+    def test_idle_buffers_are_capped(self):
+        pool = FramePool(max_free=2)
+        for frame in [pool.acquire((4, 4)) for _ in range(5)]:
+            pool.release(frame)
+        self.assertEqual(pool.stats()["idle"], 2)
+
+
+class TestScratchBuffers(unittest.TestCase):
+    def test_same_array_until_shape_changes(self):
+        buffers = ScratchBuffers()
+        small = buffers.get("small", (120, 160, 3))
+        self.assertIs(buffers.get("small", (120, 160, 3)), small)
+        self.assertIsNot(buffers.get("small", (60, 80, 3)), small)
+
+    def test_slots_rotate(self):
+        buffers = ScratchBuffers()
+        a = buffers.get("gray", (120, 160), slots=2)
+        b = buffers.get("gray", (120, 160), slots=2)
+        self.assertIsNot(a, b)
+        self.assertIs(buffers.get("gray", (120, 160), slots=2), a)
+        self.assertIs(buffers.get("gray", (120, 160), slots=2), b)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import cv2
+import numpy as np
+
+from gui.gui import FrameEncoder
+
+
+class TestFrameEncoder(unittest.TestCase):
+    def setUp(self):
+        self.frame = np.random.default_rng(0).integers(0, 255, (48, 64, 3), dtype=np.uint8)
+
+    def test_colour_frame_is_rgb_ppm(self):
+        data = FrameEncoder().encode(self.frame)
+        self.assertTrue(data.startswith(b"P6 64 48 255\n"))
+        decoded = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        np.testing.assert_array_equal(decoded, self.frame)
+
+    def test_grey_frame_is_pgm(self):
+        gray = cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY)
+        data = FrameEncoder().encode(gray)
+        self.assertTrue(data.startswith(b"P5 64 48 255\n"))
+        np.testing.assert_array_equal(cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE), gray)
+
+    def test_buffer_follows_frame_size(self):
+        encoder = FrameEncoder()
+        encoder.encode(self.frame)
+        buffer = encoder._buffer
+        encoder.encode(np.flipud(self.frame))
+        self.assertIs(encoder._buffer, buffer)
+        small = self.frame[::2, ::2].copy()
+        data = encoder.encode(small)
+        self.assertTrue(data.startswith(b"P6 32 24 255\n"))
+        self.assertEqual(len(data), len(b"P6 32 24 255\n") + small.size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import cv2
+import numpy as np
+
+from frame_stats import FrameStats
+
+
+class TestFrameStats(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_matches_full_resolution_on_smooth_content(self):
+        ramp = np.tile(np.linspace(40, 200, 640), (480, 1))
+        frame = np.dstack([ramp, ramp * 0.5, ramp[::-1]]).astype(np.uint8)
+        stats = FrameStats.compute(frame)
+        self.assertAlmostEqual(stats.gray_mean, float(np.mean(frame @ [0.114, 0.587, 0.299])), delta=1.0)
+        expected_color_var = np.mean([np.var(frame[:, :, c]) for c in range(3)])
+        self.assertAlmostEqual(stats.color_var, expected_color_var, delta=expected_color_var * 0.02)
+        self.assertLess(stats.edge_var, 1.0)
+
+    def test_flat_and_textured_frames(self):
+        black = FrameStats.compute(np.zeros((480, 640, 3), dtype=np.uint8))
+        self.assertEqual((black.gray_mean, black.gray_var, black.color_var, black.edge_var), (0.0, 0.0, 0.0, 0.0))
+
+        checkers = (np.indices((480, 640)).sum(0) // 8 % 2 * 255).astype(np.uint8)
+        textured = FrameStats.compute(np.dstack([checkers] * 3))
+        self.assertGreater(textured.gray_var, 10000)
+        self.assertGreater(textured.edge_var, 1000)
+
+    @staticmethod
+    def reference_is_flat(frame, gray_thresh=15, color_var_thresh=30, edge_thresh=25):
+        """The full-resolution float64 check the thresholds were tuned on"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray_mean, gray_var = np.mean(gray), np.var(gray)
+        color_var = np.mean([np.var(frame[:, :, c]) for c in range(3)])
+        edge_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+        if (gray_mean < 10 or gray_mean > 245) and gray_var < gray_thresh:
+            return True
+        if gray_var < gray_thresh:
+            return True
+        return color_var < color_var_thresh and edge_var < edge_thresh
+
+    def test_noisy_low_light_frames_classify_like_full_resolution(self):
+        ramp = np.tile(np.linspace(-6, 6, 640), (480, 1))
+        for level in (8, 25, 45):
+            for sigma in (1, 3, 4, 6, 10):
+                noise = self.rng.normal(0, sigma, (480, 640, 1))
+                frame = np.clip(level + ramp[:, :, None] + noise, 0, 255).astype(np.uint8).repeat(3, axis=2)
+                with self.subTest(level=level, sigma=sigma):
+                    self.assertEqual(FrameStats.compute(frame).is_flat(), self.reference_is_flat(frame))
+        # A dark but noisy lane is low light, not a covered lens
+        dark = np.clip(30 + self.rng.normal(0, 6, (480, 640, 3)), 0, 255).astype(np.uint8)
+        self.assertFalse(FrameStats.compute(dark).is_flat())
+        self.assertTrue(FrameStats.compute(np.full((480, 640, 3), 30, dtype=np.uint8)).is_flat())
+
+    def test_matches_full_resolution_statistics_on_noise(self):
+        frame = np.clip(100 + self.rng.normal(0, 8, (480, 640, 3)), 0, 255).astype(np.uint8)
+        stats = FrameStats.compute(frame)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.assertAlmostEqual(stats.gray_var, float(np.var(gray)), delta=0.01)
+        self.assertAlmostEqual(stats.edge_var, float(cv2.Laplacian(gray, cv2.CV_64F).var()), delta=0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
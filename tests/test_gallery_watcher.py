@@ -0,0 +1,63 @@
+import unittest
+import os
+import tempfile
+import time
+import numpy as np
+
+from embedding_store import EmbeddingStore, write_store
+from gallery_watcher import GalleryWatcher
+
+
+class TestGalleryWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'face_encodings.bin')
+        self.encodings = np.random.default_rng(0).normal(size=(4, 128)) * 0.1
+        write_store(self.path, self.encodings, ["a", "b", "c", "d"])
+        self.installed = []
+        self.watcher = GalleryWatcher(
+            self.path,
+            load=lambda: EmbeddingStore(self.path),
+            on_reload=self.installed.append,
+            interval=0.01,
+        )
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.tmp_dir.cleanup()
+
+    def test_unchanged_store_is_not_reloaded(self):
+        self.assertFalse(self.watcher.poll())
+        self.assertFalse(self.watcher.poll())
+        self.assertEqual(self.installed, [])
+
+    def test_new_generation_is_loaded_once_settled(self):
+        write_store(self.path, self.encodings[:2], ["a", "b"])
+        self.assertFalse(self.watcher.poll())  # seen, waiting for it to settle
+        self.assertTrue(self.watcher.poll())
+        self.assertFalse(self.watcher.poll())
+        self.assertEqual([(len(s), s.generation) for s in self.installed], [(2, 2)])
+
+    def test_failed_load_keeps_current_matcher(self):
+        def broken():
+            raise ValueError("bad store")
+        self.watcher.load = broken
+        write_store(self.path, self.encodings, ["a", "b", "c", "d"])
+        self.watcher.poll()
+        self.assertFalse(self.watcher.poll())
+        self.assertEqual((self.watcher.failures, self.installed), (1, []))
+        # Not retried until the files change again
+        self.assertFalse(self.watcher.poll())
+        self.assertEqual(self.watcher.failures, 1)
+
+    def test_background_thread_swaps_in_new_store(self):
+        self.watcher.start()
+        write_store(self.path, self.encodings[:3], ["a", "b", "c"])
+        deadline = time.time() + 2
+        while not self.installed and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.installed[-1]), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+from itertools import count
+
+from inference_threads import thread_candidates, tune_threads, warm_up
+
+
+class TestThreadCandidates(unittest.TestCase):
+    def test_powers_of_two_up_to_usable_cores(self):
+        self.assertEqual(thread_candidates(8, reserved=1), [1, 2, 4, 7])
+        self.assertEqual(thread_candidates(4, reserved=0), [1, 2, 4])
+
+    def test_always_offers_one_thread(self):
+        self.assertEqual(thread_candidates(1, reserved=1), [1])
+        self.assertEqual(thread_candidates(2, reserved=4), [1])
+
+
+class TestTuneThreads(unittest.TestCase):
+    def test_keeps_fastest_setting(self):
+        cost = {1: 30.0, 2: 12.0, 4: 18.0}
+        state = {"threads": None, "now": 0.0}
+
+        def run():
+            state["now"] += cost[state["threads"]] / 1000
+
+        best, timings = tune_threads(run, lambda n: state.update(threads=n), [1, 2, 4], runs=3,
+                                     clock=lambda: state["now"])
+        self.assertEqual(best, 2)
+        self.assertEqual(state["threads"], 2)  # left on the winner
+        self.assertAlmostEqual(timings[1], 30.0)
+        self.assertAlmostEqual(timings[4], 18.0)
+
+    def test_warm_up_times_every_call(self):
+        calls = []
+        ticks = count()
+        times = warm_up(lambda: calls.append(1), runs=3, clock=lambda: next(ticks))
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(times, [1000, 1000, 1000])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import cv2
+import numpy as np
+
+from low_light import LowLightEnhancer, equalization_lut
+
+
+class TestEqualizationLut(unittest.TestCase):
+    def test_matches_equalize_hist(self):
+        rng = np.random.default_rng(0)
+        gray = rng.integers(0, 80, (120, 160), dtype=np.uint8)
+        np.testing.assert_array_equal(equalization_lut(gray)[gray], cv2.equalizeHist(gray))
+
+    def test_single_level_is_left_alone(self):
+        gray = np.full((12, 16), 7, dtype=np.uint8)
+        np.testing.assert_array_equal(equalization_lut(gray)[gray], cv2.equalizeHist(gray))
+
+
+class TestLowLightEnhancer(unittest.TestCase):
+    def setUp(self):
+        ramp = np.tile(np.linspace(0, 50, 640), (480, 1)).astype(np.uint8)
+        self.dark = np.dstack([ramp] * 3)
+
+    def test_brightens_like_per_frame_equalization(self):
+        enhanced = LowLightEnhancer().enhance(self.dark)
+        expected = cv2.equalizeHist(self.dark[:, :, 0])
+        self.assertAlmostEqual(float(enhanced.mean()), float(expected.mean()), delta=5)
+        self.assertGreater(enhanced.mean(), self.dark.mean() * 2)
+
+    def test_curve_is_reused_until_interval_or_drift(self):
+        enhancer = LowLightEnhancer(interval=4, brightness_drift=8.0)
+        for _ in range(4):
+            enhancer.enhance(self.dark, brightness=25.0)
+        self.assertEqual(enhancer.builds, 1)
+        enhancer.enhance(self.dark, brightness=25.0)
+        self.assertEqual(enhancer.builds, 2)  # interval reached
+        enhancer.enhance(self.dark, brightness=40.0)
+        self.assertEqual(enhancer.builds, 3)  # lighting changed
+
+    def test_writes_into_given_buffer(self):
+        frame = self.dark.copy()
+        result = LowLightEnhancer().enhance(frame, out=frame)
+        self.assertIs(result, frame)
+        self.assertGreater(frame.mean(), self.dark.mean())
+
+
+if __name__ == '__main__':
+    unittest.main()
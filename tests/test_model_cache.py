@@ -0,0 +1,66 @@
+import unittest
+import importlib.util
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from model_cache import cache_path
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SAMPLE_IMAGE = os.path.join(ROOT, 'data', 'Sample_image', '0fa6c76f-5158-4a19-b602-9ad2db724852.jpg')
+HAS_TORCH = all(importlib.util.find_spec(m) for m in ('torch', 'pandas'))
+
+
+class TestCachePath(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        self.weights = os.path.join(self.tmp_dir, 'yolov5n_best.pt')
+        with open(self.weights, 'wb') as f:
+            f.write(b'weights v1')
+
+    def test_keyed_by_weights_content_and_torch_version(self):
+        path = cache_path(self.weights, '2.1.0+cpu', cache_dir='cache')
+        self.assertTrue(os.path.basename(path).startswith('yolov5n_best-'))
+        self.assertTrue(path.endswith('-torch2.1.0_cpu.torchscript'))
+        self.assertEqual(path, cache_path(self.weights, '2.1.0+cpu', cache_dir='cache'))
+        self.assertNotEqual(path, cache_path(self.weights, '2.2.0', cache_dir='cache'))
+
+        with open(self.weights, 'wb') as f:
+            f.write(b'weights v2')  # retrained under the same name
+        self.assertNotEqual(path, cache_path(self.weights, '2.1.0+cpu', cache_dir='cache'))
+
+
+@unittest.skipUnless(HAS_TORCH, 'needs torch and the yolov5 requirements')
+class TestCachedModelParity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import torch
+        from model_cache import build_cache, load_cached
+
+        cls.tmp_dir = tempfile.mkdtemp()
+        weights = os.path.join(ROOT, 'models', 'yolov5n_best.pt')
+        cls.hub_model = torch.hub.load(os.path.join(ROOT, 'yolov5'), 'custom', path=weights, source='local')
+        path = build_cache(cls.hub_model, cache_path(weights, torch.__version__, cache_dir=cls.tmp_dir))
+        cls.cached_model = load_cached(path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    def test_detections_match_hub_model(self):
+        import cv2
+        frame = cv2.imread(SAMPLE_IMAGE)
+        names = [dict(enumerate(n)) if isinstance(n, list) else n for n in (self.hub_model.names, self.cached_model.names)]
+        self.assertEqual(names[0], names[1])
+        # Shapes other than the traced 640x640 square, since Detect is traced with dynamic grids
+        for image, size in ((frame, 640), (cv2.resize(frame, (640, 480)), 640), (frame[:200, :300], 320)):
+            expected = self.hub_model(image, size=size).xyxy[0].cpu().numpy()
+            actual = self.cached_model(image, size=size).xyxy[0].cpu().numpy()
+            self.assertEqual(len(expected), len(actual))
+            np.testing.assert_allclose(actual, expected, atol=1e-2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from gui.gui import guiwindow
+
+
+class TestPauseWhileFaceStageRuns(unittest.TestCase):
+    def setUp(self):
+        # toggle_pause only needs the pause state and two widgets, so no Tk window is created
+        self.window = guiwindow.__new__(guiwindow)
+        self.window.camera_started = True
+        self.window.pause_button = MagicMock()
+        self.window.style = MagicMock()
+        self.state = {"is_paused": False, "pause_start_time": None, "paused_names_time": {}}
+        self.detection_time = {}
+        self.detection_lock = threading.Lock()
+        self.window.set_pause_vars(
+            lambda: self.state["is_paused"],
+            lambda v: self.state.__setitem__("is_paused", v),
+            lambda: self.state["pause_start_time"],
+            lambda v: self.state.__setitem__("pause_start_time", v),
+            lambda: self.state["paused_names_time"],
+            lambda v: self.state.__setitem__("paused_names_time", v),
+            lambda: self.detection_time,
+            self.detection_lock,
+        )
+
+    def face_stage(self, stop):
+        """Adds and drops timers the way SecuritySystem._face_stage does for frames still in the pipeline"""
+        track_id = 0
+        while not stop.is_set():
+            with self.detection_lock:
+                self.detection_time[track_id] = time.time()
+            track_id += 1
+            with self.detection_lock:
+                for old in list(self.detection_time.keys()):
+                    if old < track_id - 2000:
+                        del self.detection_time[old]
+
+    def test_resume_while_timers_change(self):
+        # Switch threads as often as possible so the two sides really interleave
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+        stop = threading.Event()
+        worker = threading.Thread(target=self.face_stage, args=(stop,))
+        worker.start()
+        try:
+            for _ in range(200):
+                self.window.toggle_pause()  # pause
+                self.assertTrue(self.state["is_paused"])
+                self.window.toggle_pause()  # resume
+                self.assertFalse(self.state["is_paused"])
+                self.assertIsNone(self.state["pause_start_time"])
+        finally:
+            stop.set()
+            worker.join()
+        self.window.pause_button.config.assert_called_with(text="⏸️ Pause")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import threading
+import time
+
+from capture import FrameRingBuffer
+from pipeline import LatestSlot, Pipeline
+
+
+class TestLatestSlot(unittest.TestCase):
+    def test_newer_item_replaces_waiting_one(self):
+        slot = LatestSlot()
+        self.assertIsNone(slot.put(1))
+        self.assertEqual(slot.put(2), 1)
+        self.assertEqual(slot.qsize(), 1)
+        self.assertEqual(slot.get(0), 2)
+        self.assertIsNone(slot.get(0.01))
+        self.assertTrue(slot.empty())
+
+
+class TestPipeline(unittest.TestCase):
+    def test_items_flow_through_stages_in_order(self):
+        items = iter(range(5))
+        done = threading.Event()
+        results = []
+
+        def sink(item):
+            results.append(item)
+            if item == 9:
+                done.set()
+
+        pipe = Pipeline(
+            source=lambda: next(items, None),
+            stages=[("double", lambda x: x * 2), ("inc", lambda x: x + 1)],
+            sink=sink,
+        )
+        pipe.start()
+        self.assertTrue(done.wait(2))
+        pipe.stop()
+        # Newest wins between stages, so an item may be overtaken, but order is kept and the last one arrives
+        self.assertEqual(results, sorted(set(results)))
+        self.assertTrue(set(results) <= {1, 3, 5, 7, 9})
+
+        stats = pipe.stats()
+        self.assertEqual(set(stats), {"capture", "double", "inc"})
+        self.assertEqual(stats["double"]["count"], 5)
+        self.assertEqual(stats["inc"]["count"] + stats["inc"]["dropped"], 5)
+        self.assertIn("queue_depth", stats["inc"])
+
+    def test_stage_errors_are_counted_and_item_dropped(self):
+        items = iter([1, 0, 2])
+        done = threading.Event()
+        results = []
+
+        def sink(item):
+            results.append(item)
+            if len(results) == 2:
+                done.set()
+
+        pipe = Pipeline(source=lambda: next(items, None), stages=[("div", lambda x: 10 // x)], sink=sink)
+        pipe.start()
+        self.assertTrue(done.wait(2))
+        pipe.stop()
+        self.assertEqual(results, [10, 5])
+        self.assertEqual(pipe.stats()["div"]["errors"], 1)
+
+    def test_slow_stage_gets_recent_frames(self):
+        # 30 fps camera in front of a 100 ms detector, like YOLO on the CPU
+        ring = FrameRingBuffer(4)
+        stop = threading.Event()
+
+        def camera():
+            while not stop.is_set():
+                ring.put(None, time.perf_counter())
+                time.sleep(1 / 30)
+
+        def stage(ms):
+            def run(captured_at):
+                time.sleep(ms / 1000)
+                return captured_at
+            return run
+
+        def source():
+            entry = ring.latest()
+            return None if entry is None else entry[1]
+
+        ages = []
+        dropped = []
+        pipe = Pipeline(
+            source=source,
+            stages=[("tamper", stage(2)), ("accessories", stage(100)), ("faces", stage(30)), ("render", stage(0))],
+            sink=lambda captured_at: ages.append(time.perf_counter() - captured_at),
+            on_drop=dropped.append,
+        )
+        cam = threading.Thread(target=camera, daemon=True)
+        cam.start()
+        pipe.start()
+        time.sleep(1.5)
+        pipe.stop()
+        stop.set()
+        cam.join()
+
+        self.assertGreater(len(ages), 5)
+        # Processing alone takes ~132 ms; queued frames used to arrive ~6x the detector time late
+        self.assertLess(max(ages[2:]), 0.3)
+        # The fast first stage takes every frame; the ones the detector had no time for are dropped before it
+        self.assertGreater(len(dropped), 0)
+        self.assertEqual(pipe.stats()["accessories"]["dropped"], len(dropped))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from itertools import count
+
+from startup import BackgroundLoader, LazyModule, StartupReport
+
+
+class TestLazyModule(unittest.TestCase):
+    def test_imports_on_first_use_and_times_it(self):
+        report = StartupReport()
+        module = LazyModule('colorsys', report)
+        self.assertFalse(module.loaded)
+        self.assertEqual(module.rgb_to_hsv(1.0, 0.0, 0.0)[0], 0.0)
+        self.assertTrue(module.loaded)
+        module.hsv_to_rgb(0.0, 0.0, 0.0)
+        self.assertEqual([(kind, name) for kind, name, _ in report.steps], [('import', 'colorsys')])
+
+    def test_missing_module_raises_on_use(self):
+        module = LazyModule('no_such_module_for_startup_tests')
+        with self.assertRaises(ImportError):
+            module.anything
+
+
+class TestBackgroundLoader(unittest.TestCase):
+    def test_runs_steps_in_order_and_reports_them(self):
+        calls = []
+        ticks = count()
+        report = StartupReport(clock=lambda: next(ticks))
+        loader = BackgroundLoader([('gallery', lambda: calls.append('gallery')),
+                                   ('model', lambda: calls.append('model'))], report)
+        loader.start()
+        self.assertTrue(loader.finished.wait(2))
+        self.assertTrue(loader.ready)
+        self.assertEqual(calls, ['gallery', 'model'])
+        self.assertEqual([name for _, name, _ in report.steps], ['gallery', 'model'])
+        self.assertIn('load      gallery', report.format())
+
+    def test_failure_stops_loading_and_is_reported(self):
+        calls = []
+        done = []
+
+        def broken():
+            raise FileNotFoundError('no encodings')
+
+        loader = BackgroundLoader([('gallery', broken), ('model', lambda: calls.append('model'))],
+                                  StartupReport(), on_done=done.append)
+        loader.run()
+        self.assertFalse(loader.ready)
+        self.assertEqual(calls, [])
+        self.assertEqual(done, [loader])
+        self.assertEqual(loader.error, 'gallery: no encodings')
+        self.assertIn('no encodings', loader.progress())
+
+    def test_progress_names_current_step(self):
+        loader = BackgroundLoader([('gallery', None), ('model', None)], StartupReport())
+        self.assertEqual(loader.progress(), '⏳ Loading gallery (1/2)...')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import cv2
+import numpy as np
+
+from frame_stats import FrameStats
+from tamper_detector import TamperDetector
+
+
+def make_scene(seed=0):
+    """Textured 640x480 'lane': smoothed noise plus a few hard-edged blocks"""
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(0, 255, (60, 80), dtype=np.uint8)
+    scene = cv2.resize(noise, (640, 480), interpolation=cv2.INTER_CUBIC)
+    for _ in range(12):
+        x, y = rng.integers(0, 600), rng.integers(0, 440)
+        cv2.rectangle(scene, (int(x), int(y)), (int(x) + 40, int(y) + 40), int(rng.integers(0, 255)), -1)
+    return cv2.cvtColor(scene, cv2.COLOR_GRAY2BGR)
+
+
+class TestTamperDetector(unittest.TestCase):
+    def setUp(self):
+        self.scene = make_scene()
+        self.detector = TamperDetector(warmup_frames=5, trigger_seconds=0.4, clear_seconds=1.5, relearn_seconds=30.0)
+        self.now = 0.0
+        self.feed(self.scene, 5)
+        self.assertTrue(self.detector.learned)
+
+    def feed(self, frame, count, step=0.125, covered=False):
+        for _ in range(count):
+            active = self.detector.update(frame, FrameStats.compute(frame), covered=covered, now=self.now)
+            self.now += step
+        return active
+
+    def test_same_and_dimmed_view_stay_quiet(self):
+        self.assertFalse(self.feed(self.scene, 10))
+        dim = cv2.convertScaleAbs(self.scene, alpha=0.4)
+        self.assertFalse(self.feed(dim, 10))
+
+    def test_person_in_front_is_not_tampering(self):
+        person = self.scene.copy()
+        cv2.ellipse(person, (320, 300), (110, 180), 0, 0, 360, (90, 80, 70), -1)
+        self.assertFalse(self.feed(person, 20))
+
+    def test_camera_moved(self):
+        shift = np.float32([[1, 0, 60], [0, 1, 30]])
+        moved = cv2.warpAffine(self.scene, shift, (640, 480), borderMode=cv2.BORDER_REFLECT)
+        self.assertTrue(self.feed(moved, 6))
+        self.assertEqual(self.detector.reason, "moved")
+        self.assertEqual(self.detector.describe(), "Camera moved")
+
+    def test_scene_replaced(self):
+        self.assertTrue(self.feed(make_scene(seed=7), 6))
+        self.assertEqual(self.detector.reason, "scene_change")
+
+    def test_defocused(self):
+        self.assertTrue(self.feed(cv2.GaussianBlur(self.scene, (31, 31), 0), 6))
+        self.assertEqual(self.detector.reason, "defocused")
+
+    def test_covered_is_reported_even_before_learning(self):
+        detector = TamperDetector(warmup_frames=50)
+        flat = np.full_like(self.scene, 20)
+        for i in range(5):
+            active = detector.update(flat, FrameStats.compute(flat), covered=True, now=i * 0.125)
+        self.assertTrue(active)
+        self.assertEqual(detector.reason, "covered")
+
+    def test_waits_for_trigger_and_clear_time(self):
+        blurred = cv2.GaussianBlur(self.scene, (31, 31), 0)
+        self.assertFalse(self.feed(blurred, 4))  # 0.375 s
+        self.assertTrue(self.feed(blurred, 1))
+        self.assertTrue(self.feed(self.scene, 12))  # 1.375 s of normal frames
+        self.assertFalse(self.feed(self.scene, 1))
+        self.assertIsNone(self.detector.reason)
+
+    def test_lasting_change_is_learned_as_new_view(self):
+        other = make_scene(seed=7)
+        self.assertTrue(self.feed(other, 9, step=4.0))  # relearned on the frame 32 s in
+        self.assertFalse(self.detector.learned)
+        self.assertTrue(self.feed(other, 12))  # the alert still clears with the usual delay
+        self.assertTrue(self.detector.learned)
+        self.assertFalse(self.feed(other, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
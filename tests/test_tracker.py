@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+
+from tracker import FaceTracker, box_iou
+
+
+def blank(value=0):
+    return np.full((120, 160), value, dtype=np.uint8)
+
+
+class TestFaceTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = FaceTracker(reencode_interval=1.0, appearance_threshold=10.0, max_missed=2)
+
+    def test_box_iou(self):
+        iou = box_iou([(0, 10, 10, 0)], [(0, 10, 10, 0), (5, 15, 15, 5), (50, 60, 60, 50)])
+        np.testing.assert_allclose(iou, [[1.0, 25 / 175, 0.0]], rtol=1e-5)
+
+    def test_track_id_kept_while_face_moves(self):
+        first = self.tracker.update(blank(), [(20, 60, 60, 20)])
+        moved = self.tracker.update(blank(), [(24, 64, 64, 24)])
+        self.assertEqual([t.id for t in moved], [first[0].id])
+        self.assertEqual(moved[0].location, (24, 64, 64, 24))
+
+        # A jump with no overlap is still the same face if its centre stayed close
+        self.tracker = FaceTracker(min_iou=0.9)
+        a = self.tracker.update(blank(), [(20, 60, 60, 20)])
+        b = self.tracker.update(blank(), [(30, 70, 70, 30)])
+        self.assertEqual(a[0].id, b[0].id)
+
+    def test_identity_reused_until_interval_or_appearance_change(self):
+        track = self.tracker.update(blank(), [(20, 60, 60, 20)])[0]
+        self.assertTrue(self.tracker.needs_encoding(track, now=0.0))
+        self.assertFalse(self.tracker.record_identity(track, "alice", 0.2, now=0.0))
+
+        track = self.tracker.update(blank(), [(21, 61, 61, 21)])[0]
+        self.assertFalse(self.tracker.needs_encoding(track, now=0.5))
+        self.assertTrue(self.tracker.needs_encoding(track, now=1.0))
+        self.assertAlmostEqual(track.confidence, 80.0)
+
+        # Someone else in the same spot looks different
+        track = self.tracker.update(blank(200), [(21, 61, 61, 21)])[0]
+        self.assertTrue(self.tracker.needs_encoding(track, now=0.5))
+        self.assertTrue(self.tracker.record_identity(track, "No match", 0.6, now=0.5))
+
+    def test_tracks_expire_after_missed_frames(self):
+        track_id = self.tracker.update(blank(), [(20, 60, 60, 20)])[0].id
+        for _ in range(2):
+            self.assertEqual(self.tracker.update(blank(), []), [])
+            self.assertIn(track_id, self.tracker.active_ids())
+        self.tracker.update(blank(), [])
+        self.assertEqual(self.tracker.active_ids(), set())
+        new = self.tracker.update(blank(), [(20, 60, 60, 20)])
+        self.assertNotEqual(new[0].id, track_id)
+
+    def test_detector_skipped_between_detect_frames(self):
+        tracker = FaceTracker(detect_interval=3)
+        self.assertTrue(tracker.should_detect())
+        tracker.update(blank(), [(20, 60, 60, 20)])
+        self.assertFalse(tracker.should_detect())
+        self.assertEqual(len(tracker.update(blank(), None)), 1)
+        self.assertFalse(tracker.should_detect())
+        tracker.update(blank(), None)
+        self.assertTrue(tracker.should_detect())
+
+    def test_optical_flow_moves_box_with_the_face(self):
+        tracker = FaceTracker(detect_interval=10, optical_flow=True)
+        rng = np.random.default_rng(0)
+        texture = (rng.random((40, 40)) * 255).astype(np.uint8)
+        frame = blank()
+        frame[20:60, 20:60] = texture
+        tracker.update(frame, [(20, 60, 60, 20)])
+        shifted = blank()
+        shifted[23:63, 25:65] = texture
+        track = tracker.update(shifted, None)[0]
+        self.assertEqual(track.location, (23, 65, 63, 25))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+import itertools
+
+import cv2
+import numpy as np
+
+TRACKING_DEFAULTS = {
+    "reencode_interval": 1.0,      # seconds before a tracked face is encoded again, 0 = every frame
+    "appearance_threshold": 12.0,  # mean grey-level change of the face thumbnail that forces a re-encode
+    "min_iou": 0.3,                # box overlap needed to continue a track
+    "max_centroid_shift": 0.5,     # otherwise, centre movement allowed as a fraction of the box size
+    "max_missed": 3,               # frames a track survives without a matching detection
+    "detect_interval": 1,          # run the face detector every N frames, boxes are carried in between
+    "optical_flow": False,         # move boxes with Lucas-Kanade flow before association
+}
+
+THUMB_SIZE = (16, 16)
+
+
+class Track:
+    """One face followed across frames. Locations are (top, right, bottom, left) like face_recognition."""
+
+    def __init__(self, track_id, location):
+        self.id = track_id
+        self.location = location
+        self.missed = 0
+        self.visible = True
+        self.thumb = None        # grey thumbnail of the face in the latest frame
+        self.ref_thumb = None    # thumbnail when the face was last encoded
+        self.encoded_at = None
+        self.name = None
+        self.distance = None
+
+    @property
+    def confidence(self):
+        return (1 - self.distance) * 100
+
+    def appearance_change(self):
+        if self.thumb is None or self.ref_thumb is None:
+            return float("inf")
+        return float(np.mean(np.abs(self.thumb - self.ref_thumb)))
+
+
+def box_iou(a, b):
+    """IoU between every box in a (N, 4) and b (M, 4), both (top, right, bottom, left)"""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    top = np.maximum(a[:, None, 0], b[None, :, 0])
+    right = np.minimum(a[:, None, 1], b[None, :, 1])
+    bottom = np.minimum(a[:, None, 2], b[None, :, 2])
+    left = np.maximum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(right - left, 0, None) * np.clip(bottom - top, 0, None)
+    area_a = (a[:, 1] - a[:, 3]) * (a[:, 2] - a[:, 0])
+    area_b = (b[:, 1] - b[:, 3]) * (b[:, 2] - b[:, 0])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-6), 0)
+
+
+class FaceTracker:
+    """
+    Associates face detections across frames so identity decisions can be reused.
+
+    Each frame, detections are matched greedily to existing tracks by box overlap, falling
+    back to centre distance for faces that moved further than their box size allows. A
+    track is only re-encoded when it is new, when reencode_interval has passed since its
+    last encoding, or when its grey thumbnail changed by more than appearance_threshold
+    (someone else stepped in, or the face turned). With detect_interval > 1 the detector
+    is skipped on the frames in between and boxes are carried over, moved by optical flow
+    when that is enabled.
+    """
+
+    def __init__(self, reencode_interval=1.0, appearance_threshold=12.0, min_iou=0.3,
+                 max_centroid_shift=0.5, max_missed=3, detect_interval=1, optical_flow=False):
+        self.reencode_interval = reencode_interval
+        self.appearance_threshold = appearance_threshold
+        self.min_iou = min_iou
+        self.max_centroid_shift = max_centroid_shift
+        self.max_missed = max_missed
+        self.detect_interval = max(1, int(detect_interval))
+        self.optical_flow = optical_flow
+        self.tracks = []
+        self._ids = itertools.count(1)
+        self._frame_index = 0
+        self._prev_gray = None
+
+    def should_detect(self):
+        """Whether the next update() needs fresh detections"""
+        return self._frame_index % self.detect_interval == 0 or not self.tracks
+
+    def update(self, gray, locations=None):
+        """
+        Advance all tracks to this frame.
+
+        gray is the frame the locations were found in, as single-channel uint8. Pass the
+        detector's locations when should_detect() is true, or None to carry the tracks over.
+        Returns the tracks visible in this frame.
+        """
+        self._frame_index += 1
+        if self.optical_flow and self._prev_gray is not None and self._prev_gray.shape == gray.shape:
+            for track in self.tracks:
+                track.location = self._flow_shift(self._prev_gray, gray, track.location)
+        self._prev_gray = gray
+
+        if locations is None:
+            for track in self.tracks:
+                track.visible = not track.missed
+        else:
+            self._associate(list(locations))
+        for track in self.tracks:
+            if track.visible:
+                track.thumb = self._thumbnail(gray, track.location)
+        return [track for track in self.tracks if track.visible]
+
+    def _associate(self, locations):
+        unmatched_tracks = set(range(len(self.tracks)))
+        unmatched_dets = set(range(len(locations)))
+        pairs = []
+        if self.tracks and locations:
+            tracked = np.array([t.location for t in self.tracks], dtype=np.float32)
+            detected = np.array(locations, dtype=np.float32)
+            iou = box_iou(tracked, detected)
+            pairs = [(iou[i, j], i, j) for i, j in zip(*np.nonzero(iou >= self.min_iou))]
+
+            # Centre distance relative to the track's box size, for faces that moved a lot
+            centres_t = np.stack([(tracked[:, 0] + tracked[:, 2]) / 2, (tracked[:, 1] + tracked[:, 3]) / 2], axis=1)
+            centres_d = np.stack([(detected[:, 0] + detected[:, 2]) / 2, (detected[:, 1] + detected[:, 3]) / 2], axis=1)
+            sizes = np.maximum(tracked[:, 2] - tracked[:, 0], tracked[:, 1] - tracked[:, 3])
+            shift = np.linalg.norm(centres_t[:, None, :] - centres_d[None, :, :], axis=2) / np.maximum(sizes, 1)[:, None]
+            # Ranked below every IoU pair, closest first
+            pairs += [(-shift[i, j], i, j) for i, j in zip(*np.nonzero(shift <= self.max_centroid_shift))
+                      if iou[i, j] < self.min_iou]
+
+        for _, i, j in sorted(pairs, key=lambda p: p[0], reverse=True):
+            if i in unmatched_tracks and j in unmatched_dets:
+                unmatched_tracks.discard(i)
+                unmatched_dets.discard(j)
+                track = self.tracks[i]
+                track.location = tuple(int(v) for v in locations[j])
+                track.missed = 0
+                track.visible = True
+
+        for i in unmatched_tracks:
+            self.tracks[i].missed += 1
+            self.tracks[i].visible = False
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+        for j in sorted(unmatched_dets):
+            self.tracks.append(Track(next(self._ids), tuple(int(v) for v in locations[j])))
+
+    def needs_encoding(self, track, now):
+        """Whether the identity decision for a visible track has to be refreshed"""
+        if track.encoded_at is None or now - track.encoded_at >= self.reencode_interval:
+            return True
+        return track.appearance_change() > self.appearance_threshold
+
+    def record_identity(self, track, name, distance, now):
+        """Store a fresh match result. Returns True when the track's identity changed."""
+        changed = track.name is not None and name != track.name
+        track.name = name
+        track.distance = distance
+        track.encoded_at = now
+        track.ref_thumb = track.thumb
+        return changed
+
+    def active_ids(self):
+        return {track.id for track in self.tracks}
+
+    def reset(self):
+        self.tracks = []
+        self._prev_gray = None
+
+    @staticmethod
+    def _thumbnail(gray, location):
+        top, right, bottom, left = location
+        h, w = gray.shape[:2]
+        crop = gray[max(top, 0):min(bottom, h), max(left, 0):min(right, w)]
+        if crop.size == 0:
+            return None
+        return cv2.resize(crop, THUMB_SIZE, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    @staticmethod
+    def _flow_shift(prev_gray, gray, location):
+        """Move a box by the median Lucas-Kanade displacement of corners inside it"""
+        top, right, bottom, left = location
+        mask = np.zeros_like(prev_gray)
+        mask[max(top, 0):max(bottom, 0), max(left, 0):max(right, 0)] = 255
+        points = cv2.goodFeaturesToTrack(prev_gray, maxCorners=20, qualityLevel=0.01, minDistance=2, mask=mask)
+        if points is None or len(points) < 3:
+            return location
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None, winSize=(15, 15), maxLevel=2)
+        ok = status.reshape(-1) == 1
+        if ok.sum() < 3:
+            return location
+        dx, dy = np.median((moved - points).reshape(-1, 2)[ok], axis=0)
+        dx, dy = int(round(dx)), int(round(dy))
+        return (top + dy, right + dx, bottom + dy, left + dx)
@@ -10,6 +10,7 @@ import warnings
 import zipfile
 from collections import OrderedDict, namedtuple
 from copy import copy
+from functools import cached_property
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -823,6 +824,7 @@ class AutoShape(nn.Module):
     classes = None  # (optional list) filter by class, i.e. = [0, 15, 16] for COCO persons, cats and dogs
     max_det = 1000  # maximum number of detections per image
     amp = False  # Automatic Mixed Precision (AMP) inference
+    fixed_shape = False  # reuse one preallocated input tensor for same-shape numpy frames (single caller only)
 
     def __init__(self, model, verbose=True):
         """Initializes YOLOv5 model for inference, setting up attributes and preparing model for evaluation."""
@@ -833,6 +835,7 @@ class AutoShape(nn.Module):
         self.dmb = isinstance(model, DetectMultiBackend)  # DetectMultiBackend() instance
         self.pt = not self.dmb or model.pt  # PyTorch model
         self.model = model.eval()
+        self._fixed = None  # cached letterbox geometry and input buffers for the fixed_shape path
         if self.pt:
             m = self.model.model.model[-1] if self.dmb else self.model.model[-1]  # Detect()
             m.inplace = False  # Detect.inplace=False for safe multithread inference
@@ -853,6 +856,33 @@ class AutoShape(nn.Module):
                 m.anchor_grid = list(map(fn, m.anchor_grid))
         return self
 
+    def _fixed_input(self, im, size, p):
+        """
+        Letterboxes one HWC numpy image into an input tensor that is allocated once and reused.
+
+        Gain, padding and the stride-divisible shape are only recomputed when the image shape, size or device
+        changes, so a camera feed negotiates them once. Produces the same tensor as the general path.
+        """
+        key = (im.shape, size, p.device, p.dtype)
+        if self._fixed is None or self._fixed[0] != key:
+            s = im.shape[:2]  # HWC
+            g = max(size) / max(s)  # gain
+            shape1 = [make_divisible(int(y * g), self.stride) for y in s]  # inf shape
+            r = min(shape1[0] / s[0], shape1[1] / s[1])
+            new_unpad = int(round(s[1] * r)), int(round(s[0] * r))
+            dw, dh = (shape1[1] - new_unpad[0]) / 2, (shape1[0] - new_unpad[1]) / 2  # same split as letterbox()
+            top, left = int(round(dh - 0.1)), int(round(dw - 0.1))
+            canvas = np.full((*shape1, 3), 114, dtype=np.uint8)  # border stays padded between calls
+            x = torch.empty((1, 3, *shape1), device=p.device, dtype=p.dtype)
+            self._fixed = key, shape1, new_unpad, top, left, canvas, x
+        _, shape1, new_unpad, top, left, canvas, x = self._fixed
+        if im.shape[1::-1] != new_unpad:  # resize
+            im = cv2.resize(im, new_unpad, interpolation=cv2.INTER_LINEAR)
+        canvas[top : top + new_unpad[1], left : left + new_unpad[0]] = im
+        x[0].copy_(torch.from_numpy(canvas).permute(2, 0, 1))  # HWC to CHW, uint8 to fp16/32
+        x /= 255
+        return shape1, x
+
     @smart_inference_mode()
     def forward(self, ims, size=640, augment=False, profile=False):
         """
@@ -880,28 +910,33 @@ class AutoShape(nn.Module):
                     return self.model(ims.to(p.device).type_as(p), augment=augment)  # inference
 
             # Pre-process
-            n, ims = (len(ims), list(ims)) if isinstance(ims, (list, tuple)) else (1, [ims])  # number, list of images
-            shape0, shape1, files = [], [], []  # image and inference shapes, filenames
-            for i, im in enumerate(ims):
-                f = f"image{i}"  # filename
-                if isinstance(im, (str, Path)):  # filename or uri
-                    im, f = Image.open(requests.get(im, stream=True).raw if str(im).startswith("http") else im), im
-                    im = np.asarray(exif_transpose(im))
-                elif isinstance(im, Image.Image):  # PIL Image
-                    im, f = np.asarray(exif_transpose(im)), getattr(im, "filename", f) or f
-                files.append(Path(f).with_suffix(".jpg").name)
-                if im.shape[0] < 5:  # image in CHW
-                    im = im.transpose((1, 2, 0))  # reverse dataloader .transpose(2, 0, 1)
-                im = im[..., :3] if im.ndim == 3 else cv2.cvtColor(im, cv2.COLOR_GRAY2BGR)  # enforce 3ch input
-                s = im.shape[:2]  # HWC
-                shape0.append(s)  # image shape
-                g = max(size) / max(s)  # gain
-                shape1.append([int(y * g) for y in s])
-                ims[i] = im if im.data.contiguous else np.ascontiguousarray(im)  # update
-            shape1 = [make_divisible(x, self.stride) for x in np.array(shape1).max(0)]  # inf shape
-            x = [letterbox(im, shape1, auto=False)[0] for im in ims]  # pad
-            x = np.ascontiguousarray(np.array(x).transpose((0, 3, 1, 2)))  # stack and BHWC to BCHW
-            x = torch.from_numpy(x).to(p.device).type_as(p) / 255  # uint8 to fp16/32
+            if self.fixed_shape and isinstance(ims, np.ndarray) and ims.ndim == 3 and ims.shape[2] == 3:
+                n, files, shape0 = 1, ["image0.jpg"], [ims.shape[:2]]  # single HWC frame, e.g. a camera feed
+                ims = [ims if ims.data.contiguous else np.ascontiguousarray(ims)]
+                shape1, x = self._fixed_input(ims[0], size, p)
+            else:
+                n, ims = (len(ims), list(ims)) if isinstance(ims, (list, tuple)) else (1, [ims])  # number, images
+                shape0, shape1, files = [], [], []  # image and inference shapes, filenames
+                for i, im in enumerate(ims):
+                    f = f"image{i}"  # filename
+                    if isinstance(im, (str, Path)):  # filename or uri
+                        im, f = Image.open(requests.get(im, stream=True).raw if str(im).startswith("http") else im), im
+                        im = np.asarray(exif_transpose(im))
+                    elif isinstance(im, Image.Image):  # PIL Image
+                        im, f = np.asarray(exif_transpose(im)), getattr(im, "filename", f) or f
+                    files.append(Path(f).with_suffix(".jpg").name)
+                    if im.shape[0] < 5:  # image in CHW
+                        im = im.transpose((1, 2, 0))  # reverse dataloader .transpose(2, 0, 1)
+                    im = im[..., :3] if im.ndim == 3 else cv2.cvtColor(im, cv2.COLOR_GRAY2BGR)  # enforce 3ch input
+                    s = im.shape[:2]  # HWC
+                    shape0.append(s)  # image shape
+                    g = max(size) / max(s)  # gain
+                    shape1.append([int(y * g) for y in s])
+                    ims[i] = im if im.data.contiguous else np.ascontiguousarray(im)  # update
+                shape1 = [make_divisible(x, self.stride) for x in np.array(shape1).max(0)]  # inf shape
+                x = [letterbox(im, shape1, auto=False)[0] for im in ims]  # pad
+                x = np.ascontiguousarray(np.array(x).transpose((0, 3, 1, 2)))  # stack and BHWC to BCHW
+                x = torch.from_numpy(x).to(p.device).type_as(p) / 255  # uint8 to fp16/32
 
         with amp.autocast(autocast):
             # Inference
@@ -931,21 +966,37 @@ class Detections:
     def __init__(self, ims, pred, files, times=(0, 0, 0), names=None, shape=None):
         """Initializes the YOLOv5 Detections class with image info, predictions, filenames, timing and normalization."""
         super().__init__()
-        d = pred[0].device  # device
-        gn = [torch.tensor([*(im.shape[i] for i in [1, 0, 1, 0]), 1, 1], device=d) for im in ims]  # normalizations
         self.ims = ims  # list of images as numpy arrays
         self.pred = pred  # list of tensors pred[0] = (xyxy, conf, cls)
         self.names = names  # class names
         self.files = files  # image filenames
         self.times = times  # profiling times
-        self.xyxy = pred  # xyxy pixels
-        self.xywh = [xyxy2xywh(x) for x in pred]  # xywh pixels
-        self.xyxyn = [x / g for x, g in zip(self.xyxy, gn)]  # xyxy normalized
-        self.xywhn = [x / g for x, g in zip(self.xywh, gn)]  # xywh normalized
+        self.xyxy = pred  # xyxy pixels, xywh/xyxyn/xywhn are derived on first access
         self.n = len(self.pred)  # number of images (batch size)
         self.t = tuple(x.t / self.n * 1e3 for x in times)  # timestamps (ms)
         self.s = tuple(shape)  # inference BCHW shape
 
+    @cached_property
+    def gn(self):
+        """Per-image normalization gains (w, h, w, h, 1, 1), computed on first use."""
+        d = self.pred[0].device  # device
+        return [torch.tensor([*(im.shape[i] for i in [1, 0, 1, 0]), 1, 1], device=d) for im in self.ims]
+
+    @cached_property
+    def xywh(self):
+        """Boxes as xywh pixels, computed on first access and cached."""
+        return [xyxy2xywh(x) for x in self.pred]
+
+    @cached_property
+    def xyxyn(self):
+        """Boxes as normalized xyxy, computed on first access and cached."""
+        return [x / g for x, g in zip(self.xyxy, self.gn)]
+
+    @cached_property
+    def xywhn(self):
+        """Boxes as normalized xywh, computed on first access and cached."""
+        return [x / g for x, g in zip(self.xywh, self.gn)]
+
     def _run(self, pprint=False, show=False, save=False, crop=False, render=False, labels=True, save_dir=Path("")):
         """Executes model predictions, displaying and/or saving outputs with optional crops and labels."""
         s, crops = "", []